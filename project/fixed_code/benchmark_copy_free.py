@@ -0,0 +1,72 @@
+"""
+Benchmark Script for the Copy-Free Pipeline Mode
+
+This script measures the peak resident memory of UploadHandler.prepare_for_upload
+on a synthetic CSV inventory, with the default copying stages and with
+copy=False. Each mode runs in a fresh interpreter so the peaks do not mix.
+
+Usage:
+    python benchmark_copy_free.py [rows]
+"""
+
+import os
+import sys
+import time
+import resource
+import tempfile
+import subprocess
+import pandas as pd
+from benchmark_fused_parsing import build_frame
+
+
+def run_mode(file_path: str, mode: str) -> None:
+    """Run prepare_for_upload in this process and print peak RSS (MB) and time."""
+    from upload_handler import UploadHandler
+
+    handler = UploadHandler()
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    df, _ = handler.prepare_for_upload(file_path, copy=(mode == 'copy'))
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    df.to_pickle(f"{file_path}.{mode}.pkl")
+    print(f"{peak_kb / 1024:.1f} {(peak_kb - baseline_kb) / 1024:.1f} {elapsed:.3f}")
+
+
+def main():
+    """Run the benchmark and print the comparison."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        # Build the input in a child too; peak RSS is inherited by child processes
+        subprocess.run([sys.executable, __file__, '--generate', str(rows), file_path], check=True)
+
+        measurements = {}
+        for mode in ['copy', 'copy-free']:
+            output = subprocess.run(
+                [sys.executable, __file__, '--run', mode, file_path],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            measurements[mode] = [float(value) for value in output[-3:]]
+
+        pd.testing.assert_frame_equal(
+            pd.read_pickle(f"{file_path}.copy.pkl"),
+            pd.read_pickle(f"{file_path}.copy-free.pkl")
+        )
+
+    print(f"=== Copy-Free Pipeline Benchmark ({rows:,} rows) ===")
+    print(f"{'Mode':<12}{'Peak RSS (MB)':>16}{'Pipeline delta (MB)':>22}{'Time (s)':>12}")
+    for mode, (peak, delta, elapsed) in measurements.items():
+        print(f"{mode:<12}{peak:>16.1f}{delta:>22.1f}{elapsed:>12.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        run_mode(sys.argv[3], sys.argv[2])
+    elif len(sys.argv) == 4 and sys.argv[1] == '--generate':
+        build_frame(int(sys.argv[2])).to_csv(sys.argv[3], index=False)
+    else:
+        main()
@@ -0,0 +1,86 @@
+"""
+Benchmark Script for Fused Column Parsing
+
+This script counts the pd.to_numeric calls made while validating, converting
+and formatting a large inventory frame, with and without fused parsing, and
+checks that both modes produce the same results.
+
+Usage:
+    python benchmark_fused_parsing.py [rows]
+"""
+
+import sys
+import time
+import pandas as pd
+import numpy as np
+from data_validator import DataValidator
+from upload_handler import UploadHandler
+
+
+def build_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Build an inventory frame with a few unparseable and below-cost values."""
+    rng = np.random.default_rng(seed)
+
+    price = rng.integers(5000, 60000, rows).astype(object)
+    price[rng.random(rows) < 0.01] = 'Call for price'
+    cost = rng.integers(5000, 60000, rows)
+
+    return pd.DataFrame({
+        'Year': rng.integers(2010, 2026, rows),
+        'Stock #': np.char.add('S', np.arange(rows).astype(str)),
+        'VIN': np.char.add('1FTFW1E5', np.arange(rows).astype(str)),
+        'Odometer': rng.integers(0, 200000, rows),
+        'Make': rng.choice(['Ford', 'Nissan', 'Toyota'], rows),
+        'Model': rng.choice(['F-150', 'Altima', 'Camry'], rows),
+        'Class': rng.choice(['Car, Intermediate', 'SUV, Compact Sport Utility'], rows),
+        'Price': price,
+        'Unit Cost': cost
+    })
+
+
+def run_pipeline(df: pd.DataFrame, fused: bool):
+    """Run validate, convert and format on a frame and count pd.to_numeric calls."""
+    validator = DataValidator()
+    handler = UploadHandler()
+
+    calls = {'count': 0}
+    original_to_numeric = pd.to_numeric
+
+    def counting_to_numeric(*args, **kwargs):
+        calls['count'] += 1
+        return original_to_numeric(*args, **kwargs)
+
+    pd.to_numeric = counting_to_numeric
+    try:
+        start = time.perf_counter()
+        parsed_columns = validator.parse_typed_columns(df) if fused else None
+        _, issues = validator.validate_data(df, parsed_columns)
+        converted = validator.convert_data_types(df, parsed_columns)
+        formatted = handler.format_for_upload(converted)
+        elapsed = time.perf_counter() - start
+    finally:
+        pd.to_numeric = original_to_numeric
+
+    return calls['count'], elapsed, issues, formatted
+
+
+def main():
+    """Run the benchmark and print the comparison."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = build_frame(rows)
+
+    default_calls, default_time, default_issues, default_df = run_pipeline(df, fused=False)
+    fused_calls, fused_time, fused_issues, fused_df = run_pipeline(df, fused=True)
+
+    assert default_issues == fused_issues, "Fused parsing changed the validation issues"
+    pd.testing.assert_frame_equal(default_df, fused_df)
+
+    print(f"=== Fused Parsing Benchmark ({rows:,} rows) ===")
+    print(f"{'Mode':<10}{'to_numeric calls':>18}{'Time (s)':>12}")
+    print(f"{'default':<10}{default_calls:>18}{default_time:>12.3f}")
+    print(f"{'fused':<10}{fused_calls:>18}{fused_time:>12.3f}")
+    print(f"Parse calls removed: {default_calls - fused_calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark Script for Startup Latency
+
+This script measures how long it takes to start each entry point in a fresh
+interpreter: importing the pipeline modules directly, importing the
+lightweight inventory_cli entry point, and running the CLI up to the point
+where it rejects a bad input. Each case runs in a temporary working directory,
+which is also checked for log files created at import time.
+
+Usage:
+    python benchmark_import_time.py [repeats]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import statistics
+import subprocess
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CASES = {
+    'import upload_handler': ['-c', 'import upload_handler'],
+    'import inventory_processor': ['-c', 'import inventory_processor'],
+    'import inventory_cli': ['-c', 'import inventory_cli'],
+    'inventory_cli.py --help': [os.path.join(CODE_DIR, 'inventory_cli.py'), '--help'],
+    'inventory_cli.py (bad input)': [os.path.join(CODE_DIR, 'inventory_cli.py'), 'validate', 'missing.csv']
+}
+
+
+def time_case(args, repeats: int):
+    """Return the median wall time of a case and the files it left behind."""
+    env = dict(os.environ, PYTHONPATH=CODE_DIR)
+    seconds = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], cwd=temp_dir, env=env, capture_output=True)
+            seconds.append(time.perf_counter() - start)
+        leftovers = sorted(os.listdir(temp_dir))
+    return statistics.median(seconds), leftovers
+
+
+def main():
+    """Run the benchmark and print the comparison."""
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    baseline, _ = time_case(['-c', 'pass'], repeats)
+    
+    print(f"=== Startup Latency (median of {repeats}, interpreter start {baseline * 1000:.0f} ms) ===")
+    print(f"{'Case':<32}{'Wall (ms)':>12}{'Over bare (ms)':>16}  Files created")
+    for name, args in CASES.items():
+        seconds, leftovers = time_case(args, repeats)
+        print(f"{name:<32}{seconds * 1000:>12.0f}{(seconds - baseline) * 1000:>16.0f}  {', '.join(leftovers) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark Script for Incremental Processing
+
+This script compares processing a dealer re-export from scratch with
+incremental processing against the row state of the previous export. The
+re-export changes a share of the vehicles (1% by default): half of them get a
+new price, a quarter are sold (removed) and a quarter are new arrivals.
+
+Usage:
+    python benchmark_incremental.py [rows] [change_rate]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from row_state import RowStateStore
+
+
+def make_reexport(df: pd.DataFrame, change_rate: float, seed: int = 1) -> pd.DataFrame:
+    """Change, remove and add vehicles in a share of change_rate of the rows."""
+    rng = np.random.default_rng(seed)
+    touched = rng.choice(len(df), int(len(df) * change_rate), replace=False)
+    repriced, removed = touched[:len(touched) // 2], touched[len(touched) // 2:len(touched) * 3 // 4]
+    
+    reexport = df.copy()
+    reexport.loc[repriced, 'Price'] = pd.to_numeric(reexport.loc[repriced, 'Price'], errors='coerce') + 100
+    reexport = reexport.drop(index=removed)
+    
+    arrivals = generate_inventory(len(touched) - len(repriced) - len(removed), seed=seed, start=len(df))
+    arrivals.columns = reexport.columns
+    return pd.concat([reexport, arrivals], ignore_index=True)
+
+
+def main():
+    """Run the benchmark and print the comparison."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    change_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    logging.disable(logging.INFO)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        export = generate_inventory(rows)
+        export.to_csv(file_path, index=False)
+        
+        # The first export fills the row state
+        incremental = InventoryProcessor(state_store=RowStateStore(os.path.join(temp_dir, "state")))
+        incremental.process_inventory(file_path)
+        
+        make_reexport(pd.read_csv(file_path), change_rate).to_csv(file_path, index=False)
+        
+        start = time.perf_counter()
+        full_df, full_results = InventoryProcessor().process_inventory(file_path)
+        full_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        df, results = incremental.process_inventory(file_path)
+        incremental_seconds = time.perf_counter() - start
+    
+    pd.testing.assert_frame_equal(df, full_df)
+    assert results['validation_issues'] == full_results['validation_issues']
+    
+    changes = results['row_changes']
+    print(f"=== Incremental Processing Benchmark ({rows:,} rows, {change_rate:.1%} changed) ===")
+    print(f"Rows: {changes['new']} new, {changes['changed']} changed, "
+          f"{changes['unchanged']} unchanged, {changes['removed']} removed")
+    print(f"{'Stage':<10}{'Full (s)':>12}{'Incremental (s)':>18}")
+    for stage in dict.fromkeys(list(full_results['metrics']) + list(results['metrics'])):
+        seconds = [
+            f"{run['metrics'][stage]['wall_seconds']:.3f}" if stage in run['metrics'] else '-'
+            for run in (full_results, results)
+        ]
+        print(f"{stage:<10}{seconds[0]:>12}{seconds[1]:>18}")
+    print(f"{'total':<10}{full_seconds:>12.3f}{incremental_seconds:>18.3f}")
+    print(f"Speedup: {full_seconds / incremental_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
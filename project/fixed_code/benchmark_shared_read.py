@@ -0,0 +1,138 @@
+"""
+Benchmark Script for Memory-Mapped Input
+
+This script starts several reader processes that load the same synthetic
+inventory file with InventoryProcessor.read_inventory_file at the same time,
+and compares their memory with and without memory_map. Once every reader
+holds its frame, each one reports its RSS, its proportional set size (PSS,
+which splits shared pages between the processes mapping them) and how much
+of its RSS is shared with the other readers.
+
+Modes:
+- csv: pd.read_csv into private buffers
+- csv-mmap: the CSV file is memory-mapped while it is parsed
+- arrow-mmap: an uncompressed Arrow IPC file is memory-mapped, so numeric
+  columns are views of the shared page cache (skipped without pyarrow)
+
+Usage:
+    python benchmark_shared_read.py [rows] [readers]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from typing import Dict, List
+from benchmark_fused_parsing import build_frame
+
+DEFAULT_ROWS = 200_000
+DEFAULT_READERS = 8
+
+# Fields of /proc/self/smaps_rollup reported per reader (kB)
+SMAPS_FIELDS = ['Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty']
+
+
+def read_smaps_rollup() -> Dict[str, int]:
+    """Return the memory totals of this process from /proc/self/smaps_rollup in kB."""
+    totals = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name in SMAPS_FIELDS:
+                totals[name] = int(value.split()[0])
+    return totals
+
+
+def run_reader(file_path: str, mode: str) -> None:
+    """Read the file, wait until every reader has read it, then print this process's memory."""
+    from inventory_processor import InventoryProcessor
+    
+    processor = InventoryProcessor(memory_map=mode.endswith('-mmap'))
+    start = time.perf_counter()
+    df, error = processor.read_inventory_file(file_path)
+    elapsed = time.perf_counter() - start
+    if error:
+        raise SystemExit(error)
+    
+    # Touch every numeric value so mapped pages are resident
+    df.select_dtypes(include='number').sum()
+    print('ready', flush=True)
+    
+    # The parent answers once all readers hold their frames, so shared pages are counted as shared
+    sys.stdin.readline()
+    totals = read_smaps_rollup()
+    print(' '.join(str(totals[field]) for field in SMAPS_FIELDS), f"{elapsed:.3f}", flush=True)
+
+
+def measure_mode(file_path: str, mode: str, readers: int) -> List[List[float]]:
+    """Run concurrent readers in one mode and return [rss, pss, shared, seconds] per reader (MB)."""
+    processes = [
+        subprocess.Popen([sys.executable, __file__, '--run', mode, file_path],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(readers)
+    ]
+    for process in processes:
+        if process.stdout.readline().strip() != 'ready':
+            raise RuntimeError(f"A {mode} reader failed")
+    
+    measurements = []
+    for process in processes:
+        process.stdin.write('\n')
+        process.stdin.flush()
+        rss, pss, shared_clean, shared_dirty, elapsed = process.stdout.readline().split()
+        measurements.append([int(rss) / 1024, int(pss) / 1024,
+                             (int(shared_clean) + int(shared_dirty)) / 1024, float(elapsed)])
+    for process in processes:
+        process.wait()
+    return measurements
+
+
+def arrow_available() -> bool:
+    """Check whether pyarrow can be imported."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main():
+    """Run the benchmark and print the comparison."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_READERS
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "inventory.csv")
+        arrow_path = os.path.join(temp_dir, "inventory.arrow")
+        df = build_frame(rows)
+        df.to_csv(csv_path, index=False)
+        
+        inputs = {'csv': csv_path, 'csv-mmap': csv_path}
+        if arrow_available():
+            from processed_writer import write_processed
+            write_processed(df, arrow_path, 'arrow')
+            inputs['arrow-mmap'] = arrow_path
+        del df
+        
+        results = {mode: measure_mode(path, mode, readers) for mode, path in inputs.items()}
+    
+    print(f"=== Shared Read Benchmark ({rows:,} rows, {readers} concurrent readers) ===")
+    print(f"{'Mode':<12}{'RSS/reader (MB)':>17}{'Total RSS (MB)':>16}{'Total PSS (MB)':>16}"
+          f"{'Shared/reader (MB)':>20}{'Read (s)':>10}")
+    for mode, measurements in results.items():
+        total_rss = sum(m[0] for m in measurements)
+        total_pss = sum(m[1] for m in measurements)
+        shared = sum(m[2] for m in measurements) / readers
+        elapsed = max(m[3] for m in measurements)
+        print(f"{mode:<12}{total_rss / readers:>17.1f}{total_rss:>16.1f}{total_pss:>16.1f}"
+              f"{shared:>20.1f}{elapsed:>10.3f}")
+    if 'arrow-mmap' not in results:
+        print("arrow-mmap skipped: pyarrow is not available")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--run':
+        run_reader(sys.argv[3], sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,252 @@
+"""
+Benchmark Suite for the Inventory Pipeline
+
+This script generates seeded synthetic inventories of increasing size and
+times and memory-profiles each pipeline stage (read, validate, convert, mark,
+format, save, upload). Every size runs in a fresh interpreter so memory peaks
+do not carry over, and the results are written as a JSON report that later
+runs can be compared against.
+
+Usage:
+    python benchmark_suite.py [--rows 1000 10000 100000] [--format csv|xlsx]
+                              [--seed 0] [--stub-server] [--compact-dtypes]
+                              [--output report.json]
+                              [--compare previous_report.json]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+
+import pandas as pd
+import numpy as np
+from inventory_generator import write_inventory_file, DEFAULT_RATES
+from stage_metrics import current_rss_mb, MemorySampler
+
+REPORT_VERSION = 1
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+STAGES = ['read', 'validate', 'convert', 'mark', 'format', 'save', 'upload']
+
+# Wall time ratio above which --compare flags a stage as slower
+REGRESSION_THRESHOLD = 1.10
+
+
+def measure_stage(name: str, func: Callable[[], Any], rows: int, stages: List[Dict[str, Any]]) -> Any:
+    """Run one stage, append its metrics to stages and return its result."""
+    rss_before = current_rss_mb()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    
+    with MemorySampler() as sampler:
+        result = func()
+    
+    wall = time.perf_counter() - start
+    stages.append({
+        'stage': name,
+        'wall_seconds': round(wall, 6),
+        'cpu_seconds': round(time.process_time() - cpu_start, 6),
+        'rows_per_second': round(rows / wall, 1) if wall > 0 else None,
+        'rss_before_mb': round(rss_before, 1),
+        'rss_peak_mb': round(sampler.peak_mb, 1),
+        'peak_delta_mb': round(sampler.peak_mb - rss_before, 1)
+    })
+    return result
+
+
+def run_size(rows: int, file_format: str, seed: int, rates: Dict[str, float], stub_server: bool,
+             compact_dtypes: bool = False) -> Dict[str, Any]:
+    """Generate one inventory and measure every stage in this process."""
+    from upload_handler import UploadHandler
+    
+    handler = UploadHandler(compact_dtypes=compact_dtypes)
+    processor = handler.processor
+    validator = processor.validator
+    stages = []
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, f"inventory.{file_format}")
+        start = time.perf_counter()
+        file_bytes = write_inventory_file(file_path, rows, seed=seed, rates=rates)
+        generate_seconds = time.perf_counter() - start
+        
+        df, error = measure_stage('read', lambda: processor.read_inventory_file(file_path), rows, stages)
+        if error:
+            raise RuntimeError(error)
+        
+        def validate():
+            cleaned = validator.clean_column_names(df)
+            return cleaned, validator.validate_data(cleaned)
+        
+        df, (validation_passed, issues) = measure_stage('validate', validate, rows, stages)
+        df = measure_stage(
+            'convert', lambda: processor.fix_missing_values(validator.convert_data_types(df, compact=compact_dtypes)),
+            rows, stages
+        )
+        df = measure_stage('mark', lambda: handler.mark_records_with_issues(df, issues), rows, stages)
+        df = measure_stage('format', lambda: handler.format_for_upload(df, compact=compact_dtypes), rows, stages)
+        frame_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        
+        output_path = os.path.join(temp_dir, "processed_inventory.csv")
+        measure_stage('save', lambda: processor.save_processed_inventory(df, output_path), rows, stages)
+        
+        upload_config = {'skip_records_with_issues': True}
+        if stub_server:
+            from stub_upload_server import StubUploadServer
+            with StubUploadServer() as server:
+                upload_config['endpoint_url'] = server.endpoint_url
+                upload_results = measure_stage('upload', lambda: handler.upload_inventory(df, upload_config), rows, stages)
+            handler.close()
+        else:
+            upload_results = measure_stage('upload', lambda: handler.upload_inventory(df, upload_config), rows, stages)
+    
+    return {
+        'rows': rows,
+        'file_bytes': file_bytes,
+        'generate_seconds': round(generate_seconds, 6),
+        'validation_passed': bool(validation_passed),
+        'records_uploaded': int(upload_results['records_uploaded']),
+        'frame_mb': round(frame_mb, 1),
+        'stages': stages,
+        'total_wall_seconds': round(sum(stage['wall_seconds'] for stage in stages), 6),
+        'peak_rss_mb': max(stage['rss_peak_mb'] for stage in stages)
+    }
+
+
+def build_report(runs: List[Dict[str, Any]], args: argparse.Namespace, rates: Dict[str, float]) -> Dict[str, Any]:
+    """Wrap the per-size runs with the environment and configuration."""
+    return {
+        'report_version': REPORT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'config': {
+            'seed': args.seed,
+            'format': args.format,
+            'stub_server': args.stub_server,
+            'compact_dtypes': args.compact_dtypes,
+            'rates': rates
+        },
+        'runs': runs
+    }
+
+
+def compare_reports(previous: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare stage wall times of two reports.
+    
+    Args:
+        previous: Earlier report
+        current: New report
+        threshold: Ratio above which a stage is flagged as a regression
+    
+    Returns:
+        One entry per (rows, stage) present in both reports
+    """
+    previous_stages = {
+        (run['rows'], stage['stage']): stage for run in previous['runs'] for stage in run['stages']
+    }
+    
+    comparison = []
+    for run in current['runs']:
+        for stage in run['stages']:
+            before = previous_stages.get((run['rows'], stage['stage']))
+            if before is None or not before['wall_seconds']:
+                continue
+            ratio = stage['wall_seconds'] / before['wall_seconds']
+            comparison.append({
+                'rows': run['rows'],
+                'stage': stage['stage'],
+                'previous_seconds': before['wall_seconds'],
+                'current_seconds': stage['wall_seconds'],
+                'ratio': round(ratio, 3),
+                'regression': ratio > threshold
+            })
+    
+    return comparison
+
+
+def print_run(run: Dict[str, Any]) -> None:
+    """Print the stage table of one run."""
+    print(f"\n=== {run['rows']:,} rows ({run['file_bytes'] / 1024 ** 2:.1f} MB file) ===")
+    print(f"{'Stage':<10}{'Wall (s)':>10}{'CPU (s)':>10}{'Rows/s':>14}{'Peak (MB)':>11}{'Delta (MB)':>12}")
+    for stage in run['stages']:
+        rows_per_second = f"{stage['rows_per_second']:,.0f}" if stage['rows_per_second'] else '-'
+        print(f"{stage['stage']:<10}{stage['wall_seconds']:>10.3f}{stage['cpu_seconds']:>10.3f}"
+              f"{rows_per_second:>14}{stage['rss_peak_mb']:>11.1f}{stage['peak_delta_mb']:>12.1f}")
+    print(f"{'total':<10}{run['total_wall_seconds']:>10.3f}")
+    print(f"Formatted frame: {run['frame_mb']:.1f} MB")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the inventory pipeline on synthetic data")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES, help="Inventory sizes to run")
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv', help="Input file format")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed")
+    for rate, default in DEFAULT_RATES.items():
+        parser.add_argument(f"--{rate.replace('_', '-')}", type=float, default=default)
+    parser.add_argument('--stub-server', action='store_true', help="Upload to a local stub server instead of simulating")
+    parser.add_argument('--compact-dtypes', action='store_true', help="Use categoricals and narrow numeric dtypes")
+    parser.add_argument('--output', default='benchmark_report.json', help="Path of the JSON report")
+    parser.add_argument('--compare', help="Earlier report to compare stage times against")
+    parser.add_argument('--run-size', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and write the report."""
+    args = parse_args(argv)
+    rates = {rate: getattr(args, rate) for rate in DEFAULT_RATES}
+    
+    if args.run_size is not None:
+        # Child process: measure one size and hand the result back as JSON
+        print(json.dumps(run_size(args.run_size, args.format, args.seed, rates, args.stub_server,
+                                  args.compact_dtypes)))
+        return 0
+    
+    runs = []
+    child_args = [arg for arg in (argv if argv is not None else sys.argv[1:])]
+    for rows in args.rows:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *child_args, '--run-size', str(rows)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        run = json.loads(output.strip().splitlines()[-1])
+        print_run(run)
+        runs.append(run)
+    
+    report = build_report(runs, args, rates)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        comparison = compare_reports(previous, report)
+        print(f"\n=== Comparison with {args.compare} ===")
+        for entry in comparison:
+            flag = '  REGRESSION' if entry['regression'] else ''
+            print(f"{entry['rows']:>10,} {entry['stage']:<10}{entry['previous_seconds']:>10.3f}"
+                  f"{entry['current_seconds']:>10.3f}{entry['ratio']:>8.2f}x{flag}")
+        if any(entry['regression'] for entry in comparison):
+            return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Benchmark Script for the Upload Transport
+
+This script uploads a synthetic inventory to the local stub upload server and
+reports throughput for different batch sizes and connection counts, for the
+threaded transport and for the asyncio transport.
+
+Usage:
+    python benchmark_upload_transport.py [rows] [latency_seconds]
+"""
+
+import sys
+import time
+import asyncio
+from stub_upload_server import StubUploadServer
+from upload_transport import UploadTransport, AsyncUploadTransport
+from benchmark_fused_parsing import build_frame
+
+
+def main():
+    """Run the benchmark and print throughput for each configuration."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.005
+    df = build_frame(rows)
+    
+    print(f"=== Upload Transport Benchmark ({rows:,} rows, {latency * 1000:.0f} ms server latency) ===")
+    print(f"{'Transport':>10}{'Batch size':>12}{'In flight':>11}{'Batches':>10}{'Time (s)':>10}{'Records/s':>12}")
+    
+    for batch_size in [100, 1000, 5000]:
+        for max_connections in [1, 4, 8]:
+            for transport_name in ['threaded', 'asyncio']:
+                with StubUploadServer(latency=latency) as server:
+                    start = time.perf_counter()
+                    if transport_name == 'threaded':
+                        transport = UploadTransport(server.endpoint_url, max_connections=max_connections)
+                        results = transport.upload_dataframe(df, batch_size=batch_size)
+                        transport.close()
+                    else:
+                        results = asyncio.run(upload_async(server.endpoint_url, df, batch_size, max_connections))
+                    elapsed = time.perf_counter() - start
+                
+                assert results['records_uploaded'] == rows
+                print(f"{transport_name:>10}{batch_size:>12}{max_connections:>11}{results['batches_sent']:>10}"
+                      f"{elapsed:>10.2f}{rows / elapsed:>12,.0f}")
+
+
+async def upload_async(endpoint_url, df, batch_size, max_in_flight):
+    """Upload a frame with the asyncio transport."""
+    transport = AsyncUploadTransport(endpoint_url, max_in_flight=max_in_flight)
+    try:
+        return await transport.upload_dataframe(df, batch_size=batch_size)
+    finally:
+        await transport.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,24 @@ It checks for common issues identified in the error analysis:
 - Data format inconsistencies
 - Price and cost inconsistencies
 - Special characters and newline characters
+- VIN format, check digit and agreement with Make and Year (optional)
 """
 
 import pandas as pd
 import numpy as np
 import re
+import io
 from typing import Dict, List, Tuple, Any, Optional
+from issue_store import RowSet, ROW_ALIGNED_KEYS
+from report_writer import write_validation_report
+from text_sanitizer import contains_pattern, SPECIAL_CHARACTER_PATTERN
+from vin_decoder import vin_issue_flags, VIN_CHECKS
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+# Nullable integer dtypes from narrowest to widest
+NULLABLE_INT_DTYPES = ['Int8', 'Int16', 'Int32', 'Int64']
 
 
 class DataValidator:
@@ -20,7 +32,17 @@ class DataValidator:
     Class for validating inventory data and identifying issues.
     """
     
-    def __init__(self):
+    def __init__(self, vin_checks: bool = False):
+        """
+        Initialize the validator.
+        
+        Args:
+            vin_checks: Also validate VINs (length, characters, check digit) and
+                compare the make and model year they encode with the Make and
+                Year columns, reported as 'vin_issues'
+        """
+        self.vin_checks = vin_checks
+        
         # Define required fields for validation
         self.required_fields = [
             'Year', 'Stock #', 'VIN', 'Make', 'Model', 'Price', 'Unit Cost'
@@ -36,36 +58,81 @@ class DataValidator:
             'J.D. Power\nRetail Clean': 'numeric'
         }
         
-    def validate_data(self, df: pd.DataFrame) -> Tuple[bool, Dict[str, List[Any]]]:
+    def parse_typed_columns(self, df: pd.DataFrame) -> Dict[str, Dict[str, pd.Series]]:
+        """
+        Parse every typed column once so validation and conversion can share the result.
+        
+        Args:
+            df: DataFrame containing inventory data
+            
+        Returns:
+            Dictionary mapping each typed column to:
+                - 'values': the column parsed with pd.to_numeric(errors='coerce')
+                - 'invalid': mask of non-null values that could not be parsed
+        """
+        parsed_columns = {}
+        for col in self.expected_types:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce')
+                parsed_columns[col] = {
+                    'values': values,
+                    'invalid': df[col].notnull() & values.isnull()
+                }
+        
+        return parsed_columns
+    
+    def validate_data(self, df: pd.DataFrame, parsed_columns: Optional[Dict[str, Dict[str, pd.Series]]] = None) -> Tuple[bool, Dict[str, List[Any]]]:
         """
         Validate the inventory data and return validation results.
         
         Args:
             df: DataFrame containing inventory data
+            parsed_columns: Output of parse_typed_columns for df (optional). When given,
+                numeric columns are not parsed again and the results are unchanged.
             
         Returns:
             Tuple containing:
                 - Boolean indicating if validation passed
                 - Dictionary with validation issues
         """
-        issues = {
-            'missing_values': [],
-            'data_type_issues': [],
-            'price_below_cost': [],
-            'column_name_issues': [],
-            'special_character_issues': []
-        }
+        # Flag the rows of every row-level check, then collect the flagged rows
+        issues = self.issues_from_flags(self.row_issue_flags(df, parsed_columns), df.index)
+        
+        # Check for newline characters in column names
+        for col in df.columns:
+            if '\n' in col:
+                issues['column_name_issues'].append(col)
+        
+        # Determine if validation passed
+        validation_passed = all(len(issue_list) == 0 for issue_list in issues.values())
+        
+        return validation_passed, issues
+    
+    def row_issue_flags(self, df: pd.DataFrame, parsed_columns: Optional[Dict[str, Dict[str, pd.Series]]] = None) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Run the row-level checks of validate_data and flag the rows each one finds.
+        
+        A row's flags only depend on the row itself (and the column dtypes), so
+        flags computed for part of a frame can be combined with flags of the
+        other rows and passed to issues_from_flags.
+        
+        Args:
+            df: DataFrame containing inventory data
+            parsed_columns: Output of parse_typed_columns for df (optional)
+            
+        Returns:
+            Dictionary mapping (issue type, field) to a boolean mask over the rows,
+            in the order validate_data reports them. VIN issues are keyed by
+            ('vin_issues', check name) instead. Numeric fields also have a
+            ('blank_values', field) mask of empty strings, which only count as
+            data type issues when some other value of the field is invalid.
+        """
+        flags = {}
         
         # Check for missing values in required fields
         for field in self.required_fields:
             if field in df.columns:
-                missing_count = df[field].isnull().sum()
-                if missing_count > 0:
-                    issues['missing_values'].append({
-                        'field': field,
-                        'count': missing_count,
-                        'rows': df[df[field].isnull()].index.tolist()
-                    })
+                flags[('missing_values', field)] = df[field].isnull().to_numpy()
         
         # Check for data type issues
         for col, expected_type in self.expected_types.items():
@@ -73,67 +140,163 @@ class DataValidator:
                 if expected_type == 'int':
                     # Check if values can be converted to integers
                     non_int_mask = ~df[col].isnull() & df[col].astype(str).str.match(r'^-?\d+$').eq(False)
-                    if non_int_mask.any():
-                        issues['data_type_issues'].append({
-                            'field': col,
-                            'expected_type': expected_type,
-                            'rows': df[non_int_mask].index.tolist()
-                        })
+                    flags[('data_type_issues', col)] = non_int_mask.to_numpy()
                 elif expected_type == 'numeric':
-                    # Check if values can be converted to float
-                    try:
-                        pd.to_numeric(df[col], errors='raise')
-                    except ValueError:
+                    if parsed_columns is not None and col in parsed_columns:
+                        non_numeric_mask = parsed_columns[col]['invalid']
+                    else:
                         non_numeric_mask = ~df[col].isnull() & pd.to_numeric(df[col], errors='coerce').isnull()
-                        issues['data_type_issues'].append({
-                            'field': col,
-                            'expected_type': expected_type,
-                            'rows': df[non_numeric_mask].index.tolist()
-                        })
+                    flags[('data_type_issues', col)] = non_numeric_mask.to_numpy()
+                    # pd.to_numeric(errors='raise') accepts empty strings as NaN
+                    flags[('blank_values', col)] = (non_numeric_mask & df[col].eq('')).to_numpy()
         
         # Check for price below cost
         if 'Price' in df.columns and 'Unit Cost' in df.columns:
             # Convert to numeric to ensure proper comparison
-            price = pd.to_numeric(df['Price'], errors='coerce')
-            cost = pd.to_numeric(df['Unit Cost'], errors='coerce')
+            if parsed_columns is not None and 'Price' in parsed_columns and 'Unit Cost' in parsed_columns:
+                price = parsed_columns['Price']['values']
+                cost = parsed_columns['Unit Cost']['values']
+            else:
+                price = pd.to_numeric(df['Price'], errors='coerce')
+                cost = pd.to_numeric(df['Unit Cost'], errors='coerce')
             
             # Find rows where price is less than cost
-            price_below_cost_mask = (price < cost) & ~price.isnull() & ~cost.isnull()
-            if price_below_cost_mask.any():
-                issues['price_below_cost'] = df[price_below_cost_mask].index.tolist()
-        
-        # Check for newline characters in column names
-        for col in df.columns:
-            if '\n' in col:
-                issues['column_name_issues'].append(col)
+            flags[('price_below_cost', 'Price')] = ((price < cost) & ~price.isnull() & ~cost.isnull()).to_numpy()
         
         # Check for special characters in the Class field
         if 'Class' in df.columns:
-            special_char_pattern = r'[^a-zA-Z0-9\s,]'
-            rows_with_special_chars = df[df['Class'].str.contains(special_char_pattern, regex=True, na=False)].index.tolist()
-            if rows_with_special_chars:
-                issues['special_character_issues'].append({
-                    'field': 'Class',
-                    'rows': rows_with_special_chars
+            # Each distinct Class value is matched once
+            flags[('special_character_issues', 'Class')] = contains_pattern(df['Class'], SPECIAL_CHARACTER_PATTERN)
+        
+        # Check VINs and the make and model year they encode
+        if self.vin_checks and 'VIN' in df.columns:
+            if 'Year' not in df.columns:
+                years = None
+            elif parsed_columns is not None and 'Year' in parsed_columns:
+                years = parsed_columns['Year']['values']
+            else:
+                years = df['Year']
+            makes = df['Make'] if 'Make' in df.columns else None
+            for check, mask in vin_issue_flags(df['VIN'], makes, years).items():
+                flags[('vin_issues', check)] = mask
+        
+        return flags
+    
+    def issues_from_flags(self, flags: Dict[Tuple[str, str], np.ndarray], index: pd.Index) -> Dict[str, List[Any]]:
+        """
+        Build the validation issues dictionary from row flags.
+        
+        Args:
+            flags: Output of row_issue_flags (possibly combined from several parts)
+            index: Row labels the masks refer to
+            
+        Returns:
+            Dictionary with validation issues, as returned by validate_data
+            (column name issues are left empty). Affected rows are RowSets
+        """
+        issues = {
+            'missing_values': [],
+            'data_type_issues': [],
+            'price_below_cost': RowSet(),
+            'column_name_issues': [],
+            'special_character_issues': []
+        }
+        if self.vin_checks:
+            issues['vin_issues'] = []
+        
+        for (issue_type, field), mask in flags.items():
+            if issue_type == 'blank_values' or not mask.any():
+                continue
+            
+            if issue_type == 'missing_values':
+                issues['missing_values'].append({
+                    'field': field,
+                    'count': mask.sum(),
+                    'rows': RowSet.from_mask(index, mask)
+                })
+            elif issue_type == 'data_type_issues':
+                blank_mask = flags.get(('blank_values', field))
+                # A numeric field whose only invalid values are empty strings passes
+                if blank_mask is not None and not (mask & ~blank_mask).any():
+                    continue
+                issues['data_type_issues'].append({
+                    'field': field,
+                    'expected_type': self.expected_types[field],
+                    'rows': RowSet.from_mask(index, mask)
+                })
+            elif issue_type == 'price_below_cost':
+                issues['price_below_cost'] = RowSet.from_mask(index, mask)
+            elif issue_type == 'vin_issues':
+                # The flag key holds the check name; the entry names the field it concerns
+                issues['vin_issues'].append({
+                    'field': VIN_CHECKS[field][0],
+                    'check': field,
+                    'rows': RowSet.from_mask(index, mask)
+                })
+            else:
+                issues[issue_type].append({
+                    'field': field,
+                    'rows': RowSet.from_mask(index, mask)
                 })
         
-        # Determine if validation passed
-        validation_passed = all(len(issue_list) == 0 for issue_list in issues.values())
+        return issues
+    
+    def merge_validation_issues(self, merged_issues: Optional[Dict[str, List[Any]]], chunk_issues: Dict[str, List[Any]]) -> Dict[str, List[Any]]:
+        """
+        Merge the validation issues of one chunk into the issues collected so far.
         
-        return validation_passed, issues
+        Row numbers must already be global (chunks keep the file's row index).
+        Per-field entries are combined so the merged result has the same shape
+        as validate_data would return for the whole file.
+        
+        Args:
+            merged_issues: Issues merged from previous chunks (or None for the first chunk)
+            chunk_issues: Issues returned by validate_data for the current chunk
+            
+        Returns:
+            Dictionary with the merged validation issues
+        """
+        if merged_issues is None:
+            merged_issues = {issue_type: [] for issue_type in chunk_issues}
+        
+        for issue_type, issues in chunk_issues.items():
+            merged_list = merged_issues.setdefault(issue_type, [])
+            
+            if issue_type == 'price_below_cost':
+                merged_issues[issue_type] = RowSet.concat([merged_list, issues])
+            elif issue_type == 'column_name_issues':
+                for col in issues:
+                    if col not in merged_list:
+                        merged_list.append(col)
+            else:
+                for issue in issues:
+                    # VIN and duplicate issues have several entries per field, one per check
+                    existing = next((entry for entry in merged_list
+                                     if entry['field'] == issue['field'] and entry.get('check') == issue.get('check')), None)
+                    aligned_keys = [key for key in ROW_ALIGNED_KEYS if key in issue]
+                    if existing is None:
+                        merged_list.append({**issue, **{key: RowSet(issue[key]) for key in aligned_keys}})
+                    else:
+                        for key in aligned_keys:
+                            existing[key] = RowSet.concat([existing[key], issue[key]])
+                        if 'count' in issue:
+                            existing['count'] += issue['count']
+        
+        return merged_issues
     
-    def clean_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_column_names(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Clean column names by removing newline characters and standardizing format.
         
         Args:
             df: DataFrame with original column names
+            copy: Work on a copy of df (default). If False, df is modified in place
             
         Returns:
             DataFrame with cleaned column names
         """
         # Create a copy to avoid modifying the original DataFrame
-        cleaned_df = df.copy()
+        cleaned_df = df.copy() if copy else df
         
         # Create a mapping of old column names to new column names
         column_mapping = {}
@@ -143,27 +306,38 @@ class DataValidator:
             column_mapping[col] = new_col
         
         # Rename the columns
-        cleaned_df = cleaned_df.rename(columns=column_mapping)
+        if copy:
+            cleaned_df = cleaned_df.rename(columns=column_mapping)
+        else:
+            cleaned_df.rename(columns=column_mapping, inplace=True)
         
         return cleaned_df
     
-    def convert_data_types(self, df: pd.DataFrame) -> pd.DataFrame:
+    def convert_data_types(self, df: pd.DataFrame, parsed_columns: Optional[Dict[str, Dict[str, pd.Series]]] = None, copy: bool = True, compact: bool = False) -> pd.DataFrame:
         """
         Convert columns to their expected data types.
         
         Args:
             df: DataFrame with columns to convert
+            parsed_columns: Output of parse_typed_columns for df (optional), reused
+                instead of parsing the columns again
+            copy: Work on a copy of df (default). If False, df is modified in place
+            compact: Also store the frame in compact dtypes (see compact_dtypes)
             
         Returns:
             DataFrame with converted data types
         """
         # Create a copy to avoid modifying the original DataFrame
-        converted_df = df.copy()
+        converted_df = df.copy() if copy else df
         
         # Convert columns to their expected types
         for col, expected_type in self.expected_types.items():
             if col in converted_df.columns:
-                if expected_type == 'int':
+                if parsed_columns is not None and col in parsed_columns:
+                    converted_df[col] = parsed_columns[col]['values']
+                    if expected_type == 'int':
+                        converted_df[col] = converted_df[col].astype('Int64')
+                elif expected_type == 'int':
                     # Convert to integer, coercing errors to NaN
                     converted_df[col] = pd.to_numeric(converted_df[col], errors='coerce')
                     # Convert NaN to None for proper handling
@@ -172,52 +346,101 @@ class DataValidator:
                     # Convert to float, coercing errors to NaN
                     converted_df[col] = pd.to_numeric(converted_df[col], errors='coerce')
         
+        if compact:
+            converted_df = self.compact_dtypes(converted_df, copy=False)
+        
         return converted_df
     
-    def generate_validation_report(self, validation_results: Dict[str, List[Any]], df: pd.DataFrame) -> str:
+    def compact_dtypes(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """
+        Store the frame in the narrowest dtypes that keep every value unchanged.
+        
+        - Low-cardinality text columns (Make, Model, Class, ...) become categoricals
+        - Other pure-text columns (VIN, Stock #) become Arrow-backed strings when
+          pyarrow is installed
+        - Integer columns use the narrowest (nullable) integer type for their range
+        - Float columns become float32 when every value round-trips exactly
+        
+        Validation and the processing stages give the same results on the compact frame.
+        
+        Args:
+            df: DataFrame to compact
+            copy: Work on a copy of df (default). If False, df is modified in place
+            
+        Returns:
+            DataFrame with compact dtypes
+        """
+        compact_df = df.copy() if copy else df
+        arrow_strings = _arrow_strings_available()
+        
+        for position, col in enumerate(compact_df.columns):
+            values = compact_df.iloc[:, position]
+            dtype = values.dtype
+            
+            if dtype == object:
+                inferred = pd.api.types.infer_dtype(values, skipna=True)
+                # Numbers left in text columns keep their Python objects
+                if inferred in ('empty', 'boolean', 'integer', 'floating', 'mixed-integer-float', 'decimal'):
+                    continue
+                if values.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(values):
+                    compact = values.astype('category')
+                elif inferred == 'string' and arrow_strings:
+                    compact = values.astype('string[pyarrow]')
+                else:
+                    continue
+            elif pd.api.types.is_integer_dtype(dtype):
+                compact = _narrow_integers(values)
+            elif pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+                narrowed = values.astype(np.float32)
+                exact = (narrowed.astype(dtype) == values) | values.isnull()
+                if not exact.all():
+                    continue
+                compact = narrowed
+            else:
+                continue
+            
+            # Assign by position so duplicate column names are handled
+            compact_df.isetitem(position, compact)
+        
+        return compact_df
+    
+    def generate_validation_report(self, validation_results: Dict[str, List[Any]], df: Optional[pd.DataFrame], total_records: Optional[int] = None) -> str:
         """
         Generate a human-readable validation report.
         
         Args:
             validation_results: Dictionary with validation issues
-            df: Original DataFrame
+            df: Original DataFrame (may be None when total_records is given)
+            total_records: Record count to report instead of len(df), e.g. in streaming mode
             
         Returns:
             String containing the validation report
         """
-        report = "# Inventory Data Validation Report\n\n"
-        
-        # Add summary
-        total_issues = sum(len(issues) for issues in validation_results.values())
-        report += f"## Summary\n"
-        report += f"- Total records: {len(df)}\n"
-        report += f"- Total issues found: {total_issues}\n\n"
-        
-        # Add details for each issue type
-        if validation_results['missing_values']:
-            report += "## Missing Values\n"
-            for issue in validation_results['missing_values']:
-                report += f"- Field '{issue['field']}' has {issue['count']} missing values (rows: {issue['rows']})\n"
-            report += "\n"
-        
-        if validation_results['data_type_issues']:
-            report += "## Data Type Issues\n"
-            for issue in validation_results['data_type_issues']:
-                report += f"- Field '{issue['field']}' has values that cannot be converted to {issue['expected_type']} (rows: {issue['rows']})\n"
-            report += "\n"
-        
-        if validation_results['price_below_cost']:
-            report += "## Price Below Cost\n"
-            report += f"- {len(validation_results['price_below_cost'])} records have Price less than Unit Cost (rows: {validation_results['price_below_cost']})\n\n"
-        
-        if validation_results['column_name_issues']:
-            report += "## Column Name Issues\n"
-            report += f"- {len(validation_results['column_name_issues'])} columns have newline characters: {validation_results['column_name_issues']}\n\n"
-        
-        if validation_results['special_character_issues']:
-            report += "## Special Character Issues\n"
-            for issue in validation_results['special_character_issues']:
-                report += f"- Field '{issue['field']}' has special characters in {len(issue['rows'])} rows (rows: {issue['rows']})\n"
-            report += "\n"
-        
-        return report
\ No newline at end of file
+        report = io.StringIO()
+        write_validation_report(report, validation_results, total_records if total_records is not None else len(df))
+        return report.getvalue()
+
+
+def _arrow_strings_available() -> bool:
+    """Return True if pandas can store strings in Arrow arrays."""
+    try:
+        # Raises if pyarrow is missing or older than pandas requires
+        pd.StringDtype('pyarrow')
+    except ImportError:
+        return False
+    return True
+
+
+def _narrow_integers(values: pd.Series) -> pd.Series:
+    """Cast an integer column to the narrowest integer dtype that holds its range."""
+    if values.isnull().all():
+        return values
+    
+    low, high = values.min(), values.max()
+    nullable = isinstance(values.dtype, pd.api.extensions.ExtensionDtype)
+    for name in NULLABLE_INT_DTYPES:
+        limits = np.iinfo(name.lower())
+        if limits.min <= low and high <= limits.max:
+            return values.astype(name if nullable else name.lower())
+    
+    return values
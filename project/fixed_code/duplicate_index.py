@@ -0,0 +1,539 @@
+"""
+Duplicate Index Module
+
+This module finds repeated VIN and Stock # values, within one inventory file
+and across the files of many rooftops and runs. Key values are hashed to 64
+bits and kept in open-addressing hash tables probed with NumPy, so a batch of
+keys is looked up or inserted with a few array operations per probe step and
+each lookup stays O(1) however large the table grows. Within a file the table
+lives in memory; across files the tables are .npy files in an index directory
+that records, for every key, the file and row that listed it first.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import logging
+import contextlib
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from issue_store import RowSet
+
+try:
+    import fcntl
+except ImportError:
+    # No cross-process locking on Windows; run batches with one worker there
+    fcntl = None
+
+logger = logging.getLogger('duplicate_index')
+
+# Columns checked for duplicates and the name of their table in the index directory
+DUPLICATE_KEY_COLUMNS = {
+    'VIN': 'vin',
+    'Stock #': 'stock_number'
+}
+
+# Check name -> (report text, issue marker text with a {field} placeholder)
+DUPLICATE_CHECKS = {
+    'within_file': ('repeats a value of an earlier row of the file', 'Duplicate {field}'),
+    'across_files': ('repeats a value listed by another file', '{field} listed by another file')
+}
+
+# Table slot layout; a key of 0 marks an empty slot
+SLOT_DTYPE = np.dtype([('key', '<u8'), ('file', '<u4'), ('row', '<i8')])
+
+# Owner of keys whose file no longer lists them
+NO_FILE = np.iinfo(np.uint32).max
+
+INITIAL_CAPACITY = 1 << 16
+
+# Tables grow to twice their size before more than half of the slots are used
+MAX_LOAD = 0.5
+
+# The delta table is merged into the base once it holds 1/DELTA_RATIO of the base's keys
+DELTA_RATIO = 8
+
+
+def key_hashes(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash the key values of a column.
+    
+    Values are compared as text without surrounding spaces and case, so
+    ' 1hgcm82633a004352' and '1HGCM82633A004352' are the same key. Whole-number
+    floats are written as integers, so a numeric column read as float64
+    because of blanks lists 123.0 as the same key '123' as a text column.
+    
+    Args:
+        values: Key column
+    
+    Returns:
+        Tuple containing:
+            - Boolean mask of the rows with a value
+            - Array with one non-zero uint64 hash per row with a value
+    """
+    present = values.notnull().to_numpy()
+    text = _key_text(values[present]).str.strip().str.upper()
+    present[present] = (text != '').to_numpy()
+    text = text[text != '']
+    
+    # hash_array uses a fixed key, so hashes are the same in every run
+    hashes = pd.util.hash_array(text.to_numpy(dtype=object), categorize=False)
+    hashes[hashes == 0] = 1
+    return present, hashes
+
+
+def _key_text(values: pd.Series) -> pd.Series:
+    """Return key values as text, with whole-number floats in integer form."""
+    if pd.api.types.is_float_dtype(values.dtype):
+        numbers = values.to_numpy(dtype=np.float64)
+        whole = np.isfinite(numbers) & (numbers == np.round(numbers)) & (np.abs(numbers) < 2.0 ** 63)
+        text = values.astype(str).to_numpy(dtype=object)
+        text[whole] = numbers[whole].astype(np.int64).astype(str)
+        return pd.Series(text, index=values.index)
+    
+    # Float cells among the text of an object column
+    inferred = pd.api.types.infer_dtype(values, skipna=True) if values.dtype == object else None
+    if inferred in ('floating', 'mixed-integer-float', 'mixed-integer', 'mixed'):
+        return values.map(lambda value: str(int(value)) if isinstance(value, float) and value.is_integer() else str(value))
+    
+    return values.astype(str)
+
+
+class HashIndex:
+    """
+    Open-addressing hash table from 64-bit key hashes to (file id, row).
+    
+    Slots are probed linearly. Keys are not removed one by one; a key whose
+    file no longer lists it is kept with the owner NO_FILE, so probe sequences
+    stay intact, and the key is taken over by the next file that lists it.
+    """
+    
+    def __init__(self, slots: Optional[np.ndarray] = None, count: int = 0):
+        """
+        Initialize the table.
+        
+        Args:
+            slots: Slot array with SLOT_DTYPE, e.g. a memory-mapped file
+                (optional; an empty in-memory table by default)
+            count: Number of used slots
+        """
+        self.slots = np.zeros(INITIAL_CAPACITY, dtype=SLOT_DTYPE) if slots is None else slots
+        self.count = count
+    
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Find the slots of keys.
+        
+        Args:
+            keys: Non-zero uint64 key hashes
+        
+        Returns:
+            Slot position of each key, -1 if the key is not in the table
+        """
+        table_keys = self.slots['key']
+        mask = len(table_keys) - 1
+        positions = np.full(len(keys), -1, dtype=np.int64)
+        
+        slots = (keys & np.uint64(mask)).astype(np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            probed = table_keys[slots[pending]]
+            hit = probed == keys[pending]
+            positions[pending[hit]] = slots[pending[hit]]
+            # Keys stop at their own slot or at an empty slot
+            pending = pending[~hit & (probed != 0)]
+            slots[pending] = (slots[pending] + 1) & mask
+        
+        return positions
+    
+    def insert(self, keys: np.ndarray, files: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        Add keys that are not in the table yet.
+        
+        Args:
+            keys: Distinct non-zero uint64 key hashes, none of them in the table
+            files: File id of each key
+            rows: Row of each key
+        
+        Returns:
+            Slot position of each key
+        """
+        self.reserve(len(keys))
+        table_keys = self.slots['key']
+        mask = len(table_keys) - 1
+        positions = np.full(len(keys), -1, dtype=np.int64)
+        
+        slots = (keys & np.uint64(mask)).astype(np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            free = pending[table_keys[slots[pending]] == 0]
+            # Of the keys probing the same free slot, the first one takes it
+            _, first = np.unique(slots[free], return_index=True)
+            placed = free[first]
+            # The key goes in last, so a slot of a memory-mapped table is never used half-written
+            self.slots['file'][slots[placed]] = files[placed]
+            self.slots['row'][slots[placed]] = rows[placed]
+            self.slots['key'][slots[placed]] = keys[placed]
+            positions[placed] = slots[placed]
+            
+            pending = pending[positions[pending] < 0]
+            slots[pending] = (slots[pending] + 1) & mask
+        
+        self.count += len(keys)
+        return positions
+    
+    def reserve(self, new_keys: int) -> None:
+        """Grow the table so that new_keys more keys keep it at most MAX_LOAD full."""
+        if self.count + new_keys > len(self.slots) * MAX_LOAD:
+            grown = HashIndex.from_entries(self.entries(), extra=new_keys)
+            self.slots = grown.slots
+    
+    def entries(self) -> np.ndarray:
+        """Return the used slots."""
+        return self.slots[self.slots['key'] != 0]
+    
+    @classmethod
+    def from_entries(cls, entries: np.ndarray, extra: int = 0) -> 'HashIndex':
+        """
+        Build an in-memory table from slots with distinct keys.
+        
+        Args:
+            entries: Slots with SLOT_DTYPE
+            extra: Number of keys the table should take before it grows again
+        
+        Returns:
+            HashIndex holding the entries
+        """
+        capacity = INITIAL_CAPACITY
+        while len(entries) + extra > capacity * MAX_LOAD:
+            capacity *= 2
+        table = cls(np.zeros(capacity, dtype=SLOT_DTYPE))
+        table.insert(entries['key'], entries['file'], entries['row'])
+        return table
+
+
+class DuplicateIndex:
+    """
+    On-disk index of the key values of every processed inventory file.
+    
+    Each key column has two tables in the index directory: a large base table
+    that is memory-mapped read-only, and a small delta table that holds every
+    change since the base was written and overrides it. Lookups probe both, so
+    they stay O(1). Changes write only the changed slots of the memory-mapped
+    delta; the delta file is rewritten whole only when it is created or grows
+    (to twice its size), and it is merged into a new base once it holds an
+    eighth of the base's keys, so the cost per key stays O(1) on average. The
+    directory also holds the keys each feed listed in its last run and
+    index.json with the feeds, their latest file paths and the table sizes.
+    A feed is identified by a caller-supplied feed key, such as a rooftop id,
+    so differently named exports of one feed own the same keys; without a
+    feed key, the file path identifies the feed. Changes are made under an
+    exclusive file lock, so the worker processes of a batch can share one index.
+    """
+    
+    def __init__(self, index_dir: str, key_columns: Tuple[str, ...] = tuple(DUPLICATE_KEY_COLUMNS)):
+        """
+        Initialize the index.
+        
+        Args:
+            index_dir: Directory of the index (created if needed)
+            key_columns: Columns whose values are indexed (keys of DUPLICATE_KEY_COLUMNS)
+        """
+        self.index_dir = index_dir
+        self.key_columns = key_columns
+        os.makedirs(index_dir, exist_ok=True)
+    
+    def claim(self, file_path: str, column: str, keys: np.ndarray, rows: np.ndarray,
+              feed_key: Optional[str] = None) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Record keys for a file and report the keys listed by other feeds.
+        
+        Keys that no feed owns are taken over by the file's feed; keys owned by
+        another feed keep their owner.
+        
+        Args:
+            file_path: Inventory file the keys belong to
+            column: Key column
+            keys: Distinct key hashes of the file
+            rows: Row of each key in the file
+            feed_key: Id of the feed the file was exported from (optional,
+                defaults to the file path)
+        
+        Returns:
+            Tuple containing:
+                - Boolean mask of the keys owned by another feed
+                - Latest file path of the owning feed of each of those keys
+                - Row of each of those keys in that file
+        """
+        with self._locked() as meta:
+            file_id = self._file_id(meta, file_path, feed_key)
+            base, delta = self._open_tables(meta, column)
+            owners, stored_rows = self._owners(base, delta, keys)
+            
+            conflicts = (owners != NO_FILE) & (owners != file_id)
+            conflict_files = [meta['paths'].get(str(owner), meta['files'][owner])
+                              for owner in owners[conflicts].tolist()]
+            
+            # Keys that are new, released or moved within the file are written to
+            # the delta; re-runs of an unchanged file change nothing
+            changed = ~conflicts & ((owners != file_id) | (stored_rows != rows))
+            if changed.any():
+                self._write(meta, column, base, delta, keys[changed],
+                            np.full(int(changed.sum()), file_id, dtype=np.uint32), rows[changed])
+        
+        return conflicts, conflict_files, stored_rows[conflicts]
+    
+    def release_stale(self, file_path: str, column: str, keys: np.ndarray, feed_key: Optional[str] = None) -> int:
+        """
+        Save the keys a feed lists now and release the keys it no longer lists.
+        
+        Args:
+            file_path: Inventory file
+            column: Key column
+            keys: Every key hash the file lists in this run
+            feed_key: Id of the feed the file was exported from (optional,
+                defaults to the file path)
+        
+        Returns:
+            Number of released keys
+        """
+        with self._locked() as meta:
+            file_id = self._file_id(meta, file_path, feed_key)
+            keys_path = self._path(f"{DUPLICATE_KEY_COLUMNS[column]}_file_{file_id}.npy")
+            
+            released = 0
+            if os.path.exists(keys_path):
+                stale = np.setdiff1d(np.load(keys_path), keys, assume_unique=True)
+                base, delta = self._open_tables(meta, column)
+                owners, stored_rows = self._owners(base, delta, stale)
+                owned = owners == file_id
+                released = int(owned.sum())
+                if released:
+                    self._write(meta, column, base, delta, stale[owned],
+                                np.full(released, NO_FILE, dtype=np.uint32), stored_rows[owned])
+            
+            np.save(keys_path, np.unique(keys))
+        
+        return released
+    
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[Dict[str, Any]]:
+        """Hold the index lock and yield the loaded index.json, which is saved on exit."""
+        with open(self._path('index.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            
+            meta_path = self._path('index.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            else:
+                meta = {'files': [], 'paths': {}, 'counts': {}}
+            meta.setdefault('paths', {})
+            
+            yield meta
+            
+            # Closing the lock file releases the lock
+            tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+    
+    def _path(self, name: str) -> str:
+        """Return the path of a file in the index directory."""
+        return os.path.join(self.index_dir, name)
+    
+    def _file_id(self, meta: Dict[str, Any], file_path: str, feed_key: Optional[str] = None) -> int:
+        """Return the id of a file's feed, registering it on first use and recording its latest path."""
+        path = os.path.abspath(file_path)
+        feed = f"feed:{feed_key}" if feed_key else path
+        if feed not in meta['files']:
+            meta['files'].append(feed)
+        file_id = meta['files'].index(feed)
+        if feed_key:
+            meta['paths'][str(file_id)] = path
+        return file_id
+    
+    def _open_tables(self, meta: Dict[str, Any], column: str) -> Tuple[Optional[HashIndex], HashIndex]:
+        """Memory-map the base table (None if there is none yet) read-only and the delta table for in-place updates."""
+        name = DUPLICATE_KEY_COLUMNS[column]
+        base_path, delta_path = self._path(f"{name}.npy"), self._path(f"{name}_delta.npy")
+        base = HashIndex(np.load(base_path, mmap_mode='r'), meta['counts'].get(name, 0)) if os.path.exists(base_path) else None
+        delta = HashIndex(np.load(delta_path, mmap_mode='r+'), meta['counts'].get(f"{name}_delta", 0)) if os.path.exists(delta_path) else HashIndex()
+        return base, delta
+    
+    def _owners(self, base: Optional[HashIndex], delta: HashIndex, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up the owning file and row of keys, the delta overriding the base.
+        
+        Returns:
+            Tuple of the owner file ids (NO_FILE for unknown and released keys)
+            and rows (-1 for unknown keys)
+        """
+        owners = np.full(len(keys), NO_FILE, dtype=np.uint32)
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        
+        positions = delta.lookup(keys)
+        in_delta = positions >= 0
+        owners[in_delta] = delta.slots['file'][positions[in_delta]]
+        rows[in_delta] = delta.slots['row'][positions[in_delta]]
+        
+        if base is not None and (~in_delta).any():
+            rest = np.flatnonzero(~in_delta)
+            positions = base.lookup(keys[rest])
+            in_base = positions >= 0
+            owners[rest[in_base]] = base.slots['file'][positions[in_base]]
+            rows[rest[in_base]] = base.slots['row'][positions[in_base]]
+        
+        return owners, rows
+    
+    def _write(self, meta: Dict[str, Any], column: str, base: Optional[HashIndex], delta: HashIndex,
+               keys: np.ndarray, files: np.ndarray, rows: np.ndarray) -> None:
+        """Set the owner and row of keys in the delta table, merging it into the base when it is large."""
+        name = DUPLICATE_KEY_COLUMNS[column]
+        mapped_slots = delta.slots if isinstance(delta.slots, np.memmap) else None
+        
+        positions = delta.lookup(keys)
+        in_delta = positions >= 0
+        delta.slots['file'][positions[in_delta]] = files[in_delta]
+        delta.slots['row'][positions[in_delta]] = rows[in_delta]
+        if (~in_delta).any():
+            delta.insert(keys[~in_delta], files[~in_delta], rows[~in_delta])
+        
+        base_count = 0 if base is None else base.count
+        if delta.count * DELTA_RATIO <= max(base_count, INITIAL_CAPACITY):
+            if delta.slots is mapped_slots:
+                # Only the changed slots were written to the mapped file
+                mapped_slots.flush()
+            else:
+                # A new or grown delta is written in one piece
+                _save_table(self._path(f"{name}_delta.npy"), delta.slots)
+            meta['counts'][f"{name}_delta"] = delta.count
+            return
+        
+        # Merge: base entries not overridden by the delta, then the delta, without released keys
+        entries = delta.entries()
+        if base is not None:
+            base_entries = base.entries()
+            entries = np.concatenate([base_entries[delta.lookup(base_entries['key']) < 0], entries])
+        merged = HashIndex.from_entries(entries[entries['file'] != NO_FILE])
+        
+        _save_table(self._path(f"{name}.npy"), merged.slots)
+        delta_path = self._path(f"{name}_delta.npy")
+        if os.path.exists(delta_path):
+            os.remove(delta_path)
+        meta['counts'][name] = merged.count
+        meta['counts'][f"{name}_delta"] = 0
+        logger.info(f"Merged the {column} index: {merged.count} keys")
+
+
+def _save_table(path: str, slots: np.ndarray) -> None:
+    """Write a table to a new file and swap it in, so readers never see a partial table."""
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, slots)
+    os.replace(tmp_path, path)
+
+
+class DuplicateCheck:
+    """
+    Duplicate detection for one inventory file, whole or chunk by chunk.
+    
+    Keys seen in earlier chunks are kept in an in-memory HashIndex, so a
+    value repeated in a later chunk points back to its first row. With a
+    DuplicateIndex the first occurrence of every value is also looked up
+    among the values of the other files.
+    """
+    
+    def __init__(self, file_path: str, index: Optional[DuplicateIndex] = None,
+                 key_columns: Optional[Tuple[str, ...]] = None, feed_key: Optional[str] = None):
+        """
+        Initialize the check.
+        
+        Args:
+            file_path: Inventory file being processed
+            index: Index of the other files' keys (optional)
+            key_columns: Columns to check (defaults to the index's columns, or all
+                DUPLICATE_KEY_COLUMNS without an index)
+            feed_key: Id of the feed the file was exported from, such as a rooftop
+                id (optional). A new export of the feed then takes over the keys of
+                its previous export whatever its file name; defaults to the file path
+        """
+        self.file_path = file_path
+        self.feed_key = feed_key
+        self.index = index
+        if key_columns is None:
+            key_columns = index.key_columns if index is not None else tuple(DUPLICATE_KEY_COLUMNS)
+        self.key_columns = key_columns
+        self.seen = {column: HashIndex() for column in key_columns}
+        self.file_keys = {column: [] for column in key_columns}
+    
+    def check(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Find the duplicate key values of a frame (or of the next chunk of the file).
+        
+        Args:
+            df: Frame with cleaned column names; its index holds the row numbers
+        
+        Returns:
+            List of duplicate issue entries, each with 'field', 'check' and 'rows',
+            and the pointers 'conflict_rows' (and 'conflict_files' across files),
+            one per affected row
+        """
+        issues = []
+        for column in self.key_columns:
+            if column not in df.columns:
+                continue
+            
+            present, hashes = key_hashes(df[column])
+            labels = df.index.to_numpy()[present]
+            codes, unique_keys = pd.factorize(hashes)
+            unique_keys = np.asarray(unique_keys, dtype=np.uint64)
+            
+            # First position of each distinct key in this frame (the last write wins)
+            first = np.empty(len(unique_keys), dtype=np.int64)
+            first[codes[::-1]] = np.arange(len(codes))[::-1]
+            
+            # Keys from earlier chunks point to their stored row; repeats within the frame to their first row
+            seen = self.seen[column]
+            seen_positions = seen.lookup(unique_keys)
+            earlier = seen_positions >= 0
+            conflict_rows = np.where(earlier[codes], seen.slots['row'][seen_positions[codes]], labels[first[codes]])
+            repeated = earlier[codes] | (first[codes] != np.arange(len(codes)))
+            if repeated.any():
+                issues.append({
+                    'field': column,
+                    'check': 'within_file',
+                    'rows': RowSet(labels[repeated]),
+                    'conflict_rows': RowSet(conflict_rows[repeated])
+                })
+            
+            new_keys = unique_keys[~earlier]
+            new_rows = labels[first[~earlier]]
+            seen.insert(new_keys, np.zeros(len(new_keys), dtype=np.uint32), new_rows)
+            self.file_keys[column].append(new_keys)
+            
+            if self.index is not None and len(new_keys):
+                conflicts, conflict_files, other_rows = self.index.claim(
+                    self.file_path, column, new_keys, new_rows, self.feed_key
+                )
+                if conflicts.any():
+                    order = np.argsort(new_rows[conflicts], kind='stable')
+                    issues.append({
+                        'field': column,
+                        'check': 'across_files',
+                        'rows': RowSet(new_rows[conflicts][order]),
+                        'conflict_files': RowSet(np.array(conflict_files, dtype=object)[order]),
+                        'conflict_rows': RowSet(other_rows[order])
+                    })
+        
+        return issues
+    
+    def finish(self) -> None:
+        """Release the index entries of values the file no longer lists (call after the last chunk)."""
+        if self.index is None:
+            return
+        for column in self.key_columns:
+            keys = np.concatenate(self.file_keys[column]) if self.file_keys[column] else np.empty(0, dtype=np.uint64)
+            released = self.index.release_stale(self.file_path, column, keys, self.feed_key)
+            if released:
+                logger.info(f"Released {released} {column} values no longer listed by {self.file_path}")
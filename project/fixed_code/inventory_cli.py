@@ -0,0 +1,294 @@
+"""
+Inventory Command Line Entry Point
+
+This script is a lightweight entry point for short-lived, per-file runs. It
+only imports the standard library at startup: argument parsing, input checks
+and the unchanged-file shortcut run before pandas and the pipeline modules are
+imported, and the log file is not opened until the first record is written.
+
+Usage:
+    python inventory_cli.py [--queued-logging] [--log-level LOGGER=LEVEL] <command> ...
+    python inventory_cli.py validate <file>
+    python inventory_cli.py upload <file> <output_dir> [--chunk-size N] [--compact-dtypes]
+                                   [--state-dir DIR] [--feed-key KEY] [--endpoint-url URL] [--skip-unchanged]
+    python inventory_cli.py batch <input> [<input> ...] <output_dir> [--workers N]
+    python inventory_cli.py serve [--socket PATH | --port N] [--workers N] [--max-queued N]
+                                  [--cost-book FILE --retail-book FILE]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from typing import Dict, List, Optional
+
+from log_config import configure_logging
+
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xls', '.csv', '.arrow', '.feather')
+
+# TCP port of the serve command
+DEFAULT_SERVE_PORT = 8765
+
+# Written to the output directory after a successful upload run
+INPUT_DIGEST_FILE = '.input_digest.json'
+
+
+def file_digest(file_path: str) -> str:
+    """Return the content digest of a file."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_unchanged(file_path: str, output_dir: str) -> bool:
+    """Return True if the last successful run into output_dir had the same input content."""
+    try:
+        with open(os.path.join(output_dir, INPUT_DIGEST_FILE)) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return previous.get('file') == os.path.abspath(file_path) and previous.get('digest') == file_digest(file_path)
+
+
+def record_input(file_path: str, output_dir: str) -> None:
+    """Remember the input content of a successful run."""
+    with open(os.path.join(output_dir, INPUT_DIGEST_FILE), 'w') as f:
+        json.dump({'file': os.path.abspath(file_path), 'digest': file_digest(file_path)}, f)
+
+
+def check_input(file_path: str, allow_dir: bool = False) -> Optional[str]:
+    """Return an error message if the input cannot be processed, without importing pandas."""
+    if allow_dir and os.path.isdir(file_path):
+        return None
+    if not os.path.isfile(file_path):
+        return f"Inventory file not found: {file_path}"
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        return f"Unsupported file format: {ext}"
+    return None
+
+
+def run_validate(args: argparse.Namespace) -> int:
+    """Process and validate one file and print a summary."""
+    from inventory_processor import InventoryProcessor
+    
+    processor = InventoryProcessor(compact_dtypes=args.compact_dtypes, vin_checks=args.vin_checks,
+                                   duplicate_checks=args.duplicate_checks, memory_map=args.memory_map)
+    _, results = processor.process_inventory(args.file)
+    if not results['success']:
+        print(results['error_message'], file=sys.stderr)
+        return 1
+    
+    print(f"{results['records_processed']} records, {results['records_with_issues']} with issues, "
+          f"validation {'passed' if results['validation_passed'] else 'failed'}")
+    return 0
+
+
+def build_upload_handler(args: argparse.Namespace):
+    """Create the upload handler and upload configuration of an upload or batch command."""
+    from upload_handler import UploadHandler
+    
+    state_store = None
+    if args.state_dir:
+        from row_state import RowStateStore
+        state_store = RowStateStore(args.state_dir)
+    
+    upload_config = {
+        'skip_records_with_issues': not args.keep_records_with_issues,
+        'save_processed_file': True,
+        'save_results': True
+    }
+    if args.chunk_size:
+        upload_config['chunk_size'] = args.chunk_size
+    if args.endpoint_url:
+        upload_config['endpoint_url'] = args.endpoint_url
+    if args.results_format:
+        upload_config['results_format'] = args.results_format
+    if args.processed_format:
+        upload_config['processed_format'] = args.processed_format
+    if getattr(args, 'feed_key', None):
+        upload_config['feed_key'] = args.feed_key
+    
+    duplicate_index = None
+    if args.duplicate_index:
+        from duplicate_index import DuplicateIndex
+        duplicate_index = DuplicateIndex(args.duplicate_index)
+    
+    handler = UploadHandler(compact_dtypes=args.compact_dtypes, state_store=state_store,
+                            report_max_ranges=args.report_max_ranges, vin_checks=args.vin_checks,
+                            duplicate_checks=args.duplicate_checks, duplicate_index=duplicate_index,
+                            memory_map=args.memory_map)
+    return handler, upload_config
+
+
+def run_upload(args: argparse.Namespace) -> int:
+    """Run the upload process for one file."""
+    if args.skip_unchanged and is_unchanged(args.file, args.output_dir):
+        print(f"{args.file} is unchanged since the last run; skipped")
+        return 0
+    
+    handler, upload_config = build_upload_handler(args)
+    try:
+        results = handler.handle_upload_process(args.file, args.output_dir, upload_config)
+    finally:
+        handler.close()
+    
+    if not results['success']:
+        print(results['error_message'], file=sys.stderr)
+        return 1
+    
+    record_input(args.file, args.output_dir)
+    print(f"{results['records_processed']} records processed, {results['records_uploaded']} uploaded, "
+          f"{results['records_failed']} failed")
+    return 0
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Run the upload process for many files across worker processes."""
+    handler, upload_config = build_upload_handler(args)
+    inputs = args.inputs[0] if len(args.inputs) == 1 and os.path.isdir(args.inputs[0]) else args.inputs
+    batch_results = handler.handle_batch_upload(inputs, args.output_dir, upload_config, max_workers=args.workers)
+    
+    print(f"{batch_results['files_succeeded']} of {batch_results['total_files']} files succeeded, "
+          f"{batch_results['records_uploaded']} records uploaded")
+    return 0 if batch_results['success'] else 1
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """Serve processing requests until the daemon is shut down."""
+    from inventory_daemon import InventoryDaemon
+    
+    handler, upload_config = build_upload_handler(args)
+    handler.close()
+    daemon = InventoryDaemon(handler.handler_options(), upload_config, workers=args.workers,
+                             max_queued=args.max_queued, cost_book_path=args.cost_book,
+                             retail_book_path=args.retail_book)
+    
+    address = args.socket if args.socket else (args.host, args.port)
+    print(f"Serving inventory requests on {address}")
+    daemon.serve_forever(address)
+    return 0
+
+
+def parse_log_levels(values: List[str]) -> Dict[str, str]:
+    """Turn LOGGER=LEVEL arguments into a dictionary of logger levels."""
+    module_levels = {}
+    for value in values:
+        name, _, level = value.partition('=')
+        if not name or not isinstance(logging.getLevelName(level.upper()), int):
+            raise argparse.ArgumentTypeError(f"Invalid log level: {value}")
+        module_levels[name] = level.upper()
+    return module_levels
+
+
+def add_upload_options(command: argparse.ArgumentParser) -> None:
+    """Add the options shared by the upload and batch commands."""
+    command.add_argument('--chunk-size', type=int, help="Stream the file in chunks of this many rows")
+    command.add_argument('--compact-dtypes', action='store_true')
+    command.add_argument('--state-dir', help="Row state directory for incremental processing")
+    command.add_argument('--endpoint-url', help="Upload endpoint (simulated if not given)")
+    command.add_argument('--keep-records-with-issues', action='store_true')
+    command.add_argument('--results-format', choices=['json', 'ndjson'],
+                         help="Format of the saved upload results (default json)")
+    command.add_argument('--processed-format', choices=['xlsx', 'xlsx_stream', 'csv', 'parquet', 'arrow'],
+                         help="Format of the processed inventory file (default xlsx, or csv with --chunk-size)")
+    command.add_argument('--report-max-ranges', type=int,
+                         help="List at most this many row ranges per issue in the summary report")
+    command.add_argument('--vin-checks', action='store_true',
+                         help="Validate VIN check digits and compare VINs with Make and Year")
+    command.add_argument('--duplicate-checks', action='store_true',
+                         help="Report VIN and Stock # values repeated within a file")
+    command.add_argument('--duplicate-index',
+                         help="Index directory shared across files and runs; also reports values listed by other files")
+    command.add_argument('--memory-map', action='store_true',
+                         help="Memory-map CSV and Arrow inputs; only uncompressed Arrow files are then "
+                              "shared between concurrent readers through the page cache")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Process and upload dealer inventory files")
+    parser.add_argument('--log-file', default='inventory_cli.log', help="Log file (opened on first use)")
+    parser.add_argument('--queued-logging', action='store_true',
+                        help="Write log records from a background thread and collapse repeated messages")
+    parser.add_argument('--log-level', action='append', default=[], metavar='LOGGER=LEVEL',
+                        help="Level of one logger, e.g. upload_transport=WARNING (repeatable)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    validate = commands.add_parser('validate', help="Validate one inventory file")
+    validate.add_argument('file')
+    validate.add_argument('--compact-dtypes', action='store_true')
+    validate.add_argument('--vin-checks', action='store_true',
+                          help="Validate VIN check digits and compare VINs with Make and Year")
+    validate.add_argument('--duplicate-checks', action='store_true',
+                          help="Report VIN and Stock # values repeated within the file")
+    validate.add_argument('--memory-map', action='store_true',
+                          help="Memory-map CSV and Arrow inputs; only uncompressed Arrow files are then "
+                               "shared between concurrent readers through the page cache")
+    
+    upload = commands.add_parser('upload', help="Process and upload one inventory file")
+    upload.add_argument('file')
+    upload.add_argument('output_dir')
+    add_upload_options(upload)
+    upload.add_argument('--skip-unchanged', action='store_true',
+                        help="Exit early if the file content matches the last successful run")
+    upload.add_argument('--feed-key',
+                        help="Id of the feed the file was exported from, e.g. a rooftop id; identifies "
+                             "the feed in the row state and duplicate index instead of the file path")
+    
+    batch = commands.add_parser('batch', help="Process and upload many inventory files")
+    batch.add_argument('inputs', nargs='+', help="Inventory files, or one directory of them")
+    batch.add_argument('output_dir')
+    batch.add_argument('--workers', type=int, help="Number of worker processes (defaults to the CPU count)")
+    add_upload_options(batch)
+    
+    serve = commands.add_parser('serve', help="Serve processing requests with warm state over local HTTP")
+    serve.add_argument('--socket', help="Listen on this Unix socket instead of a TCP port")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=DEFAULT_SERVE_PORT)
+    serve.add_argument('--workers', type=int, help="Number of worker processes (defaults to the CPU count)")
+    serve.add_argument('--max-queued', type=int, default=64,
+                       help="Requests that may wait for a worker before new ones are rejected")
+    serve.add_argument('--cost-book', help="Cost Book JSON export; with --retail-book enables /margins")
+    serve.add_argument('--retail-book', help="Retail book JSON export; with --cost-book enables /margins")
+    add_upload_options(serve)
+    
+    args = parser.parse_args(argv)
+    try:
+        args.module_levels = parse_log_levels(args.log_level)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run one command."""
+    args = parse_args(argv)
+    
+    if args.command == 'serve':
+        inputs = []
+    else:
+        inputs = args.inputs if args.command == 'batch' else [args.file]
+    for file_path in inputs:
+        error = check_input(file_path, allow_dir=args.command == 'batch' and len(inputs) == 1)
+        if error:
+            print(error, file=sys.stderr)
+            return 1
+    
+    configure_logging(args.log_file, queued=args.queued_logging, module_levels=args.module_levels)
+    
+    if args.command == 'validate':
+        return run_validate(args)
+    if args.command == 'batch':
+        return run_batch(args)
+    if args.command == 'serve':
+        return run_serve(args)
+    return run_upload(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,475 @@
+"""
+Inventory Daemon Module
+
+This module keeps a long-lived process serving processing requests, so a
+request does not pay for a fresh interpreter, the pandas import, building
+the upload handler and validator, or parsing the price books. The warm state
+is built by every worker process of a pool as the pool starts; workers are
+started from a fork server that has already imported the pipeline, since
+forking the multi-threaded daemon itself could deadlock a worker on a lock
+held by another thread. Requests are queued for the pool up to a limit and
+rejected with 503 beyond it.
+
+Requests are JSON over HTTP on a local TCP port or a Unix socket:
+- POST /process  {"file", "output_dir", "upload_config"?}: run the upload process
+- POST /validate {"file"}: process and validate a file without saving outputs,
+  row state or duplicate index entries
+- POST /margins  {"file", "output_path"?}: price the eligible plans of every
+  vehicle with the warm price books (requires the books to be configured);
+  like /validate, it leaves the row state and duplicate index unchanged
+- GET  /status: pool size, generation and request counters
+- POST /reload: rebuild the warm state and replace the worker pool; requests
+  already queued finish on the old workers (also triggered by SIGHUP)
+- POST /shutdown: stop accepting requests and wait for queued ones to finish
+"""
+
+import os
+import json
+import time
+import signal
+import logging
+import threading
+import multiprocessing
+import socketserver
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Union
+from log_config import configure_logging, worker_logging_setup
+from plan_margins import PlanMarginCalculator
+from inventory_processor import InventoryProcessor
+from upload_handler import UploadHandler, JSONEncoder, BATCH_RESULT_FIELDS
+
+# Configure logging (the log file is only opened when the first record is written)
+configure_logging('inventory_daemon.log')
+logger = logging.getLogger('inventory_daemon')
+
+# Requests waiting for a worker beyond which new requests are rejected
+DEFAULT_MAX_QUEUED = 64
+
+# Upload configuration used when neither the daemon nor the request sets one
+DEFAULT_UPLOAD_CONFIG = {
+    'skip_records_with_issues': True,
+    'save_processed_file': True,
+    'save_results': True
+}
+
+# Request kinds served by the worker pool, by URL path
+WORKER_REQUESTS = {'/process': 'process', '/validate': 'validate', '/margins': 'margins'}
+
+# Warm state of this process: the daemon builds it before starting its workers
+# (so bad options fail in the daemon), and every worker builds its own
+_state: Optional[Dict[str, Any]] = None
+
+
+def build_state(handler_options: Dict[str, Any], cost_book_path: Optional[str] = None,
+                retail_book_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the objects kept warm between requests.
+    
+    Args:
+        handler_options: Keyword arguments for the UploadHandler
+        cost_book_path: Cost Book JSON export (optional; enables /margins with retail_book_path)
+        retail_book_path: Retail book JSON export (optional)
+    
+    Returns:
+        Dictionary with the 'handler', the read-only 'processor' of /validate and
+        /margins requests and the 'margins' calculator (None without price books)
+    """
+    margins = None
+    if cost_book_path and retail_book_path:
+        margins = PlanMarginCalculator.from_json(cost_book_path, retail_book_path)
+    
+    # Requests that only look at a file must not replace its feed's row state or
+    # claim its values in the duplicate index; duplicates are still checked within the file
+    processor_options = {
+        **handler_options,
+        'state_store': None,
+        'duplicate_index': None,
+        'duplicate_checks': bool(handler_options.get('duplicate_checks') or handler_options.get('duplicate_index'))
+    }
+    
+    return {
+        'handler': UploadHandler(**handler_options),
+        'processor': InventoryProcessor(**processor_options),
+        'margins': margins,
+        'options': (handler_options, cost_book_path, retail_book_path)
+    }
+
+
+class InventoryDaemon:
+    """
+    Worker pool with warm processing state, and the HTTP server in front of it.
+    """
+    
+    def __init__(self, handler_options: Optional[Dict[str, Any]] = None,
+                 upload_config: Optional[Dict[str, Any]] = None, workers: Optional[int] = None,
+                 max_queued: int = DEFAULT_MAX_QUEUED, cost_book_path: Optional[str] = None,
+                 retail_book_path: Optional[str] = None):
+        """
+        Initialize the daemon. The warm state and workers are created by start().
+        
+        Args:
+            handler_options: Keyword arguments for the UploadHandler (see UploadHandler.handler_options)
+            upload_config: Upload configuration of /process requests; keys a request
+                sends in 'upload_config' override it
+            workers: Number of worker processes (defaults to the CPU count)
+            max_queued: Requests that may wait for a worker before new ones get 503
+            cost_book_path: Cost Book JSON export (optional; enables /margins)
+            retail_book_path: Retail book JSON export (optional; enables /margins)
+        """
+        self.handler_options = handler_options or {}
+        self.upload_config = upload_config or dict(DEFAULT_UPLOAD_CONFIG)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self.cost_book_path = cost_book_path
+        self.retail_book_path = retail_book_path
+        
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.generation = 0
+        self.in_flight = 0
+        self.requests_served = 0
+        self.requests_rejected = 0
+        self.started_at = None
+        self.server = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stopped = threading.Event()
+    
+    def start(self) -> None:
+        """Build the warm state and start the worker pool."""
+        self.started_at = time.time()
+        self._replace_pool()
+    
+    def reload(self) -> None:
+        """
+        Rebuild the warm state and switch to a new worker pool.
+        
+        The new pool is warmed before it takes requests. Requests already
+        submitted finish on the old pool, which then exits.
+        """
+        with self._reload_lock:
+            if self.executor is None:
+                # Not started yet, or shut down
+                return
+            old_executor = self._replace_pool()
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+        logger.info(f"Reloaded inventory daemon (generation {self.generation})")
+    
+    def shutdown(self) -> None:
+        """
+        Stop accepting requests, wait for the submitted ones to finish and answer them.
+        
+        The server returned by bind() must be serving when this is called.
+        A reload in progress finishes first, so it cannot install a new pool
+        after this one is taken down.
+        """
+        with self._reload_lock, self._lock:
+            server, self.server = self.server, None
+            executor, self.executor = self.executor, None
+        
+        if server is not None:
+            server.shutdown()
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if server is not None:
+            # Joins the connection threads, so every pending request gets its response
+            server.server_close()
+            if isinstance(server.server_address, str) and os.path.exists(server.server_address):
+                os.remove(server.server_address)
+        
+        logger.info("Inventory daemon stopped")
+        self._stopped.set()
+    
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Run one request on the worker pool and wait for its result.
+        
+        Args:
+            kind: 'process', 'validate' or 'margins'
+            payload: Request body
+        
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        if not isinstance(payload.get('file'), str):
+            return 400, {'success': False, 'error_message': "Request needs a 'file' path"}
+        if kind == 'process':
+            if not isinstance(payload.get('output_dir'), str):
+                return 400, {'success': False, 'error_message': "Request needs an 'output_dir' path"}
+            payload = {**payload, 'upload_config': {**self.upload_config, **(payload.get('upload_config') or {})}}
+        
+        with self._lock:
+            if self.executor is None:
+                return 503, {'success': False, 'error_message': "The daemon is shutting down"}
+            if self.in_flight >= self.workers + self.max_queued:
+                self.requests_rejected += 1
+                return 503, {'success': False, 'error_message': f"{self.in_flight} requests pending; try again later"}
+            self.in_flight += 1
+            future = self.executor.submit(_serve_request, kind, payload)
+        
+        try:
+            response = future.result()
+        except Exception as e:
+            # The worker process itself failed (e.g. it was killed)
+            error_msg = f"Worker failed while serving {kind} for {payload['file']}: {str(e)}"
+            logger.error(error_msg)
+            response = {'success': False, 'error_message': error_msg}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.requests_served += 1
+        
+        return 200, response
+    
+    def status(self) -> Dict[str, Any]:
+        """Return the pool size, generation and request counters."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'generation': self.generation,
+                'in_flight': self.in_flight,
+                'max_queued': self.max_queued,
+                'requests_served': self.requests_served,
+                'requests_rejected': self.requests_rejected,
+                'price_books': bool(self.cost_book_path and self.retail_book_path),
+                'uptime_seconds': round(time.time() - self.started_at, 3) if self.started_at else 0.0
+            }
+    
+    def bind(self, address: Union[str, Tuple[str, int]]) -> socketserver.BaseServer:
+        """
+        Create the HTTP server for this daemon.
+        
+        Args:
+            address: Unix socket path, or (host, port) to listen on (port 0 picks a free port)
+        
+        Returns:
+            Server, with the bound address in server_address
+        """
+        if isinstance(address, str):
+            # A socket file left by a daemon that did not shut down cleanly
+            if os.path.exists(address):
+                os.remove(address)
+            self.server = _UnixHTTPServer(address, _DaemonRequestHandler)
+        else:
+            self.server = _TCPHTTPServer(address, _DaemonRequestHandler)
+        self.server.daemon = self
+        return self.server
+    
+    def serve_forever(self, address: Union[str, Tuple[str, int]]) -> None:
+        """
+        Start the daemon and serve requests until shutdown.
+        
+        SIGHUP reloads the daemon; SIGTERM and SIGINT shut it down gracefully.
+        """
+        self.start()
+        server = self.bind(address)
+        
+        if threading.current_thread() is threading.main_thread():
+            # Signal handlers must not block the serving loop, so the work runs in threads
+            signal.signal(signal.SIGHUP, lambda *_: threading.Thread(target=self.reload, daemon=True).start())
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: threading.Thread(target=self.shutdown, daemon=True).start())
+        
+        logger.info(f"Inventory daemon listening on {server.server_address} with {self.workers} workers")
+        server.serve_forever()
+        # The loop ends as shutdown() starts; wait for it to drain the queue
+        self._stopped.wait()
+    
+    def _replace_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Build a new warm state and worker pool, and return the pool it replaces."""
+        global _state
+        _state = build_state(self.handler_options, self.cost_book_path, self.retail_book_path)
+        
+        logging_initializer, logging_args = worker_logging_setup()
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_worker_context(),
+                                       initializer=_init_worker,
+                                       initargs=(_state['options'], logging_initializer, logging_args))
+        # Start every worker now rather than on the first requests
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        
+        with self._lock:
+            old_executor, self.executor = self.executor, executor
+            self.generation += 1
+        return old_executor
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Translate HTTP requests into daemon calls."""
+    
+    def do_GET(self) -> None:
+        if self.path == '/status':
+            self._send(200, self.server.daemon.status())
+        else:
+            self._send(404, {'success': False, 'error_message': f"Unknown path: {self.path}"})
+    
+    def do_POST(self) -> None:
+        daemon = self.server.daemon
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("the body must be a JSON object")
+        except ValueError as e:
+            self._send(400, {'success': False, 'error_message': f"Invalid request body: {str(e)}"})
+            return
+        
+        if self.path in WORKER_REQUESTS:
+            self._send(*daemon.submit(WORKER_REQUESTS[self.path], payload))
+        elif self.path == '/reload':
+            daemon.reload()
+            self._send(200, {'success': True, **daemon.status()})
+        elif self.path == '/shutdown':
+            self._send(200, {'success': True})
+            # shutdown() waits for the serving loop, which is waiting for this handler
+            threading.Thread(target=daemon.shutdown, daemon=True).start()
+        else:
+            self._send(404, {'success': False, 'error_message': f"Unknown path: {self.path}"})
+    
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+    
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, cls=JSONEncoder).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    """HTTP server on a local TCP port, one thread per connection."""
+    # server_close() waits for the connection threads
+    daemon_threads = False
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server on a Unix socket, one thread per connection."""
+    daemon_threads = False
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP client connection over a Unix socket."""
+    
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+    
+    def connect(self) -> None:
+        import socket
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def send_request(address: Union[str, Tuple[str, int]], path: str, payload: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None) -> Tuple[int, Dict[str, Any]]:
+    """
+    Send one request to a running daemon.
+    
+    Args:
+        address: Unix socket path, or (host, port) of the daemon
+        path: Request path, e.g. '/process'; sent as GET without a payload, else as POST
+        payload: JSON request body (optional)
+        timeout: Socket timeout in seconds (optional)
+    
+    Returns:
+        Tuple of (HTTP status, response body)
+    """
+    if isinstance(address, str):
+        connection = _UnixHTTPConnection(address, timeout=timeout)
+    else:
+        connection = http.client.HTTPConnection(address[0], address[1], timeout=timeout)
+    
+    try:
+        if payload is None:
+            connection.request('GET', path)
+        else:
+            connection.request('POST', path, body=json.dumps(payload), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """Return the multiprocessing context worker pools start their processes with."""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # Workers are forked from the single-threaded server with the pipeline already imported
+    context.set_forkserver_preload(['inventory_daemon'])
+    return context
+
+
+def _init_worker(options: Tuple[Dict[str, Any], Optional[str], Optional[str]], logging_initializer, logging_args) -> None:
+    """Set up a worker process: route its logging and build the warm state."""
+    global _state
+    if logging_initializer is not None:
+        logging_initializer(*logging_args)
+    _state = build_state(*options)
+
+
+def _ping() -> int:
+    """Task that returns once a worker is up."""
+    return os.getpid()
+
+
+def _serve_request(kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Serve one request in a worker process with the warm state.
+    
+    Defined at module level so it can be sent to worker processes. Exceptions
+    are turned into a failed response so one bad request cannot take down a worker.
+    
+    Args:
+        kind: 'process', 'validate' or 'margins'
+        payload: Request body
+    
+    Returns:
+        Response body, with the time spent in the worker under 'elapsed_ms'
+    """
+    start = time.perf_counter()
+    handler = _state['handler']
+    try:
+        if kind == 'process':
+            results = handler.handle_upload_process(payload['file'], payload['output_dir'], payload['upload_config'])
+            response = {field: results.get(field) for field in BATCH_RESULT_FIELDS}
+            response['metrics'] = results.get('metrics')
+        elif kind == 'validate':
+            _, results = _state['processor'].process_inventory(payload['file'])
+            response = {field: results.get(field) for field in
+                        ['success', 'error_message', 'validation_passed', 'records_processed', 'records_with_issues']}
+            response['issue_counts'] = {
+                issue_type: len(issues) for issue_type, issues in results['validation_issues'].items()
+            }
+        elif _state['margins'] is None:
+            response = {'success': False, 'error_message': "The daemon was started without price books"}
+        else:
+            df, results = _state['processor'].process_inventory(payload['file'])
+            if df is None:
+                response = {'success': False, 'error_message': results['error_message']}
+            else:
+                margins = _state['margins'].calculate_margins(df)
+                if payload.get('output_path'):
+                    margins.to_csv(payload['output_path'], index=False)
+                response = {
+                    'success': True,
+                    'error_message': None,
+                    'vehicles_priced': int(margins['record_index'].nunique()),
+                    'plans_priced': len(margins)
+                }
+    except Exception as e:
+        error_msg = f"Error serving {kind} for {payload.get('file')}: {str(e)}"
+        logger.error(error_msg)
+        response = {'success': False, 'error_message': error_msg}
+    
+    response['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return response
@@ -0,0 +1,177 @@
+"""
+Inventory Generator Module
+
+This module generates seeded synthetic inventory exports in the layout of the
+dealer rating export (same columns, duplicate "Body" header and newlines in the
+J.D. Power headers). The rates of missing values, unparseable numbers,
+price-below-cost rows and special characters are configurable, so benchmarks
+and tests can produce realistic files from a few rows to millions of rows.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger('inventory_generator')
+
+# Column layout of the rating export; the second "Body" is the body style
+EXPORT_COLUMNS = [
+    'Year', 'Body', 'Stock #', 'VIN', 'Odometer', 'Make', 'Model', 'Series', 'Class',
+    'Drivetrain\nType', 'Engine', 'Body', 'Transmission', 'Price', 'Unit Cost',
+    'J.D. Power\nTrade In', 'J.D. Power\nRetail Clean'
+]
+
+# Make, Model, Series, Class, Drivetrain, Engine, Body style, Transmission
+VEHICLE_CATALOG = [
+    ('Ford', 'Escape', 'SE', 'SUV, Compact Sport Utility', 'FWD', '1.5L EcoBoost', '4D Sport Utility', '8-Speed Automatic'),
+    ('Ford', 'Escape', 'Titanium', 'SUV, Compact Sport Utility', 'AWD', '2.0L EcoBoost', '4D Sport Utility', '8-Speed Automatic'),
+    ('Ford', 'Fusion', 'SE', 'Car, Intermediate', 'FWD', '1.5L EcoBoost', '4D Sedan', '6-Speed Automatic'),
+    ('Ford', 'Edge', 'SEL', 'SUV, Midsize Sport Utility', 'AWD', '2.0L EcoBoost', '4D Sport Utility', '8-Speed Automatic'),
+    ('Ford', 'Explorer', 'XLT', 'SUV, Midsize Sport Utility', '4WD', '2.3L EcoBoost I-4', '4D Sport Utility', '10-Speed Automatic'),
+    ('Ford', 'F-150', 'XLT', 'Truck, Full-Size Pickup', '4WD', '5.0L V8', '4D SuperCrew', '10-Speed Automatic'),
+    ('Ford', 'Bronco Sport', 'Big Bend', 'SUV, Compact Sport Utility', '4WD', '1.5L EcoBoost', '4D Sport Utility', '8-Speed Automatic'),
+    ('Ford', 'Mustang', 'EcoBoost', 'Car, Sporty', 'RWD', '2.3L EcoBoost', '2D Coupe', '10-Speed Automatic'),
+    ('Lincoln', 'MKZ', 'Select', 'Car, Luxury', 'AWD', '2.0L EcoBoost', '4D Sedan', '6-Speed Automatic'),
+    ('Chevrolet', 'Equinox', 'LT', 'SUV, Compact Sport Utility', 'AWD', '1.5L DOHC', '4D Sport Utility', '6-Speed Automatic'),
+    ('Chevrolet', 'Malibu', 'LT', 'Car, Intermediate', 'FWD', '1.5L DOHC', '4D Sedan', 'CVT'),
+    ('Chevrolet', 'Tahoe', 'LT', 'SUV, Full-Size Sport Utility', '4WD', '5.3L V8', '4D Sport Utility', '10-Speed Automatic'),
+    ('Jeep', 'Grand Cherokee', 'Limited', 'SUV, Midsize Sport Utility', '4WD', '3.6L V6 24V VVT', '4D Sport Utility', '8-Speed Automatic'),
+    ('Nissan', 'Altima', '2.5 SV', 'Car, Intermediate', 'FWD', '2.5L 4-Cylinder DOHC 16V', '4D Sedan', 'CVT with Xtronic'),
+    ('Nissan', 'Rogue', 'SV', 'SUV, Compact Sport Utility', 'AWD', '2.5L 4-Cylinder DOHC 16V', '4D Sport Utility', 'CVT'),
+    ('Toyota', 'Camry', 'SE', 'Car, Intermediate', 'FWD', '2.5L 4-Cylinder DOHC', '4D Sedan', '8-Speed Automatic'),
+    ('Honda', 'CR-V', 'EX', 'SUV, Compact Sport Utility', 'AWD', '1.5L Turbo I4', '4D Sport Utility', 'CVT'),
+    ('Buick', 'Encore', 'Preferred', 'SUV, Compact Sport Utility', 'FWD', 'ECOTEC 1.4L I4 Turbocharged', '4D Sport Utility', '6-Speed Automatic'),
+]
+
+COLORS = [
+    'Oxford White', 'Agate Black Metallic', 'Magnetic', 'Iconic Silver', 'Rapid Red Metallic',
+    'Atlas Blue Metallic', 'Carbonized Gray', 'Star White Metallic Tri-Coat', 'Silver Metallic', 'Summit White'
+]
+
+# Values that make a numeric cell unparseable, as seen in dealer exports
+BAD_NUMBERS = ['Call for price', 'N/A', 'TBD', '12,500.00 USD', '']
+
+# Class values with characters the validator flags
+SPECIAL_CLASSES = [
+    'SUV, Compact\nSport Utility', 'Car/Intermediate', 'Truck (Full-Size)', 'SUV & Crossover', 'Car - Sporty'
+]
+
+VIN_ALPHABET = np.frombuffer(b'ABCDEFGHJKLMNPRSTUVWXYZ0123456789', dtype=np.uint8)
+
+DEFAULT_RATES = {
+    'missing_rate': 0.01,
+    'bad_type_rate': 0.005,
+    'below_cost_rate': 0.02,
+    'special_char_rate': 0.005
+}
+
+# Largest row count a single Excel worksheet can hold (plus the header row)
+EXCEL_MAX_ROWS = 1_048_575
+
+
+def generate_inventory(rows: int, seed: int = 0, start: int = 0, missing_rate: float = 0.01,
+                       bad_type_rate: float = 0.005, below_cost_rate: float = 0.02,
+                       special_char_rate: float = 0.005) -> pd.DataFrame:
+    """
+    Generate a synthetic inventory frame.
+    
+    Args:
+        rows: Number of vehicles
+        seed: Random seed; the same seed and arguments give the same frame
+        start: Position of the first row in a larger file (keeps Stock # unique across chunks)
+        missing_rate: Probability that each required field of a row is empty
+        bad_type_rate: Probability that each numeric field of a row is unparseable text
+        below_cost_rate: Fraction of rows priced below unit cost
+        special_char_rate: Fraction of rows whose Class contains special characters
+    
+    Returns:
+        DataFrame with EXPORT_COLUMNS
+    """
+    rng = np.random.default_rng([seed, start])
+    
+    catalog = np.array(VEHICLE_CATALOG, dtype=object)
+    vehicles = catalog[rng.integers(0, len(catalog), rows)]
+    year = rng.integers(2014, 2026, rows)
+    odometer = np.clip((2026 - year) * rng.normal(12000, 4000, rows), 5, None).astype(np.int64)
+    
+    unit_cost = rng.integers(6000, 55000, rows)
+    price = unit_cost + rng.integers(500, 6000, rows)
+    below_cost = rng.random(rows) < below_cost_rate
+    price[below_cost] = unit_cost[below_cost] - rng.integers(100, 3000, int(below_cost.sum()))
+    trade_in = (unit_cost * rng.uniform(0.8, 1.1, rows)).round(-1).astype(np.int64)
+    retail_clean = (price * rng.uniform(1.0, 1.25, rows)).round(-1).astype(np.int64)
+    
+    vin_codes = VIN_ALPHABET[rng.integers(0, len(VIN_ALPHABET), (rows, 17))]
+    vins = np.ascontiguousarray(vin_codes).view('S17').ravel().astype(str)
+    stock = np.char.add(np.char.add('T', np.arange(start + 1000, start + 1000 + rows).astype(str)), 'P')
+    
+    vehicle_class = vehicles[:, 3].copy()
+    special = rng.random(rows) < special_char_rate
+    vehicle_class[special] = rng.choice(np.array(SPECIAL_CLASSES, dtype=object), int(special.sum()))
+    
+    data = {
+        'Year': year.astype(object),
+        'Body': rng.choice(np.array(COLORS, dtype=object), rows),
+        'Stock #': stock.astype(object),
+        'VIN': vins.astype(object),
+        'Odometer': odometer.astype(object),
+        'Make': vehicles[:, 0],
+        'Model': vehicles[:, 1],
+        'Series': vehicles[:, 2],
+        'Class': vehicle_class,
+        'Drivetrain\nType': vehicles[:, 4],
+        'Engine': vehicles[:, 5],
+        'Body.1': vehicles[:, 6],
+        'Transmission': vehicles[:, 7],
+        'Price': price.astype(object),
+        'Unit Cost': unit_cost.astype(object),
+        'J.D. Power\nTrade In': trade_in.astype(object),
+        'J.D. Power\nRetail Clean': retail_clean.astype(object)
+    }
+    
+    for col in ['Year', 'Odometer', 'Price', 'Unit Cost']:
+        bad = rng.random(rows) < bad_type_rate
+        data[col][bad] = rng.choice(np.array(BAD_NUMBERS, dtype=object), int(bad.sum()))
+    
+    for col in ['Year', 'Stock #', 'VIN', 'Make', 'Model', 'Price', 'Unit Cost']:
+        missing = rng.random(rows) < missing_rate
+        data[col][missing] = np.nan
+    
+    df = pd.DataFrame(data)
+    df.columns = EXPORT_COLUMNS
+    return df
+
+
+def write_inventory_file(file_path: str, rows: int, seed: int = 0, chunk_size: int = 250_000,
+                         rates: Optional[Dict[str, float]] = None) -> int:
+    """
+    Write a synthetic inventory file, generating it in chunks to bound memory.
+    
+    Args:
+        file_path: Output path (.csv or .xlsx)
+        rows: Number of vehicles
+        seed: Random seed
+        chunk_size: Rows generated at a time (CSV only; .xlsx is written in one frame)
+        rates: Overrides for DEFAULT_RATES
+    
+    Returns:
+        Size of the written file in bytes
+    """
+    rates = {**DEFAULT_RATES, **(rates or {})}
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    if ext == '.csv':
+        for start in range(0, max(rows, 1), chunk_size):
+            chunk = generate_inventory(min(chunk_size, rows - start), seed=seed, start=start, **rates)
+            chunk.to_csv(file_path, mode='w' if start == 0 else 'a', header=(start == 0), index=False)
+    elif ext == '.xlsx':
+        if rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"An .xlsx worksheet holds at most {EXCEL_MAX_ROWS:,} rows")
+        generate_inventory(rows, seed=seed, **rates).to_excel(file_path, index=False)
+    else:
+        raise ValueError(f"Unsupported file format: {ext}")
+    
+    logger.info(f"Generated {rows} rows in {file_path}")
+    return os.path.getsize(file_path)
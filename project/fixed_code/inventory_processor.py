@@ -9,29 +9,76 @@ import pandas as pd
 import numpy as np
 import os
 import logging
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Iterator
 from data_validator import DataValidator
+from duplicate_index import DuplicateIndex, DuplicateCheck
+from issue_store import count_distinct_rows, issue_row_sets
+from log_config import configure_logging
+from parse_cache import ParseCache
+from processed_writer import ProcessedWriter
+from report_writer import write_validation_report, write_row_sidecar, sidecar_path_for
+from row_state import RowStateStore, ROW_STATUSES, row_hashes, schema_fingerprint, classify_rows
+from stage_metrics import track_stage, log_stage_metrics, format_stage_metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('inventory_processor.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging (the log file is only opened when the first record is written)
+configure_logging('inventory_processor.log')
 logger = logging.getLogger('inventory_processor')
 
+# Default number of rows per chunk in streaming mode
+DEFAULT_CHUNK_SIZE = 50000
+
+# Extensions of Arrow IPC (Feather version 2) input files
+ARROW_EXTENSIONS = ['.arrow', '.feather']
+
 
 class InventoryProcessor:
     """
     Class for processing inventory files and preparing them for upload.
     """
     
-    def __init__(self):
-        """Initialize the inventory processor with a data validator."""
-        self.validator = DataValidator()
+    def __init__(self, parse_cache: Optional[ParseCache] = None, fused_parsing: bool = False,
+                 compact_dtypes: bool = False, state_store: Optional[RowStateStore] = None,
+                 report_max_ranges: Optional[int] = None, vin_checks: bool = False,
+                 duplicate_checks: bool = False, duplicate_index: Optional[DuplicateIndex] = None,
+                 memory_map: bool = False):
+        """
+        Initialize the inventory processor with a data validator.
+        
+        Args:
+            parse_cache: Cache for parsed Excel files (optional, disabled by default)
+            fused_parsing: Parse each typed column once and share the result between
+                validation and conversion (results are unchanged)
+            compact_dtypes: Store processed frames with categoricals and narrow numeric
+                dtypes (see DataValidator.compact_dtypes)
+            state_store: Per-feed row state (optional). When given, process_inventory
+                only validates and converts rows that are new or changed since the
+                last export of the same feed (see process_inventory's feed_key)
+            report_max_ranges: Write a size-bounded report (optional). When given, the
+                validation report is not built in memory; generate_summary_report
+                streams it to the file with affected rows compressed into ranges, at
+                most this many per issue, and saves the complete rows to a sidecar file
+            vin_checks: Validate VINs and compare them with Make and Year
+                (see DataValidator)
+            duplicate_checks: Report VIN and Stock # values repeated within a file,
+                as 'duplicate_issues' pointing to the first row with the value
+            duplicate_index: Index of the values of every processed file (optional).
+                When given, values already listed by another feed are also
+                reported, with its file and row; implies duplicate_checks
+            memory_map: Memory-map CSV and Arrow input files. Only uncompressed
+                Arrow files are shared: their columns without missing values are
+                views of the mapped file, shared through the page cache by every
+                process reading it. CSV files are still parsed into private
+                buffers; mapping them only avoids copying the file while parsing
+        """
+        self.validator = DataValidator(vin_checks=vin_checks)
+        self.parse_cache = parse_cache
+        self.fused_parsing = fused_parsing
+        self.compact_dtypes = compact_dtypes
+        self.state_store = state_store
+        self.report_max_ranges = report_max_ranges
+        self.duplicate_checks = duplicate_checks or duplicate_index is not None
+        self.duplicate_index = duplicate_index
+        self.memory_map = memory_map
     
     def read_inventory_file(self, file_path: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
         """
@@ -50,9 +97,11 @@ class InventoryProcessor:
             _, ext = os.path.splitext(file_path)
             
             if ext.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
+                df = self._read_excel_cached(file_path)
             elif ext.lower() == '.csv':
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, memory_map=self.memory_map)
+            elif ext.lower() in ARROW_EXTENSIONS:
+                df = self._arrow_to_frame(self._read_arrow_table(file_path))
             else:
                 error_msg = f"Unsupported file format: {ext}"
                 logger.error(error_msg)
@@ -72,17 +121,190 @@ class InventoryProcessor:
             logger.error(error_msg)
             return None, error_msg
     
-    def process_inventory(self, file_path: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+    def _read_arrow_table(self, file_path: str) -> Any:
+        """
+        Read an Arrow IPC file (Feather version 2) as a pyarrow Table.
+        
+        With memory_map set, the table's buffers point into the mapped file
+        unless the file is compressed.
+        
+        Raises:
+            ImportError: If pyarrow is not available
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(f"Reading Arrow files requires pyarrow: {e}") from e
+        
+        if self.memory_map:
+            # The mapping stays open for as long as the table's buffers are referenced
+            return pa.ipc.open_file(pa.memory_map(file_path, 'r')).read_all()
+        with pa.OSFile(file_path, 'rb') as source:
+            return pa.ipc.open_file(source).read_all()
+    
+    def _arrow_to_frame(self, table: Any, start: int = 0) -> pd.DataFrame:
+        """
+        Convert a pyarrow Table to a DataFrame whose index starts at start.
+        
+        Numeric and datetime columns without missing values are not copied
+        (split_blocks keeps pandas from consolidating them into one new block).
+        """
+        df = table.to_pandas(split_blocks=True)
+        df.index = pd.RangeIndex(start, start + len(df))
+        
+        # Arrow returns None for missing strings; pd.read_csv uses NaN, and reads
+        # columns that are entirely empty as float columns
+        object_columns = df.select_dtypes(include='object').columns
+        if len(object_columns) > 0:
+            objects = df[object_columns]
+            df[object_columns] = objects.mask(objects.isna(), np.nan).infer_objects(copy=False)
+        return df
+    
+    def _read_excel_cached(self, file_path: str) -> pd.DataFrame:
+        """
+        Read an Excel file, reusing the parsed frame from the parse cache when possible.
+        
+        Args:
+            file_path: Path to the Excel file
+            
+        Returns:
+            DataFrame with the first worksheet
+        """
+        if self.parse_cache is None:
+            return pd.read_excel(file_path)
+        
+        # Any option passed to pd.read_excel must be part of the key
+        reader_options = {'reader': 'read_excel', 'ext': os.path.splitext(file_path)[1].lower()}
+        key = self.parse_cache.cache_key(file_path, reader_options)
+        
+        df = self.parse_cache.get(key)
+        if df is None:
+            df = pd.read_excel(file_path)
+            self.parse_cache.put(key, df)
+        
+        return df
+    
+    def iter_inventory_chunks(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Read an inventory file as a sequence of fixed-size DataFrame chunks.
+        
+        Every chunk keeps a global row index, so row numbers reported by
+        validation match the ones a whole-file read would produce.
+        
+        Args:
+            file_path: Path to the inventory file
+            chunk_size: Maximum number of rows per chunk
+            
+        Yields:
+            DataFrame chunks of at most chunk_size rows
+            
+        Raises:
+            ValueError: If the file format is unsupported or chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        
+        _, ext = os.path.splitext(file_path)
+        
+        if ext.lower() == '.csv':
+            with pd.read_csv(file_path, chunksize=chunk_size, memory_map=self.memory_map) as reader:
+                for chunk in reader:
+                    yield chunk
+        elif ext.lower() == '.xlsx':
+            yield from self._iter_xlsx_chunks(file_path, chunk_size)
+        elif ext.lower() in ARROW_EXTENSIONS:
+            table = self._read_arrow_table(file_path)
+            for start in range(0, table.num_rows, chunk_size):
+                yield self._arrow_to_frame(table.slice(start, chunk_size), start)
+        elif ext.lower() == '.xls':
+            # xlrd has no row-streaming API, so the sheet is parsed once and sliced
+            df = pd.read_excel(file_path)
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start:start + chunk_size]
+        else:
+            raise ValueError(f"Unsupported file format: {ext}")
+    
+    def _iter_xlsx_chunks(self, file_path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """
+        Stream rows from the first worksheet of an .xlsx file in read-only mode.
+        
+        Column names follow pd.read_excel: blank headers become 'Unnamed: N' and
+        repeated headers get a '.N' suffix. Blank rows are only kept when a
+        non-blank row follows them, matching how pandas trims trailing rows.
+        """
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            
+            columns = []
+            seen = {}
+            for i, name in enumerate(header):
+                name = f"Unnamed: {i}" if name is None else name
+                if name in seen:
+                    seen[name] += 1
+                    name = f"{name}.{seen[name]}"
+                else:
+                    seen[name] = 0
+                columns.append(name)
+            
+            width = len(columns)
+            blank_row = (None,) * width
+            buffer = []
+            pending_blank_rows = 0
+            start = 0
+            
+            for row in rows:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+                if row == blank_row:
+                    pending_blank_rows += 1
+                    continue
+                
+                buffer.extend([blank_row] * pending_blank_rows)
+                pending_blank_rows = 0
+                buffer.append(row)
+                
+                while len(buffer) >= chunk_size:
+                    yield self._records_to_chunk(buffer[:chunk_size], columns, start)
+                    start += chunk_size
+                    buffer = buffer[chunk_size:]
+            
+            if buffer:
+                yield self._records_to_chunk(buffer, columns, start)
+        finally:
+            workbook.close()
+    
+    def _records_to_chunk(self, records: List[tuple], columns: List[str], start: int) -> pd.DataFrame:
+        """Build a chunk from worksheet rows, indexed from its global start row."""
+        chunk = pd.DataFrame.from_records(records, columns=columns)
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        # Empty cells come back as None; use NaN like pd.read_excel does, and let
+        # columns that are entirely empty become float columns as they do there
+        return chunk.mask(chunk.isna(), np.nan).infer_objects(copy=False)
+    
+    def process_inventory(self, file_path: str, copy: bool = True, feed_key: Optional[str] = None) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
         """
         Process an inventory file by reading, validating, and transforming the data.
         
         Args:
             file_path: Path to the inventory file
+            copy: Copy the frame at every stage (default). If False, the frame read
+                from the file is transformed in place, which avoids holding several
+                copies of the inventory at once
+            feed_key: Id of the feed the file was exported from, such as a rooftop
+                id (optional). Exports with the same feed key share their row
+                state and duplicate index keys even when their file names differ;
+                defaults to the file path
             
         Returns:
             Tuple containing:
                 - Processed DataFrame (or None if processing failed)
-                - Dictionary with processing results and validation issues
+                - Dictionary with processing results, validation issues and
+                  per-stage metrics under 'metrics' (see stage_metrics.track_stage)
         """
         results = {
             'success': False,
@@ -90,75 +312,311 @@ class InventoryProcessor:
             'validation_issues': {},
             'error_message': None,
             'records_processed': 0,
-            'records_with_issues': 0
+            'records_with_issues': 0,
+            'metrics': {}
         }
         
+        metrics = results['metrics']
+        
         # Read the inventory file
-        df, error = self.read_inventory_file(file_path)
+        with track_stage(metrics, 'read') as stage:
+            df, error = self.read_inventory_file(file_path)
+            stage['rows'] = 0 if df is None else len(df)
         if error:
             results['error_message'] = error
+            log_stage_metrics(logger, metrics, file_path)
             return None, results
         
         # Store the original record count
         original_count = len(df)
         results['records_processed'] = original_count
         
-        # Clean column names
-        df = self.validator.clean_column_names(df)
+        # Only validate and convert new and changed rows if a row state store is configured
+        if self.state_store is not None:
+            df = self._process_incremental(df, file_path, results, copy, feed_key)
+            validation_issues = results['validation_issues']
+        else:
+            with track_stage(metrics, 'validate', original_count):
+                # Clean column names
+                df = self.validator.clean_column_names(df, copy=copy)
+                
+                # Parse the typed columns once if fused parsing is enabled
+                parsed_columns = self.validator.parse_typed_columns(df) if self.fused_parsing else None
+                
+                # Validate the data
+                validation_passed, validation_issues = self.validator.validate_data(df, parsed_columns)
+                results['validation_passed'] = validation_passed
+                results['validation_issues'] = validation_issues
+                
+                # Count records with issues
+                results['records_with_issues'] = self._count_records_with_issues(validation_issues)
+            
+            with track_stage(metrics, 'convert', original_count):
+                # Convert data types
+                df = self.validator.convert_data_types(df, parsed_columns, copy=copy, compact=self.compact_dtypes)
+                
+                # Fix missing values in non-critical fields
+                df = self.fix_missing_values(df, copy=copy)
         
-        # Validate the data
-        validation_passed, validation_issues = self.validator.validate_data(df)
-        results['validation_passed'] = validation_passed
-        results['validation_issues'] = validation_issues
+        # Duplicates depend on the whole file (and other files), so they are checked after the row-level checks
+        if self.duplicate_checks:
+            with track_stage(metrics, 'duplicates', original_count):
+                duplicate_check = DuplicateCheck(file_path, self.duplicate_index, feed_key=feed_key)
+                validation_issues['duplicate_issues'] = duplicate_check.check(df)
+                duplicate_check.finish()
+                results['validation_passed'] = all(len(issue_list) == 0 for issue_list in validation_issues.values())
+                results['records_with_issues'] = self._count_records_with_issues(validation_issues)
         
-        # Count records with issues
-        records_with_issues = set()
-        for issue_type, issues in validation_issues.items():
-            if issue_type == 'missing_values':
-                for issue in issues:
-                    records_with_issues.update(issue['rows'])
-            elif issue_type == 'data_type_issues':
-                for issue in issues:
-                    records_with_issues.update(issue['rows'])
-            elif issue_type == 'price_below_cost':
-                records_with_issues.update(issues)
-            elif issue_type == 'special_character_issues':
-                for issue in issues:
-                    records_with_issues.update(issue['rows'])
-        
-        results['records_with_issues'] = len(records_with_issues)
-        
-        # Convert data types
-        df = self.validator.convert_data_types(df)
-        
-        # Fix missing values in non-critical fields
-        df = self.fix_missing_values(df)
-        
-        # Generate validation report
-        validation_report = self.validator.generate_validation_report(validation_issues, df)
-        results['validation_report'] = validation_report
+        # Generate validation report, unless it is streamed by generate_summary_report
+        if self.report_max_ranges is None:
+            with track_stage(metrics, 'report', original_count):
+                validation_report = self.validator.generate_validation_report(validation_issues, df)
+            results['validation_report'] = validation_report
         
         # Set success flag
         results['success'] = True
         
+        log_stage_metrics(logger, metrics, file_path)
+        
         return df, results
     
-    def fix_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _process_incremental(self, df: pd.DataFrame, file_path: str, results: Dict[str, Any], copy: bool,
+                             feed_key: Optional[str] = None) -> pd.DataFrame:
+        """
+        Validate and convert only the rows that changed since the last export of the feed.
+        
+        Rows are matched to the stored state by VIN and compared by content hash.
+        Unchanged rows reuse their stored validation flags and converted values;
+        new and changed rows go through validation and conversion. The issues,
+        converted frame and filled values are the same as processing every row,
+        except that a numeric column may keep the wider dtype of its stored rows.
+        
+        Args:
+            df: DataFrame as read from the inventory file
+            file_path: Path to the inventory file, which identifies the feed
+                unless feed_key is given
+            results: Processing results to fill in, including 'row_changes'
+            copy: Work on a copy of df (default). If False, df is modified in place
+            feed_key: Id of the feed the file was exported from (optional)
+            
+        Returns:
+            Converted DataFrame with missing values fixed
+        """
+        metrics = results['metrics']
+        
+        with track_stage(metrics, 'diff', len(df)):
+            df = self.validator.clean_column_names(df, copy=copy)
+            
+            key = self.state_store.state_key(file_path, feed_key)
+            schema = schema_fingerprint(df)
+            if self.validator.vin_checks:
+                # Stored flags only cover the checks that ran when they were saved
+                schema.append(('vin_checks', 'True'))
+            state = self.state_store.load(key, schema)
+            
+            # Matched rows share their VIN, so only the other columns are compared
+            hashes = row_hashes(df, skip_columns=('VIN',))
+            vins = df['VIN'] if 'VIN' in df.columns else pd.Series(np.nan, index=df.index)
+            status, keyed, removed = classify_rows(vins, hashes, state)
+            
+            unchanged = status == ROW_STATUSES.index('unchanged')
+            fresh_df = df[~unchanged]
+            state_positions = state['hashes'].index.get_indexer(vins[unchanged]) if unchanged.any() else None
+        
+        with track_stage(metrics, 'validate', len(fresh_df)):
+            parsed_columns = self.validator.parse_typed_columns(fresh_df) if self.fused_parsing else None
+            
+            # Combine the flags of the fresh rows with the stored flags of the unchanged rows
+            flags = {}
+            for flag_key, fresh_mask in self.validator.row_issue_flags(fresh_df, parsed_columns).items():
+                mask = np.zeros(len(df), dtype=bool)
+                mask[~unchanged] = fresh_mask
+                if state_positions is not None:
+                    mask[unchanged] = state['flags'][flag_key].to_numpy()[state_positions]
+                flags[flag_key] = mask
+            
+            validation_issues = self.validator.issues_from_flags(flags, df.index)
+            validation_issues['column_name_issues'] = [col for col in df.columns if '\n' in col]
+            results['validation_passed'] = all(len(issue_list) == 0 for issue_list in validation_issues.values())
+            results['validation_issues'] = validation_issues
+            results['records_with_issues'] = self._count_records_with_issues(validation_issues)
+        
+        with track_stage(metrics, 'convert', len(fresh_df)):
+            # Conversion only changes the typed columns; the others are kept as read
+            typed_columns = [col for col in self.validator.expected_types if col in df.columns]
+            converted = self.validator.convert_data_types(fresh_df[typed_columns], parsed_columns)
+            
+            if state_positions is not None:
+                cached = state['values'].iloc[state_positions].set_axis(df.index[unchanged])
+                converted = pd.concat([part for part in (converted, cached) if len(part)]).reindex(df.index)
+            
+            # The state keeps the converted values before frame-wide fills such as medians
+            state_values = converted[keyed]
+            
+            for col in typed_columns:
+                df[col] = converted[col]
+            if self.compact_dtypes:
+                df = self.validator.compact_dtypes(df, copy=False)
+            df = self.fix_missing_values(df, copy=False)
+        
+        counts = np.bincount(status, minlength=len(ROW_STATUSES))
+        results['row_changes'] = {name: int(count) for name, count in zip(ROW_STATUSES, counts)}
+        results['row_changes']['removed'] = len(removed)
+        results['row_changes']['removed_vins'] = removed.tolist()
+        logger.info(f"Row changes for {file_path}: " + ", ".join(
+            f"{count} {name}" for name, count in results['row_changes'].items() if name != 'removed_vins'
+        ))
+        
+        # Nothing to store if every row was reused and none was removed
+        if counts[ROW_STATUSES.index('unchanged')] < keyed.sum() or len(removed) > 0 or state is None:
+            with track_stage(metrics, 'state', int(keyed.sum())):
+                keyed_vins = vins[keyed].to_numpy()
+                self.state_store.save(
+                    key, schema,
+                    pd.Series(hashes[keyed], index=keyed_vins),
+                    state_values.set_axis(keyed_vins),
+                    pd.DataFrame({flag_key: mask[keyed] for flag_key, mask in flags.items()}, index=keyed_vins)
+                )
+        
+        return df
+    
+    def process_inventory_stream(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                 feed_key: Optional[str] = None) -> Tuple[Iterator[Tuple[pd.DataFrame, Dict[str, List[Any]]]], Dict[str, Any]]:
+        """
+        Process an inventory file chunk by chunk so peak memory is bounded by the chunk size.
+        
+        Each chunk goes through the same stages as process_inventory. The returned
+        results dict has the same keys and is filled in as the iterator is consumed;
+        validation_passed, validation_report and success are only final once the
+        iterator is exhausted. Missing J.D. Power values are filled with the median
+        of their own chunk rather than of the whole file.
+        
+        Args:
+            file_path: Path to the inventory file
+            chunk_size: Maximum number of rows per chunk
+            feed_key: Id of the feed the file was exported from (optional,
+                see process_inventory)
+            
+        Returns:
+            Tuple containing:
+                - Iterator of (processed chunk, validation issues for that chunk)
+                - Dictionary with processing results merged across all chunks
+        """
+        results = {
+            'success': False,
+            'validation_passed': False,
+            'validation_issues': {},
+            'error_message': None,
+            'records_processed': 0,
+            'records_with_issues': 0,
+            'metrics': {}
+        }
+        
+        return self._process_chunks(file_path, chunk_size, results, feed_key), results
+    
+    def _process_chunks(self, file_path: str, chunk_size: int, results: Dict[str, Any],
+                        feed_key: Optional[str] = None) -> Iterator[Tuple[pd.DataFrame, Dict[str, List[Any]]]]:
+        """Run the processing stages over each chunk and merge the results."""
+        validation_issues = None
+        metrics = results['metrics']
+        
+        chunks = self.iter_inventory_chunks(file_path, chunk_size)
+        # Keeps the values of earlier chunks, so repeats across chunks are found
+        duplicate_check = DuplicateCheck(file_path, self.duplicate_index, feed_key=feed_key) if self.duplicate_checks else None
+        
+        while True:
+            try:
+                with track_stage(metrics, 'read') as stage:
+                    df = next(chunks)
+                    stage['rows'] = len(df)
+            except StopIteration:
+                break
+            except Exception as e:
+                error_msg = f"Error reading inventory file: {str(e)}"
+                logger.error(error_msg)
+                results['error_message'] = error_msg
+                log_stage_metrics(logger, metrics, file_path)
+                return
+            
+            if df.empty:
+                continue
+            
+            results['records_processed'] += len(df)
+            
+            with track_stage(metrics, 'validate', len(df)):
+                df = self.validator.clean_column_names(df)
+                
+                parsed_columns = self.validator.parse_typed_columns(df) if self.fused_parsing else None
+                
+                _, chunk_issues = self.validator.validate_data(df, parsed_columns)
+                if duplicate_check is not None:
+                    chunk_issues['duplicate_issues'] = duplicate_check.check(df)
+                validation_issues = self.validator.merge_validation_issues(validation_issues, chunk_issues)
+                
+                # Row numbers are disjoint across chunks, so per-chunk counts can be summed
+                results['records_with_issues'] += self._count_records_with_issues(chunk_issues)
+            
+            with track_stage(metrics, 'convert', len(df)):
+                df = self.validator.convert_data_types(df, parsed_columns, compact=self.compact_dtypes)
+                df = self.fix_missing_values(df)
+            
+            yield df, chunk_issues
+        
+        if results['records_processed'] == 0:
+            error_msg = "The inventory file is empty"
+            logger.error(error_msg)
+            results['error_message'] = error_msg
+            log_stage_metrics(logger, metrics, file_path)
+            return
+        
+        if duplicate_check is not None:
+            duplicate_check.finish()
+        
+        results['validation_passed'] = all(len(issue_list) == 0 for issue_list in validation_issues.values())
+        results['validation_issues'] = validation_issues
+        if self.report_max_ranges is None:
+            with track_stage(metrics, 'report', results['records_processed']):
+                results['validation_report'] = self.validator.generate_validation_report(
+                    validation_issues, None, total_records=results['records_processed']
+                )
+        results['success'] = True
+        
+        logger.info(f"Successfully streamed inventory file: {file_path} ({results['records_processed']} records)")
+        log_stage_metrics(logger, metrics, file_path)
+    
+    def _count_records_with_issues(self, validation_issues: Dict[str, List[Any]]) -> int:
+        """
+        Count the distinct rows referenced by the validation issues.
+        
+        Args:
+            validation_issues: Dictionary with validation issues
+            
+        Returns:
+            Number of distinct rows with at least one issue
+        """
+        return count_distinct_rows(issue_row_sets(validation_issues))
+    
+    def fix_missing_values(self, df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
         """
         Fix missing values in the DataFrame.
         
         Args:
             df: DataFrame with missing values
+            copy: Work on a copy of df (default). If False, df is modified in place
             
         Returns:
             DataFrame with fixed missing values
         """
         # Create a copy to avoid modifying the original DataFrame
-        fixed_df = df.copy()
+        fixed_df = df.copy() if copy else df
         
         # For Drivetrain Type, fill missing values with 'Unknown'
         if 'Drivetrain Type' in fixed_df.columns:
-            fixed_df['Drivetrain Type'] = fixed_df['Drivetrain Type'].fillna('Unknown')
+            drivetrain = fixed_df['Drivetrain Type']
+            # A categorical column can only be filled with one of its categories
+            if isinstance(drivetrain.dtype, pd.CategoricalDtype) and 'Unknown' not in drivetrain.cat.categories:
+                drivetrain = drivetrain.cat.add_categories('Unknown')
+            fixed_df['Drivetrain Type'] = drivetrain.fillna('Unknown')
         
         # Don't fill missing values for Price as it's a critical field
         # that should be manually reviewed
@@ -172,31 +630,25 @@ class InventoryProcessor:
         
         return fixed_df
     
-    def save_processed_inventory(self, df: pd.DataFrame, output_path: str) -> bool:
+    def save_processed_inventory(self, df: pd.DataFrame, output_path: str, append: bool = False,
+                                 output_format: Optional[str] = None) -> bool:
         """
         Save the processed inventory DataFrame to a file.
         
         Args:
             df: Processed DataFrame
             output_path: Path to save the processed file
+            append: Append rows to an existing CSV file without repeating the header
+            output_format: One of processed_writer.PROCESSED_FORMATS ('xlsx',
+                'xlsx_stream', 'csv', 'parquet', 'arrow'); taken from the
+                file extension if not given
             
         Returns:
             Boolean indicating if the save was successful
         """
         try:
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Save based on file extension
-            _, ext = os.path.splitext(output_path)
-            
-            if ext.lower() in ['.xlsx', '.xls']:
-                df.to_excel(output_path, index=False)
-            elif ext.lower() == '.csv':
-                df.to_csv(output_path, index=False)
-            else:
-                logger.error(f"Unsupported output format: {ext}")
-                return False
+            with ProcessedWriter(output_path, output_format, append=append) as writer:
+                writer.write(df)
             
             logger.info(f"Successfully saved processed inventory to: {output_path}")
             return True
@@ -205,6 +657,55 @@ class InventoryProcessor:
             logger.error(f"Error saving processed inventory: {str(e)}")
             return False
     
+    def save_processed_stream(self, chunks: Iterator[pd.DataFrame], output_path: str,
+                              output_format: Optional[str], metrics: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+        """
+        Save chunks of processed inventory to one file while passing them on.
+        
+        The file is finished once the chunks are exhausted. If saving fails,
+        the error is logged and the remaining chunks are passed on unsaved.
+        
+        Args:
+            chunks: Processed DataFrame chunks
+            output_path: Path to save the processed file
+            output_format: One of processed_writer.PROCESSED_FORMATS (taken from
+                the file extension if None); use 'xlsx_stream' for Excel output
+            metrics: Stage metrics; the time spent saving is added under 'save'
+            
+        Yields:
+            The chunks, each after it is saved
+        """
+        try:
+            writer = ProcessedWriter(output_path, output_format)
+        except ValueError as e:
+            logger.error(f"Error saving processed inventory: {str(e)}")
+            writer = None
+        
+        try:
+            for df in chunks:
+                if writer is not None:
+                    try:
+                        with track_stage(metrics, 'save', len(df)):
+                            writer.write(df)
+                    except Exception as e:
+                        logger.error(f"Error saving processed inventory: {str(e)}")
+                        writer.abort()
+                        writer = None
+                yield df
+            
+            if writer is not None:
+                try:
+                    with track_stage(metrics, 'save', 0):
+                        writer.close()
+                    logger.info(f"Successfully saved processed inventory to: {output_path}")
+                except Exception as e:
+                    logger.error(f"Error saving processed inventory: {str(e)}")
+                writer = None
+        finally:
+            # Reached with the writer still open only if the chunks stopped early
+            if writer is not None:
+                writer.abort()
+    
     def generate_summary_report(self, results: Dict[str, Any], output_path: str) -> bool:
         """
         Generate a summary report of the processing results.
@@ -217,36 +718,50 @@ class InventoryProcessor:
             Boolean indicating if the report generation was successful
         """
         try:
-            # Create the report content
-            report = "# Inventory Processing Summary Report\n\n"
-            
-            # Add processing status
-            report += f"## Processing Status\n"
-            report += f"- Success: {'Yes' if results['success'] else 'No'}\n"
-            if results['error_message']:
-                report += f"- Error: {results['error_message']}\n"
-            report += f"- Records Processed: {results['records_processed']}\n"
-            report += f"- Records with Issues: {results['records_with_issues']}\n\n"
-            
-            # Add validation status
-            report += f"## Validation Status\n"
-            report += f"- Validation Passed: {'Yes' if results['validation_passed'] else 'No'}\n\n"
-            
-            # Add validation issues summary
-            if 'validation_issues' in results:
-                report += f"## Validation Issues Summary\n"
-                for issue_type, issues in results['validation_issues'].items():
-                    if issues:
-                        report += f"- {issue_type.replace('_', ' ').title()}: {len(issues)} issues\n"
-                report += "\n"
-            
-            # Add detailed validation report if available
-            if 'validation_report' in results:
-                report += results['validation_report']
-            
-            # Write the report to file
+            # Write the report section by section
             with open(output_path, 'w') as f:
-                f.write(report)
+                f.write("# Inventory Processing Summary Report\n\n")
+                
+                # Add processing status
+                f.write(f"## Processing Status\n")
+                f.write(f"- Success: {'Yes' if results['success'] else 'No'}\n")
+                if results['error_message']:
+                    f.write(f"- Error: {results['error_message']}\n")
+                f.write(f"- Records Processed: {results['records_processed']}\n")
+                f.write(f"- Records with Issues: {results['records_with_issues']}\n\n")
+                
+                # Add the changes since the previous export if processed incrementally
+                if results.get('row_changes'):
+                    f.write(f"## Row Changes\n")
+                    for name in ROW_STATUSES + ['removed']:
+                        f.write(f"- {name.title()}: {results['row_changes'][name]}\n")
+                    f.write("\n")
+                
+                # Add validation status
+                f.write(f"## Validation Status\n")
+                f.write(f"- Validation Passed: {'Yes' if results['validation_passed'] else 'No'}\n\n")
+                
+                # Add validation issues summary
+                if 'validation_issues' in results:
+                    f.write(f"## Validation Issues Summary\n")
+                    for issue_type, issues in results['validation_issues'].items():
+                        if issues:
+                            f.write(f"- {issue_type.replace('_', ' ').title()}: {len(issues)} issues\n")
+                    f.write("\n")
+                
+                # Add per-stage timing and memory metrics if available
+                if results.get('metrics'):
+                    f.write(format_stage_metrics(results['metrics']))
+                
+                # Add detailed validation report if available
+                if 'validation_report' in results:
+                    f.write(results['validation_report'])
+                elif self.report_max_ranges is not None and results.get('validation_issues'):
+                    # Stream the size-bounded report and keep the complete rows in a sidecar file
+                    sidecar_path = sidecar_path_for(output_path)
+                    write_validation_report(f, results['validation_issues'], results['records_processed'],
+                                            self.report_max_ranges, os.path.basename(sidecar_path))
+                    write_row_sidecar(sidecar_path, results['validation_issues'])
             
             logger.info(f"Successfully generated summary report: {output_path}")
             return True
@@ -0,0 +1,138 @@
+"""
+Issue Store Module
+
+This module keeps the rows affected by each validation issue in NumPy arrays
+instead of Python lists. A RowSet behaves like the list it replaces (length,
+iteration, comparison and the same text form in reports), while merging
+chunks and counting the distinct rows with issues run as array operations
+rather than per-row Python set updates.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Iterable, Iterator
+
+# Issue types whose entries carry a 'rows' list
+ROW_ISSUE_TYPES = ['missing_values', 'data_type_issues', 'special_character_issues', 'vin_issues', 'duplicate_issues']
+
+# Keys of issue entries that hold one value per affected row, in the order of 'rows'
+ROW_ALIGNED_KEYS = ['rows', 'conflict_rows', 'conflict_files']
+
+
+class RowSet:
+    """
+    Row labels affected by one validation issue, in frame order.
+    """
+    
+    __slots__ = ('values',)
+    
+    def __init__(self, values: Any = ()):
+        """
+        Initialize the row set.
+        
+        Args:
+            values: Row labels (array, list or another RowSet)
+        """
+        values = np.asarray(values)
+        self.values = values.astype(np.int64) if values.size == 0 else values
+    
+    @classmethod
+    def from_mask(cls, index: pd.Index, mask: np.ndarray) -> 'RowSet':
+        """
+        Select the labels of the flagged rows.
+        
+        Args:
+            index: Row labels of the frame
+            mask: Boolean mask over the rows
+        
+        Returns:
+            RowSet with the labels where mask is True
+        """
+        return cls(index.to_numpy()[mask])
+    
+    @classmethod
+    def concat(cls, row_sets: Iterable[Any]) -> 'RowSet':
+        """Join row sets (or lists) end to end, e.g. the rows of consecutive chunks."""
+        arrays = [np.asarray(rows) for rows in row_sets]
+        arrays = [values for values in arrays if values.size]
+        return cls(np.concatenate(arrays) if arrays else ())
+    
+    def union(self, *others: Any) -> 'RowSet':
+        """Return the sorted distinct labels found in this and the other row sets."""
+        return RowSet(np.unique(np.concatenate([self.values] + [np.asarray(rows) for rows in others])))
+    
+    def tolist(self) -> List[Any]:
+        """Return the labels as a list of Python scalars."""
+        return self.values.tolist()
+    
+    def __array__(self, dtype=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values.tolist())
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return RowSet(self.values[item])
+        return self.values[item].item()
+    
+    def __contains__(self, label) -> bool:
+        return bool((self.values == label).any())
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (RowSet, list, tuple, np.ndarray)):
+            return NotImplemented
+        return bool(np.array_equal(self.values, np.asarray(other)))
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        # Same text as the list of labels, so reports read as before
+        return repr(self.values.tolist())
+
+
+def issue_row_sets(validation_issues: Dict[str, List[Any]]) -> List[Any]:
+    """
+    Collect the affected rows of every row-level issue.
+    
+    Args:
+        validation_issues: Dictionary with validation issues
+    
+    Returns:
+        List of row sets (or lists), one per issue entry
+    """
+    row_sets = []
+    for issue_type, issues in validation_issues.items():
+        if issue_type == 'price_below_cost':
+            row_sets.append(issues)
+        elif issue_type in ROW_ISSUE_TYPES:
+            row_sets.extend(issue['rows'] for issue in issues)
+    return row_sets
+
+
+def count_distinct_rows(row_sets: Iterable[Any]) -> int:
+    """
+    Count the distinct labels across row sets.
+    
+    Non-negative integer labels, as read from a file, are marked in a bitmap
+    sized by the largest label; other labels are counted with pd.unique.
+    
+    Args:
+        row_sets: Row sets or lists of labels
+    
+    Returns:
+        Number of distinct labels
+    """
+    labels = RowSet.concat(row_sets).values
+    if labels.size == 0:
+        return 0
+    
+    if labels.dtype.kind in 'iu' and labels.min() >= 0:
+        bitmap = np.zeros(int(labels.max()) + 1, dtype=bool)
+        bitmap[labels] = True
+        return int(np.count_nonzero(bitmap))
+    
+    return int(len(pd.unique(labels)))
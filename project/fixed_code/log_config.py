@@ -0,0 +1,212 @@
+"""
+Log Configuration Module
+
+This module sets up the pipeline's log handlers. It only depends on the standard
+library so entry points can configure logging without importing pandas, and the
+log file is not opened until the first record is written.
+
+With queued=True, loggers only put records on a queue and a background
+listener thread writes them to the file and stderr, so processing and upload
+code never waits on log I/O. The queue is shared with batch worker processes
+(see worker_logging_setup), identical messages repeated within a short window
+are collapsed into one summary line, and the queue is drained at exit.
+"""
+
+import os
+import time
+import atexit
+import logging
+import logging.handlers
+from typing import Any, Callable, Dict, Optional, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Seconds during which repeats of a message are counted instead of written
+DEFAULT_REPEAT_WINDOW = 10.0
+
+# Listener of the queued backend and the process that started it
+_listener = None
+_listener_pid = None
+_queue_settings = None
+
+
+class AggregatingQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that collapses repeated messages.
+    
+    The first occurrence of a message (same logger, level and text) is written
+    right away. Further occurrences within repeat_window seconds are only
+    counted, and a single "repeated N more times" record is written when the
+    next record after the window arrives or when the listener is flushed. All
+    of this runs on the listener thread, so producers only pay for the queue put.
+    """
+    
+    def __init__(self, queue, *handlers, repeat_window: float = DEFAULT_REPEAT_WINDOW):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.repeat_window = repeat_window
+        # (name, level, message) -> [window start, suppressed count, last suppressed record]
+        self._repeats = {}
+        self._last_sweep = time.monotonic()
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        """Write a record unless it repeats a message seen within the window."""
+        now = time.monotonic()
+        if self.repeat_window > 0:
+            if now - self._last_sweep >= self.repeat_window:
+                self._emit_repeats(now)
+            
+            key = (record.name, record.levelno, record.getMessage())
+            seen = self._repeats.get(key)
+            if seen is not None and now - seen[0] < self.repeat_window:
+                seen[1] += 1
+                seen[2] = record
+                return
+            if seen is not None and seen[1]:
+                self._emit_summary(seen)
+            self._repeats[key] = [now, 0, None]
+        
+        super().handle(record)
+    
+    def emit_pending_repeats(self) -> None:
+        """Write the summaries of all repeats counted so far."""
+        self._emit_repeats(None)
+    
+    def _emit_repeats(self, now: Optional[float]) -> None:
+        """Write the summaries of expired windows (of all windows if now is None)."""
+        for key, seen in list(self._repeats.items()):
+            if now is None or now - seen[0] >= self.repeat_window:
+                if seen[1]:
+                    self._emit_summary(seen)
+                del self._repeats[key]
+        self._last_sweep = now if now is not None else time.monotonic()
+    
+    def _emit_summary(self, seen: list) -> None:
+        """Write one record standing for the suppressed repeats of a message."""
+        record = seen[2]
+        record.msg = f"{record.getMessage()} (repeated {seen[1]} more times)"
+        record.args = None
+        super().handle(record)
+        seen[1] = 0
+
+
+def configure_logging(log_file: str, level: int = logging.INFO, queued: bool = False,
+                      module_levels: Optional[Dict[str, Any]] = None,
+                      repeat_window: float = DEFAULT_REPEAT_WINDOW) -> None:
+    """
+    Log to a file and to stderr, unless logging is already configured.
+    
+    Like logging.basicConfig, only the first call has an effect. The file
+    handler is created with delay=True, so importing a module that calls this
+    does not create the log file.
+    
+    Args:
+        log_file: Path of the log file (relative to the working directory)
+        level: Level of the root logger
+        queued: Write records from a background thread instead of the calling thread
+        module_levels: Levels of individual loggers, e.g. {'upload_transport': 'WARNING'}
+        repeat_window: Seconds within which repeated messages are collapsed
+            (queued mode only; 0 writes every record)
+    """
+    if logging.getLogger().handlers:
+        return
+    
+    handlers = [
+        logging.FileHandler(log_file, delay=True),
+        logging.StreamHandler()
+    ]
+    
+    if queued:
+        global _listener, _listener_pid, _queue_settings
+        import multiprocessing
+        
+        # A multiprocessing queue never blocks on put and can be inherited by worker processes;
+        # one created for spawning can also be passed to forked and fork server workers
+        log_queue = multiprocessing.get_context('spawn').Queue()
+        formatter = logging.Formatter(LOG_FORMAT)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        _listener = AggregatingQueueListener(log_queue, *handlers, repeat_window=repeat_window)
+        _listener.start()
+        _listener_pid = os.getpid()
+        _queue_settings = (log_queue, level, dict(module_levels or {}))
+        atexit.register(stop_logging)
+        handlers = [_queue_handler(log_queue)]
+    
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+    set_module_levels(module_levels)
+
+
+def set_module_levels(module_levels: Optional[Dict[str, Any]]) -> None:
+    """
+    Set the levels of individual loggers.
+    
+    Args:
+        module_levels: Dictionary of logger name to level (name or number)
+    """
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level.upper() if isinstance(module_level, str) else module_level)
+
+
+def flush_logging() -> None:
+    """
+    Wait until every record logged so far by this process has been written.
+    
+    Does nothing unless queued logging was started by this process.
+    """
+    if _listener is None or _listener_pid != os.getpid():
+        return
+    
+    _listener.stop()
+    _listener.emit_pending_repeats()
+    for handler in _listener.handlers:
+        handler.flush()
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Drain the log queue and stop the listener thread (registered to run at exit)."""
+    global _listener
+    if _listener is None or _listener_pid != os.getpid():
+        return
+    
+    _listener.stop()
+    _listener.emit_pending_repeats()
+    for handler in _listener.handlers:
+        handler.flush()
+    _listener = None
+
+
+def worker_logging_setup() -> Tuple[Optional[Callable[..., None]], Tuple[Any, ...]]:
+    """
+    Build the initializer that sends a worker process's records to this process's queue.
+    
+    Returns:
+        Tuple of (initializer, initargs) for a ProcessPoolExecutor; (None, ())
+        unless queued logging is active
+    """
+    if _listener is None or _listener_pid != os.getpid():
+        return None, ()
+    return _init_worker_logging, _queue_settings
+
+
+def _init_worker_logging(log_queue, level: int, module_levels: Dict[str, Any]) -> None:
+    """Route the records of a worker process to the parent's log queue."""
+    global _listener
+    # A forked worker inherits the parent's listener, which it must not stop
+    _listener = None
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler(log_queue))
+    root.setLevel(level)
+    set_module_levels(module_levels)
+
+
+def _queue_handler(log_queue) -> logging.handlers.QueueHandler:
+    """Create a handler that puts records on the log queue."""
+    handler = logging.handlers.QueueHandler(log_queue)
+    # Only the message is rendered here; the listener's handlers apply LOG_FORMAT
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
@@ -0,0 +1,186 @@
+"""
+Parse Cache Module
+
+This module provides a content-addressed on-disk cache for parsed inventory files.
+Parsing .xls/.xlsx exports with pd.read_excel is slow, and the same export is
+often processed more than once, so parsed frames are stored in a columnar
+format keyed by the file content hash and the reader options.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('parse_cache')
+
+# Bump when the on-disk layout changes so stale entries are ignored
+CACHE_FORMAT_VERSION = 1
+
+# Default size limit for the cache directory (1 GiB)
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parsed DataFrames with size-bounded LRU eviction.
+    
+    Frames are stored as Feather (Arrow IPC) files when pyarrow is available.
+    Frames Arrow cannot represent exactly, such as object columns mixing numbers
+    and text, are stored as pickles so a cache hit always returns the same
+    values the reader produced.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory that holds the cache entries
+            max_bytes: Maximum total size of the cache entries in bytes
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def cache_key(self, file_path: str, reader_options: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a file and the options used to parse it.
+        
+        Args:
+            file_path: Path to the input file
+            reader_options: Options that affect how the file is parsed
+        
+        Returns:
+            Hex digest identifying the parsed result
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        
+        options = {
+            'reader_options': reader_options,
+            'pandas_version': pd.__version__,
+            'format_version': CACHE_FORMAT_VERSION
+        }
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+        
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+        
+        Args:
+            key: Cache key returned by cache_key
+        
+        Returns:
+            Cached DataFrame (or None on a cache miss)
+        """
+        feather_path = self._entry_path(key, '.feather')
+        pickle_path = self._entry_path(key, '.pkl')
+        
+        try:
+            if os.path.exists(feather_path):
+                df = pd.read_feather(feather_path)
+                # Arrow returns None for missing strings; pd.read_excel uses NaN, and
+                # reads columns that are entirely empty as float columns
+                object_columns = df.select_dtypes(include='object').columns
+                if len(object_columns) > 0:
+                    objects = df[object_columns]
+                    df[object_columns] = objects.mask(objects.isna(), np.nan).infer_objects(copy=False)
+                path = feather_path
+            elif os.path.exists(pickle_path):
+                df = pd.read_pickle(pickle_path)
+                path = pickle_path
+            else:
+                return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {str(e)}")
+            return None
+        
+        # Touch the entry so eviction treats it as recently used
+        os.utime(path, None)
+        logger.info(f"Parse cache hit: {key}")
+        return df
+    
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store a DataFrame in the cache and evict old entries if over the size limit.
+        
+        Args:
+            key: Cache key returned by cache_key
+            df: Parsed DataFrame to store
+        """
+        try:
+            path = self._write_feather(key, df)
+            if path is None:
+                path = self._entry_path(key, '.pkl')
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                df.to_pickle(tmp_path)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {key}: {str(e)}")
+            return
+        
+        self.evict()
+    
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(('.feather', '.pkl')):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+                logger.info(f"Evicted parse cache entry: {os.path.basename(path)}")
+            except FileNotFoundError:
+                continue
+    
+    def _write_feather(self, key: str, df: pd.DataFrame) -> Optional[str]:
+        """Write the frame as Feather, or return None if Arrow cannot store it exactly."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return None
+        
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return None
+        if not all(isinstance(col, str) for col in df.columns):
+            return None
+        # Only pure-text object columns round-trip through Arrow unchanged
+        for col in df.select_dtypes(include='object').columns:
+            if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+                return None
+        
+        path = self._entry_path(key, '.feather')
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            df.to_feather(tmp_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+        
+        os.replace(tmp_path, path)
+        return path
+    
+    def _entry_path(self, key: str, ext: str) -> str:
+        """Return the path of a cache entry."""
+        return os.path.join(self.cache_dir, f"{key}{ext}")
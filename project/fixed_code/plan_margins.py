@@ -0,0 +1,205 @@
+"""
+Plan Margins Module
+
+This module joins a processed inventory frame against the Protect Cost Book
+and Retail book. Each vehicle is assigned its rate class from the Vehicle
+Index, and the eligible plans are produced with their dealer cost, retail
+price and margin using DataFrame merges instead of per-row lookups.
+"""
+
+import pandas as pd
+import numpy as np
+import json
+import logging
+from typing import Optional
+from price_book import PriceBook, parse_vehicle_index, COST_BOOK_PATH, RETAIL_BOOK_PATH
+
+logger = logging.getLogger('plan_margins')
+
+# Columns that identify the same plan in both books
+PLAN_KEY_COLUMNS = ['plan', 'term_months', 'miles', 'deductible', 'rate_class']
+
+# Drivetrain Type values mapped to the Vehicle Index drive qualifiers
+DRIVE_TYPES = {'FWD': '2WD', 'RWD': '2WD', '2WD': '2WD', '4X2': '2WD', 'AWD': '4WD', '4WD': '4WD', '4X4': '4WD'}
+DIESEL_ENGINE_PATTERN = r'(?i)diesel|\bdsl\b|power ?stroke|duramax|cummins'
+
+MARGIN_COLUMNS = [
+    'record_index', 'Stock #', 'VIN', 'rate_class', 'plan', 'term_months', 'miles', 'deductible',
+    'cost', 'retail', 'margin'
+]
+
+
+class PlanMarginCalculator:
+    """
+    Class for pricing the eligible Protect plans of every vehicle in an inventory.
+    """
+    
+    def __init__(self, cost_book: PriceBook, retail_book: PriceBook, vehicle_index: pd.DataFrame):
+        """
+        Initialize the calculator and align the two books.
+        
+        Args:
+            cost_book: Parsed Cost Book
+            retail_book: Parsed Retail book
+            vehicle_index: Rate classes by make and model (see parse_vehicle_index)
+        """
+        self.vehicle_index = vehicle_index
+        self.plans = self.align_books(cost_book, retail_book)
+    
+    @classmethod
+    def from_json(cls, cost_book_path: str = COST_BOOK_PATH,
+                  retail_book_path: str = RETAIL_BOOK_PATH) -> 'PlanMarginCalculator':
+        """
+        Load both price books; the Vehicle Index is read from the Retail book.
+        
+        Args:
+            cost_book_path: Path to the Cost Book JSON export
+            retail_book_path: Path to the Retail book JSON export
+        
+        Returns:
+            PlanMarginCalculator
+        """
+        with open(retail_book_path, 'r', encoding='utf-8') as f:
+            retail_pages = json.load(f)
+        
+        return cls(PriceBook.from_json(cost_book_path), PriceBook.from_json(retail_book_path),
+                   parse_vehicle_index(retail_pages))
+    
+    def align_books(self, cost_book: PriceBook, retail_book: PriceBook) -> pd.DataFrame:
+        """
+        Join the cost and retail rates of the plans offered in both books.
+        
+        Args:
+            cost_book: Parsed Cost Book
+            retail_book: Parsed Retail book
+        
+        Returns:
+            DataFrame with PLAN_KEY_COLUMNS, cost, retail, margin and the plan's join key
+        """
+        cost = cost_book.rates.dropna(subset=['price']).rename(columns={'price': 'cost'})
+        retail = retail_book.rates.dropna(subset=['price']).rename(columns={'price': 'retail'})
+        
+        # Merge keys must not contain None, which never matches in a join
+        cost['rate_class'] = cost['rate_class'].fillna('')
+        retail['rate_class'] = retail['rate_class'].fillna('')
+        
+        plans = cost[PLAN_KEY_COLUMNS + ['cost']].merge(retail[PLAN_KEY_COLUMNS + ['retail']], on=PLAN_KEY_COLUMNS)
+        plans['cost'] = plans['cost'].astype(int)
+        plans['retail'] = plans['retail'].astype(int)
+        plans['margin'] = plans['retail'] - plans['cost']
+        
+        unmatched = len(cost) + len(retail) - 2 * len(plans)
+        if unmatched:
+            logger.info(f"{unmatched} rates are only in one of the books and were left out")
+        
+        # Class-priced plans join on the rate class; the others on the make group they are sold for
+        plans['join_key'] = np.where(
+            plans['rate_class'] != '', plans['rate_class'],
+            np.where(plans['plan'].str.endswith('Lincoln'), 'make:LINCOLN', 'make:OTHER')
+        )
+        
+        return plans
+    
+    def assign_rate_classes(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Look up the Vehicle Index rate class of each vehicle.
+        
+        Models are matched on the full model name, then on its first word, then
+        on the make-wide entries. Drive and fuel qualifiers must agree when both
+        are known; if several entries still match, the most specific one wins
+        and remaining ties take the higher class.
+        
+        Args:
+            df: Processed inventory DataFrame with Make, Model, Drivetrain Type and Engine
+        
+        Returns:
+            Series of rate class letters aligned with df (NaN if not listed)
+        """
+        vehicles = pd.DataFrame({
+            'record_index': df.index,
+            'make': df['Make'].astype(str).str.strip().str.upper().values,
+            'full_model': df['Model'].astype(str).str.split().str.join(' ').str.upper().values,
+            'drive': df.get('Drivetrain Type', pd.Series(index=df.index, dtype=object))
+                       .astype(str).str.strip().str.upper().map(DRIVE_TYPES).values,
+            'fuel': np.where(
+                df.get('Engine', pd.Series('', index=df.index)).astype(str).str.contains(DIESEL_ENGINE_PATTERN),
+                'DSL', 'Gas'
+            )
+        })
+        vehicles['first_word'] = vehicles['full_model'].str.split().str[0]
+        
+        index = self.vehicle_index.rename(columns={'drive': 'index_drive', 'fuel': 'index_fuel'})
+        model_entries = index[index['model'].notna()]
+        make_entries = index[index['model'].isna()].drop(columns='model')
+        
+        candidates = pd.concat([
+            vehicles.merge(model_entries, left_on=['make', 'full_model'], right_on=['make', 'model']).assign(level=0),
+            vehicles.merge(model_entries, left_on=['make', 'first_word'], right_on=['make', 'model']).assign(level=1),
+            vehicles.merge(make_entries, on='make').assign(level=2)
+        ], ignore_index=True)
+        
+        compatible = (
+            (candidates['index_drive'].isna() | candidates['drive'].isna() |
+             (candidates['index_drive'] == candidates['drive'])) &
+            (candidates['index_fuel'].isna() | (candidates['index_fuel'] == candidates['fuel']))
+        )
+        candidates = candidates[compatible].assign(
+            specificity=candidates['index_drive'].notna().astype(int) + candidates['index_fuel'].notna().astype(int)
+        )
+        
+        best = candidates.sort_values(
+            ['record_index', 'level', 'specificity', 'rate_class'], ascending=[True, True, False, False]
+        ).drop_duplicates('record_index')
+        
+        return pd.Series(best['rate_class'].values, index=best['record_index'].values).reindex(df.index)
+    
+    def calculate_margins(self, df: pd.DataFrame, as_of_year: Optional[int] = None) -> pd.DataFrame:
+        """
+        Price the eligible plans of every vehicle in an inventory.
+        
+        A vehicle is eligible for a plan when its make and model are listed in the
+        Vehicle Index, the plan is priced for its rate class (or sold for its make
+        group, for LeaseCARE and RentalCARE), and the plan's coverage, which starts
+        at the warranty start date and zero miles, still extends past the vehicle's
+        age and odometer. Age is approximated from the model year.
+        
+        Args:
+            df: Processed inventory DataFrame (Year, Make, Model, Odometer, ...)
+            as_of_year: Year to measure vehicle age at (default: current year)
+        
+        Returns:
+            DataFrame with MARGIN_COLUMNS, one row per vehicle and eligible plan
+        """
+        if as_of_year is None:
+            as_of_year = pd.Timestamp.now().year
+        
+        rate_classes = self.assign_rate_classes(df)
+        listed = rate_classes.notna()
+        logger.info(f"Assigned rate classes to {int(listed.sum())} of {len(df)} vehicles")
+        
+        vehicles = pd.DataFrame({
+            'record_index': df.index[listed],
+            'rate_class': rate_classes[listed].values,
+            'make_key': np.where(df.loc[listed, 'Make'].astype(str).str.strip().str.upper() == 'LINCOLN',
+                                 'make:LINCOLN', 'make:OTHER'),
+            'age_months': (as_of_year - pd.to_numeric(df.loc[listed, 'Year'], errors='coerce')).clip(lower=0).values * 12,
+            'odometer': pd.to_numeric(df.loc[listed, 'Odometer'], errors='coerce').values
+        })
+        
+        # Each vehicle joins once on its rate class and once on its make group
+        keyed = pd.concat([
+            vehicles.assign(join_key=vehicles['rate_class']),
+            vehicles.assign(join_key=vehicles['make_key'])
+        ], ignore_index=True)
+        
+        margins = keyed.drop(columns='rate_class').merge(self.plans, on='join_key')
+        covered = (margins['term_months'] > margins['age_months']) & (margins['miles'] > margins['odometer'])
+        margins = margins[covered.fillna(False).astype(bool)]
+        
+        margins = margins.merge(
+            pd.DataFrame({'record_index': df.index, 'Stock #': df.get('Stock #'), 'VIN': df.get('VIN')}),
+            on='record_index', how='left'
+        )
+        margins['rate_class'] = margins['rate_class'].replace('', np.nan)
+        
+        return margins.sort_values(['record_index', 'plan', 'term_months', 'miles'])[MARGIN_COLUMNS].reset_index(drop=True)
@@ -0,0 +1,449 @@
+"""
+Price Book Module
+
+This module turns the Ford/Lincoln Protect price book JSON exports (the Cost
+Book and the Retail book) into typed rate and option tables. Each export is a
+list of pages with flat `content` text, so the rate grids are recovered from
+the token order of that text and then indexed in memory for O(1) lookups.
+"""
+
+import pandas as pd
+import re
+import json
+import logging
+import itertools
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger('price_book')
+
+# Default locations of the price book exports (relative to fixed_code)
+COST_BOOK_PATH = "../backups/Mission Ford Cost Book effective 4.2.25.json"
+RETAIL_BOOK_PATH = "../backups/Protect-Retail-MI-json.json"
+
+# Page titles of the plans whose rate grids are extracted
+PLAN_TITLE_PATTERN = re.compile(
+    r'(New Plans|LeaseCARE|RentalCARE)\s*[–-]\s*'
+    r'(PremiumCARE\s+Gas/Hybrid/Diesel|ExtraCARE\s+Gas/Hybrid/Diesel|BaseCARE\s+Gas/Hybrid/Diesel|'
+    r'PowertrainCARE\s+Gas/Hybrid/Diesel|Ford and Competitive-Make|Lincoln)'
+)
+DEDUCTIBLE_PATTERN = re.compile(r'Prices based on \$([\d,]+) [Dd]eductible')
+VALUE_PATTERN = re.compile(r'^(?:\(?[\d,]+\)?\*?|•)$')
+NUMBER_PATTERN = re.compile(r'^[\d,]+$')
+TERM_ROW_PATTERN = re.compile(r'^(\d+)-Month Plan$')
+TERM_YEARS_PATTERN = re.compile(r'(\d+)-Year Plan')
+
+# Vehicle Index section headers ("FORD (cont.) Model New/Used Plans 2010 MY − Present") and entries
+VEHICLE_INDEX_HEADER_PATTERN = re.compile(
+    r'([A-Z][A-Z\-/]+(?: [A-Z][A-Z\-/]+)*)\s+(?:\(cont\.\)\s+)?(?:\(See [^)]*\)\s+)?Model\s+'
+    r'(New/Used Plans 20\d\d MY [−–-] Present|New Plans Used Plans 20\d\d MY [−–-] Present 20\d\d MY & Prior)'
+)
+VEHICLE_ENTRY_PATTERN = re.compile(r'(\S.*?)\s+([A-J])(?=\s|$)')
+VEHICLE_ENTRY_COLUMNS_PATTERN = re.compile(r'(\S.*?)\s+([A-J]|n/a)\s+(?:[A-J]|n/a)\s+(?:[A-J]|n/a)(?=\s|$)')
+
+# Vehicle Index label words that qualify a model rather than name it
+DRIVE_QUALIFIERS = {'2WD': '2WD', '4x2': '2WD', '4WD': '4WD', 'AWD': '4WD', '4x4': '4WD'}
+FUEL_QUALIFIERS = {'Gas': 'Gas', 'DSL': 'DSL', 'Diesel': 'DSL'}
+OTHER_QUALIFIERS = {'Hybrid', 'Plug-In', 'Plug', 'In', 'PHEV', 'Energi'}
+MAKE_LEVEL_WORDS = {'Eligible', 'All', 'Models'}
+
+VEHICLE_INDEX_COLUMNS = ['make', 'model', 'drive', 'fuel', 'rate_class', 'label', 'page']
+
+# Longest row label accepted before a grid is considered finished
+MAX_LABEL_TOKENS = 20
+
+RATE_COLUMNS = ['plan', 'page', 'term_months', 'miles', 'deductible', 'rate_class', 'price']
+OPTION_COLUMNS = ['plan', 'page', 'option', 'term_months', 'miles', 'amount']
+
+
+def parse_price_value(token: str) -> Optional[int]:
+    """
+    Parse a price book cell.
+    
+    Args:
+        token: Cell text such as "1,025", "(15)", "605*" or "•"
+    
+    Returns:
+        Integer amount, negative for parenthesized deltas (or None if not offered)
+    """
+    token = token.rstrip('*')
+    if token == '•':
+        return None
+    if token.startswith('('):
+        return -int(token.strip('()').replace(',', ''))
+    return int(token.replace(',', ''))
+
+
+def parse_price_book_pages(pages: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Extract the rate grids and option deltas from price book pages.
+    
+    Three layouts are recognized on the New Plans, LeaseCARE and RentalCARE pages:
+    rate class grids (columns A-J, one block of mileage rows per year term),
+    term-by-mileage grids ("24-Month Plan" rows under mileage columns) and
+    option rows under mileage columns or term columns ("Key Services Delete").
+    Grids whose extracted text does not follow these layouts are skipped.
+    
+    Args:
+        pages: List of {'page': ..., 'content': ...} dictionaries
+    
+    Returns:
+        Tuple of (rates DataFrame, options DataFrame)
+    """
+    rates = []
+    options = []
+    
+    for page in pages:
+        content = page.get('content', '')
+        title = PLAN_TITLE_PATTERN.search(content)
+        if not title:
+            continue
+        
+        plan = f"{title.group(1)} – {' '.join(title.group(2).split())}"
+        deductible = DEDUCTIBLE_PATTERN.search(content)
+        deductible = int(deductible.group(1).replace(',', '')) if deductible else None
+        tokens = content.split()
+        
+        page_rates = _parse_class_grid(tokens, content) + _parse_term_grids(tokens)
+        for term_months, miles, rate_class, price in page_rates:
+            rates.append((plan, page['page'], term_months, miles, deductible, rate_class, price))
+        
+        for option, term_months, miles, amount in _parse_option_rows(tokens):
+            options.append((plan, page['page'], option, term_months, miles, amount))
+    
+    rates_df = pd.DataFrame(rates, columns=RATE_COLUMNS)
+    options_df = pd.DataFrame(options, columns=OPTION_COLUMNS)
+    
+    # Pages repeat shared option tables; keep the first occurrence of each cell
+    options_df = options_df.drop_duplicates(['plan', 'option', 'term_months', 'miles']).reset_index(drop=True)
+    
+    return rates_df, options_df
+
+
+def parse_vehicle_index(pages: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Extract the rate class of each make and model from the Vehicle Index pages.
+    
+    Each label is split into model names (slash alternatives expanded, e.g.
+    "F-250/350/450" into F-250, F-350 and F-450), a drive qualifier (2WD or 4WD,
+    with AWD/4x4 as 4WD) and a fuel qualifier (Gas or DSL). Make-wide entries
+    such as "Eligible Models" or "4WD/AWD Models" have no model. Where a make
+    lists separate New and Used classes, the New Plans class is kept. The
+    Electric index pages are not included.
+    
+    Args:
+        pages: List of {'page': ..., 'content': ...} dictionaries
+    
+    Returns:
+        DataFrame with VEHICLE_INDEX_COLUMNS, makes and models upper-cased
+    """
+    entries = []
+    
+    for page in pages:
+        content = page.get('content', '')
+        if 'Vehicle Index' not in content or 'Vehicle Index – Electric' in content:
+            continue
+        
+        headers = list(VEHICLE_INDEX_HEADER_PATTERN.finditer(content))
+        for header, next_header in zip(headers, headers[1:] + [None]):
+            body = content[header.end():next_header.start() if next_header else len(content)]
+            pattern = VEHICLE_ENTRY_PATTERN if header.group(2).startswith('New/Used') else VEHICLE_ENTRY_COLUMNS_PATTERN
+            
+            for entry in pattern.finditer(body):
+                label, rate_class = entry.group(1).replace('*', '').strip(), entry.group(2)
+                if rate_class == 'n/a':
+                    continue
+                models, drive, fuel = _split_vehicle_label(label)
+                for make in header.group(1).split('/'):
+                    for model in models:
+                        entries.append((make, model, drive, fuel, rate_class, label, page['page']))
+    
+    return pd.DataFrame(entries, columns=VEHICLE_INDEX_COLUMNS).drop_duplicates(
+        ['make', 'model', 'drive', 'fuel', 'rate_class']
+    ).reset_index(drop=True)
+
+
+def _split_vehicle_label(label: str) -> Tuple[List[Optional[str]], Optional[str], Optional[str]]:
+    """Split a Vehicle Index label into (model names, drive, fuel); make-wide labels have model None."""
+    drive = None
+    fuel = None
+    name_tokens = []
+    
+    for token in label.split():
+        name_parts = []
+        for part in token.split('/'):
+            if part in DRIVE_QUALIFIERS:
+                drive = DRIVE_QUALIFIERS[part]
+            elif part in FUEL_QUALIFIERS:
+                fuel = FUEL_QUALIFIERS[part]
+            elif part not in OTHER_QUALIFIERS:
+                name_parts.append(part)
+        if name_parts:
+            name_tokens.append(_expand_slash_alternatives(name_parts))
+    
+    if not name_tokens or all(token[0] in MAKE_LEVEL_WORDS for token in name_tokens):
+        return [None], drive, fuel
+    
+    models = [' '.join(words).upper() for words in itertools.product(*name_tokens)]
+    return models, drive, fuel
+
+
+def _expand_slash_alternatives(parts: List[str]) -> List[str]:
+    """Expand "F-250/350/450" style alternatives, reusing the first part's prefix for bare numbers."""
+    prefix = re.match(r'^(.*?)\d+$', parts[0])
+    return [
+        prefix.group(1) + part if prefix and index > 0 and part.isdigit() else part
+        for index, part in enumerate(parts)
+    ]
+
+
+def _is_value(token: str) -> bool:
+    """Return True if a token is a price book cell."""
+    return bool(VALUE_PATTERN.match(token))
+
+
+def _is_miles_header(tokens: List[str], i: int) -> bool:
+    """Return True if a "N,NNN Miles" column label starts at position i."""
+    return i + 1 < len(tokens) and bool(NUMBER_PATTERN.match(tokens[i])) and tokens[i + 1] == 'Miles'
+
+
+def _read_values(tokens: List[str], i: int, count: int) -> Optional[List[str]]:
+    """Return exactly count cells starting at position i, or None if the run differs."""
+    values = tokens[i:i + count]
+    if len(values) < count or not all(_is_value(token) for token in values):
+        return None
+    if i + count < len(tokens) and _is_value(tokens[i + count]) and not _is_miles_header(tokens, i + count):
+        return None
+    return values
+
+
+def _iter_labeled_rows(tokens: List[str], start: int, width: int):
+    """Yield (label, cells) rows of a grid whose rows are a text label and width cells."""
+    label = []
+    i = start
+    
+    while i < len(tokens) and len(label) <= MAX_LABEL_TOKENS:
+        values = _read_values(tokens, i, width) if label else None
+        if values is not None:
+            yield ' '.join(label), values
+            label = []
+            i += width
+        elif _is_miles_header(tokens, i):
+            return
+        elif _is_value(tokens[i]) and not (label and NUMBER_PATTERN.match(tokens[i])):
+            # Cells without a label mean the extracted text scrambled the grid
+            return
+        else:
+            label.append(tokens[i])
+            i += 1
+
+
+def _iter_miles_headers(tokens: List[str]):
+    """Yield (start, end, miles columns) for each run of two or more mileage column labels."""
+    i = 0
+    while i < len(tokens):
+        if not _is_miles_header(tokens, i):
+            i += 1
+            continue
+        
+        start = i
+        columns = []
+        while _is_miles_header(tokens, i):
+            columns.append(int(tokens[i].replace(',', '')))
+            i += 2
+        
+        if len(columns) >= 2:
+            yield start, i, columns
+
+
+def _parse_term_grids(tokens: List[str]) -> List[Tuple[int, int, Optional[str], Optional[int]]]:
+    """Parse "N-Month Plan" rows under a mileage header that follows the deductible note."""
+    rates = []
+    
+    for start, end, columns in _iter_miles_headers(tokens):
+        if start == 0 or tokens[start - 1].lower() != 'deductible':
+            continue
+        
+        for label, values in _iter_labeled_rows(tokens, end, len(columns)):
+            term = TERM_ROW_PATTERN.match(label)
+            if not term:
+                break
+            for miles, value in zip(columns, values):
+                rates.append((int(term.group(1)), miles, None, parse_price_value(value)))
+    
+    return rates
+
+
+def _parse_class_grid(tokens: List[str], content: str) -> List[Tuple[int, int, Optional[str], Optional[int]]]:
+    """Parse the A-J rate class grid, assigning its mileage blocks to the page's year terms."""
+    start = next((i for i in range(len(tokens) - 2) if tokens[i:i + 3] == ['A', 'B', 'C']), None)
+    if start is None:
+        return []
+    
+    classes = []
+    i = start
+    while i < len(tokens) and len(tokens[i]) == 1 and tokens[i] == chr(ord('A') + len(classes)):
+        classes.append(tokens[i])
+        i += 1
+    if len(classes) < 2:
+        return []
+    
+    # Each block is [years, rows]; years is None when the page does not label the block
+    blocks = []
+    previous_miles = None
+    while i < len(tokens):
+        labeled_term = TERM_YEARS_PATTERN.fullmatch(' '.join(tokens[i:i + 2]))
+        if labeled_term:
+            blocks.append([int(labeled_term.group(1)), []])
+            previous_miles = None
+            i += 2
+            continue
+        if not _is_miles_header(tokens, i):
+            break
+        values = _read_values(tokens, i + 2, len(classes))
+        if values is None:
+            break
+        miles = int(tokens[i].replace(',', ''))
+        if not blocks or (previous_miles is not None and miles <= previous_miles):
+            blocks.append([None, []])
+        blocks[-1][1].append((miles, values))
+        previous_miles = miles
+        i += 2 + len(classes)
+    
+    if blocks and any(years is None for years, _ in blocks):
+        # The term labels are not always in page order; the blocks are, by ascending term
+        terms = sorted({int(years) for years in TERM_YEARS_PATTERN.findall(content)})
+        if len(blocks) != len(terms):
+            logger.warning(f"Skipping rate class grid with {len(blocks)} blocks for {len(terms)} terms")
+            return []
+        blocks = [[years, rows] for years, (_, rows) in zip(terms, blocks)]
+    
+    rates = []
+    for years, rows in blocks:
+        for miles, values in rows:
+            for rate_class, value in zip(classes, values):
+                rates.append((years * 12, miles, rate_class, parse_price_value(value)))
+    
+    return rates
+
+
+def _parse_option_rows(tokens: List[str]) -> List[Tuple[str, Optional[int], Optional[int], Optional[int]]]:
+    """Parse option deltas by mileage and the Key Services Delete deltas by term."""
+    options = []
+    
+    for start, end, columns in _iter_miles_headers(tokens):
+        if start == 0 or not tokens[start - 1].endswith('Options'):
+            continue
+        for label, values in _iter_labeled_rows(tokens, end, len(columns)):
+            for miles, value in zip(columns, values):
+                options.append((label, None, miles, parse_price_value(value)))
+    
+    for i in range(len(tokens) - 3):
+        if tokens[i:i + 4] != ['Key', 'Services', 'Delete', '(-)']:
+            continue
+        
+        terms = []
+        j = i + 4
+        while j + 1 < len(tokens) and NUMBER_PATTERN.match(tokens[j]) and tokens[j + 1] in ('Months', 'Years'):
+            terms.append(int(tokens[j]) * (12 if tokens[j + 1] == 'Years' else 1))
+            j += 2
+        
+        values = _read_values(tokens, j, len(terms)) if terms else None
+        if values is not None:
+            for term_months, value in zip(terms, values):
+                options.append(('Key Services Delete (-)', term_months, None, parse_price_value(value)))
+    
+    return options
+
+
+def _index_keys(df: pd.DataFrame, columns: List[str]):
+    """Return lookup keys for the rows of a table, with missing cells as None."""
+    # Mixed int/None columns are stored as float; NaN never compares equal in a dict key
+    keys = df[columns].astype(object)
+    return keys.where(keys.notna(), None).itertuples(index=False, name=None)
+
+
+class PriceBook:
+    """
+    In-memory index over the rate and option tables of one price book.
+    """
+    
+    def __init__(self, rates: pd.DataFrame, options: pd.DataFrame):
+        """
+        Initialize the price book and build its lookup indexes.
+        
+        Args:
+            rates: Rate table with RATE_COLUMNS
+            options: Option table with OPTION_COLUMNS
+        """
+        self.rates = rates
+        self.options = options
+        
+        offered = rates[rates['price'].notna()]
+        self.rate_index = dict(zip(
+            _index_keys(offered, ['plan', 'term_months', 'miles', 'deductible', 'rate_class']),
+            offered['price'].astype(int)
+        ))
+        self.option_index = dict(zip(
+            _index_keys(options, ['plan', 'option', 'term_months', 'miles']),
+            [None if pd.isna(amount) else int(amount) for amount in options['amount']]
+        ))
+        self.base_deductibles = rates.groupby('plan', dropna=False)['deductible'].first().to_dict()
+    
+    @classmethod
+    def from_json(cls, file_path: str) -> 'PriceBook':
+        """
+        Load and parse a price book JSON export.
+        
+        Args:
+            file_path: Path to the JSON export (a list of pages)
+        
+        Returns:
+            Parsed PriceBook
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            pages = json.load(f)
+        
+        rates, options = parse_price_book_pages(pages)
+        logger.info(f"Parsed {len(rates)} rates and {len(options)} option deltas from {file_path}")
+        
+        return cls(rates, options)
+    
+    @property
+    def plans(self) -> List[str]:
+        """Return the plans that have rates in this book."""
+        return sorted(self.rates['plan'].unique())
+    
+    def lookup(self, plan: str, term_months: int, miles: int,
+               deductible: Optional[int] = None, rate_class: Optional[str] = None) -> Optional[int]:
+        """
+        Look up the price of a plan.
+        
+        Args:
+            plan: Plan name, e.g. "LeaseCARE – Ford and Competitive-Make"
+            term_months: Plan term in months
+            miles: Plan mileage
+            deductible: Deductible (defaults to the deductible the plan is priced at)
+            rate_class: Rate class letter for plans priced by class (A-J)
+        
+        Returns:
+            Price (or None if the combination is not offered)
+        """
+        if deductible is None:
+            deductible = self.base_deductibles.get(plan)
+        return self.rate_index.get((plan, term_months, miles, deductible, rate_class))
+    
+    def option_delta(self, plan: str, option: str, miles: Optional[int] = None,
+                     term_months: Optional[int] = None) -> Optional[int]:
+        """
+        Look up the price delta of a plan option.
+        
+        Args:
+            plan: Plan name
+            option: Option label as printed, e.g. "First-Day Rental Delete (-)"
+            miles: Plan mileage for options priced by mileage
+            term_months: Plan term for options priced by term
+        
+        Returns:
+            Signed delta to add to the plan price (or None if not offered)
+        """
+        return self.option_index.get((plan, option, term_months, miles))
@@ -0,0 +1,236 @@
+"""
+Processed Writer Module
+
+This module writes the processed inventory in one of several formats, either
+from one DataFrame or chunk by chunk as a file is streamed. Every format
+keeps a bounded amount of data in memory while writing:
+- 'xlsx': the workbook built by DataFrame.to_excel (the whole frame at once)
+- 'xlsx_stream': an openpyxl write-only workbook; rows are written to disk
+  as they are appended, so memory stays constant however many chunks arrive
+- 'csv': DataFrame.to_csv in blocks of CSV_CHUNK_ROWS rows
+- 'parquet' and 'arrow': columnar files (Arrow IPC file format) written one
+  record batch per chunk; these require pyarrow and raise ImportError without it
+
+Compact dtypes (see DataValidator.compact_dtypes) are chosen per chunk, so the
+columnar writers widen them back before fixing the file's schema.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Any, Optional
+
+# File extension of the processed inventory for each format
+PROCESSED_FORMATS = {
+    'xlsx': '.xlsx',
+    'xlsx_stream': '.xlsx',
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow'
+}
+
+# Format used for an output path when none is given
+EXTENSION_FORMATS = {
+    '.xlsx': 'xlsx',
+    '.xls': 'xlsx',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow'
+}
+
+# Rows formatted at a time by the CSV writer
+CSV_CHUNK_ROWS = 10000
+
+# Sheet name of streamed workbooks (the DataFrame.to_excel default)
+SHEET_NAME = 'Sheet1'
+
+
+def processed_file_name(output_format: str) -> str:
+    """
+    Name of the processed inventory file for a format.
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if output_format not in PROCESSED_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return 'processed_inventory' + PROCESSED_FORMATS[output_format]
+
+
+class ProcessedWriter:
+    """
+    Writer for the processed inventory, one DataFrame chunk at a time.
+    
+    The file is created on the first write and complete after close(); use
+    the writer as a context manager to close it. All chunks must have the
+    columns of the first one.
+    """
+    
+    def __init__(self, output_path: str, output_format: Optional[str] = None, append: bool = False):
+        """
+        Initialize the writer.
+        
+        Args:
+            output_path: Path of the processed file
+            output_format: One of PROCESSED_FORMATS (taken from the extension if not given)
+            append: Append rows to an existing CSV file without repeating the header
+        
+        Raises:
+            ValueError: If the format is unknown, or append is set for a format other than CSV
+        """
+        if output_format is None:
+            ext = os.path.splitext(output_path)[1]
+            if ext.lower() not in EXTENSION_FORMATS:
+                raise ValueError(f"Unsupported output format: {ext}")
+            output_format = EXTENSION_FORMATS[ext.lower()]
+        if output_format not in PROCESSED_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if append and output_format != 'csv':
+            raise ValueError(f"Appending is only supported for CSV output, not {output_format}")
+        
+        self.output_path = output_path
+        self.output_format = output_format
+        self.append = append
+        self.rows_written = 0
+        self._file = None
+        self._workbook = None
+        self._sheet = None
+        self._writer = None
+        self._schema = None
+        self._started = False
+    
+    def __enter__(self) -> 'ProcessedWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+    
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Write one chunk of the processed inventory.
+        
+        Raises:
+            ValueError: If a second chunk is written in 'xlsx' format
+            ImportError: If pyarrow is not available for 'parquet' or 'arrow'
+        """
+        if not self._started:
+            directory = os.path.dirname(self.output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        
+        if self.output_format == 'xlsx':
+            if self._started:
+                raise ValueError("The 'xlsx' format is written in one piece; use 'xlsx_stream' for chunks")
+            df.to_excel(self.output_path, index=False)
+        elif self.output_format == 'xlsx_stream':
+            self._write_xlsx_rows(df)
+        elif self.output_format == 'csv':
+            if self._file is None:
+                self._file = open(self.output_path, 'a' if self.append else 'w', newline='', encoding='utf-8')
+            header = not self._started and not self.append
+            df.to_csv(self._file, index=False, header=header, chunksize=CSV_CHUNK_ROWS)
+        else:
+            self._write_arrow_batch(df)
+        
+        self._started = True
+        self.rows_written += len(df)
+    
+    def close(self) -> None:
+        """Finish the file. An empty file in the chosen format is written if no chunk arrived."""
+        if not self._started and self.output_format != 'csv':
+            self.write(pd.DataFrame())
+        if self._workbook is not None:
+            self._workbook.save(self.output_path)
+        self.abort()
+    
+    def abort(self) -> None:
+        """Close open files without finishing the output."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._workbook = None
+        self._sheet = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
+    def _write_xlsx_rows(self, df: pd.DataFrame) -> None:
+        """Append the rows of a chunk to the write-only workbook."""
+        if self._workbook is None:
+            from openpyxl import Workbook
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet(SHEET_NAME)
+            self._sheet.append([str(column) for column in df.columns])
+        
+        # Missing values become empty cells, as with DataFrame.to_excel
+        values = df.astype(object)
+        values = values.where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            self._sheet.append(row)
+    
+    def _write_arrow_batch(self, df: pd.DataFrame) -> None:
+        """Write a chunk as one record batch of a Parquet or Arrow IPC file."""
+        pa = _pyarrow(self.output_format)
+        df = _widen_compact_dtypes(df)
+        if self._writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schema = table.schema
+            if self.output_format == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.output_path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.output_path, self._schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+
+def write_processed(df: pd.DataFrame, output_path: str, output_format: Optional[str] = None) -> None:
+    """Write a whole processed inventory in one of PROCESSED_FORMATS."""
+    with ProcessedWriter(output_path, output_format) as writer:
+        writer.write(df)
+
+
+def _widen_compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Undo DataValidator.compact_dtypes so every chunk maps to the same Arrow schema.
+    
+    One chunk may store Price as float32 and the next as float64, or a text
+    column as a categorical in one chunk only; the schema of the first chunk
+    would then truncate or reject later ones. Categoricals and strings become
+    object columns, and narrow integers and floats their 64-bit dtype.
+    """
+    widened = None
+    for position in range(df.shape[1]):
+        values = df.iloc[:, position]
+        dtype = values.dtype
+        
+        if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            wide = values.astype(object)
+        elif pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8:
+            nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+            wide = values.astype('Int64' if nullable else np.int64)
+        elif pd.api.types.is_float_dtype(dtype) and dtype != np.float64:
+            wide = values.astype(np.float64)
+        else:
+            continue
+        
+        if widened is None:
+            widened = df.copy(deep=False)
+        # Assign by position so duplicate column names are handled
+        widened.isetitem(position, wide)
+    
+    return df if widened is None else widened
+
+
+def _pyarrow(output_format: str) -> Any:
+    """Import pyarrow for a columnar format, with an error naming the format if it is unavailable."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f"The '{output_format}' output format requires pyarrow: {e}") from e
+    return pyarrow
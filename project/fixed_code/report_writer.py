@@ -0,0 +1,179 @@
+"""
+Report Writer Module
+
+This module writes the Markdown validation report section by section to an
+open file, so the report never has to be held in memory as one string. The
+writer can either list every affected row, as the in-memory report always
+did, or compress the rows into ranges and cap each issue at a number of
+ranges. The capped report stays small for any feed size, and the complete row
+sets go into a compact sidecar file next to it.
+"""
+
+import os
+import numpy as np
+from typing import Dict, List, Any, Optional, TextIO
+from vin_decoder import VIN_CHECKS
+from duplicate_index import DUPLICATE_CHECKS
+
+# Default number of row ranges listed per issue in a capped report
+DEFAULT_MAX_ROW_RANGES = 50
+
+
+def row_ranges(rows: List[Any]) -> np.ndarray:
+    """
+    Compress row numbers into ranges of consecutive rows.
+    
+    Args:
+        rows: Row numbers in any order (duplicates are ignored)
+    
+    Returns:
+        Array of shape (n, 2) with the first and last row of each range
+    """
+    rows = np.unique(np.asarray(rows, dtype=np.int64))
+    if len(rows) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    
+    # A range ends wherever the next row is not the following number
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    starts = rows[np.concatenate(([0], breaks))]
+    ends = rows[np.concatenate((breaks - 1, [len(rows) - 1]))]
+    return np.column_stack((starts, ends))
+
+
+def format_row_ranges(rows: List[Any], max_ranges: int, sidecar_name: Optional[str] = None) -> str:
+    """
+    Format row numbers as a capped list of ranges, e.g. "0-4, 7, 9-12".
+    
+    Args:
+        rows: Row numbers
+        max_ranges: Maximum number of ranges to list
+        sidecar_name: File that holds the complete rows, named when ranges are left out
+    
+    Returns:
+        Comma-separated ranges, followed by the number of ranges left out
+    """
+    ranges = row_ranges(rows)
+    text = ', '.join(
+        str(start) if start == end else f"{start}-{end}" for start, end in ranges[:max_ranges].tolist()
+    )
+    
+    omitted = len(ranges) - max_ranges
+    if omitted > 0:
+        text += f", ... {omitted} more ranges"
+        if sidecar_name:
+            text += f" in {sidecar_name}"
+    return text
+
+
+def write_validation_report(out: TextIO, validation_results: Dict[str, List[Any]], total_records: int,
+                            max_ranges: Optional[int] = None, sidecar_name: Optional[str] = None) -> None:
+    """
+    Write the validation report to an open text file.
+    
+    Args:
+        out: File (or other text stream) to write to
+        validation_results: Dictionary with validation issues
+        total_records: Number of records validated
+        max_ranges: Compress rows into ranges and list at most this many per
+            issue. If None, every row is listed as in the original report
+        sidecar_name: Name of the sidecar file holding the complete rows (optional)
+    """
+    def rows_text(rows):
+        if max_ranges is None:
+            return f"{rows}"
+        return format_row_ranges(rows, max_ranges, sidecar_name)
+    
+    out.write("# Inventory Data Validation Report\n\n")
+    
+    # Add summary
+    total_issues = sum(len(issues) for issues in validation_results.values())
+    out.write(f"## Summary\n")
+    out.write(f"- Total records: {total_records}\n")
+    out.write(f"- Total issues found: {total_issues}\n\n")
+    
+    # Add details for each issue type
+    if validation_results['missing_values']:
+        out.write("## Missing Values\n")
+        for issue in validation_results['missing_values']:
+            out.write(f"- Field '{issue['field']}' has {issue['count']} missing values (rows: {rows_text(issue['rows'])})\n")
+        out.write("\n")
+    
+    if validation_results['data_type_issues']:
+        out.write("## Data Type Issues\n")
+        for issue in validation_results['data_type_issues']:
+            out.write(f"- Field '{issue['field']}' has values that cannot be converted to {issue['expected_type']} (rows: {rows_text(issue['rows'])})\n")
+        out.write("\n")
+    
+    if validation_results['price_below_cost']:
+        out.write("## Price Below Cost\n")
+        out.write(f"- {len(validation_results['price_below_cost'])} records have Price less than Unit Cost (rows: {rows_text(validation_results['price_below_cost'])})\n\n")
+    
+    if validation_results['column_name_issues']:
+        out.write("## Column Name Issues\n")
+        out.write(f"- {len(validation_results['column_name_issues'])} columns have newline characters: {validation_results['column_name_issues']}\n\n")
+    
+    if validation_results['special_character_issues']:
+        out.write("## Special Character Issues\n")
+        for issue in validation_results['special_character_issues']:
+            out.write(f"- Field '{issue['field']}' has special characters in {len(issue['rows'])} rows (rows: {rows_text(issue['rows'])})\n")
+        out.write("\n")
+    
+    if validation_results.get('vin_issues'):
+        out.write("## VIN Issues\n")
+        for issue in validation_results['vin_issues']:
+            out.write(f"- Field '{issue['field']}' {VIN_CHECKS[issue['check']][1]} in {len(issue['rows'])} rows (rows: {rows_text(issue['rows'])})\n")
+        out.write("\n")
+    
+    if validation_results.get('duplicate_issues'):
+        out.write("## Duplicate Issues\n")
+        for issue in validation_results['duplicate_issues']:
+            out.write(f"- Field '{issue['field']}' {DUPLICATE_CHECKS[issue['check']][0]} in {len(issue['rows'])} rows (rows: {rows_text(issue['rows'])})\n")
+            if 'conflict_files' in issue:
+                # The row pointers are in the results; the report names the files
+                out.write(f"  - Listed by: {', '.join(sorted(set(issue['conflict_files'])))}\n")
+        out.write("\n")
+
+
+def write_row_sidecar(path: str, validation_results: Dict[str, List[Any]]) -> None:
+    """
+    Save the complete row sets of the validation issues as a compressed .npz file.
+    
+    Each array is named '<issue type>', '<issue type>/<field>' or, for issues
+    with several checks, '<issue type>/<field>/<check>' and holds the sorted
+    row numbers of that issue.
+    
+    Args:
+        path: Path of the sidecar file
+        validation_results: Dictionary with validation issues
+    """
+    arrays = {}
+    for issue_type, issues in validation_results.items():
+        if issue_type == 'column_name_issues' or not issues:
+            continue
+        if issue_type == 'price_below_cost':
+            arrays[issue_type] = np.sort(np.asarray(issues, dtype=np.int64))
+        else:
+            for issue in issues:
+                name = f"{issue_type}/{issue['field']}/{issue['check']}" if 'check' in issue else f"{issue_type}/{issue['field']}"
+                arrays[name] = np.sort(np.asarray(issue['rows'], dtype=np.int64))
+    
+    np.savez_compressed(path, **arrays)
+
+
+def load_row_sidecar(path: str) -> Dict[str, np.ndarray]:
+    """
+    Load the row sets saved by write_row_sidecar.
+    
+    Args:
+        path: Path of the sidecar file
+    
+    Returns:
+        Dictionary of array name to row numbers
+    """
+    with np.load(path) as sidecar:
+        return {name: sidecar[name] for name in sidecar.files}
+
+
+def sidecar_path_for(report_path: str) -> str:
+    """Return the path of the row sidecar belonging to a report."""
+    return f"{os.path.splitext(report_path)[0]}_rows.npz"
@@ -0,0 +1,252 @@
+"""
+Results Writer Module
+
+This module writes process results to disk without going through the
+pure-Python json encoder, which calls a hook for every NumPy scalar and
+renders the row lists of validation issues one element at a time. Integer
+row arrays are rendered with a single join, everything else is encoded
+with the json module, and the text is written piece by piece so large
+results are streamed to the file.
+
+Two formats are supported:
+- 'json': the same text json.dump(results, indent=2) produces
+- 'ndjson': one compact JSON object per line; a header line with the results
+  and one line per validation issue entry with its rows
+"""
+
+import json
+import numpy as np
+from typing import Dict, Any, Iterator, Optional, TextIO
+from issue_store import RowSet, ROW_ISSUE_TYPES, ROW_ALIGNED_KEYS
+
+# File name of the process results for each format
+RESULTS_FILE_NAMES = {
+    'json': 'upload_results.json',
+    'ndjson': 'upload_results.ndjson'
+}
+
+
+def to_plain(obj: Any) -> Any:
+    """
+    Convert NumPy values to their Python equivalents.
+    
+    Args:
+        obj: Value to convert
+    
+    Returns:
+        Python scalar or list for NumPy scalars, arrays and RowSets;
+        other values unchanged
+    """
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, (np.ndarray, RowSet)):
+        return obj.tolist()
+    return obj
+
+
+def iter_json(obj: Any, indent: int = 2, level: int = 0) -> Iterator[str]:
+    """
+    Encode a value as indented JSON, piece by piece.
+    
+    Args:
+        obj: Value to encode
+        indent: Spaces per nesting level
+        level: Nesting level of obj
+    
+    Yields:
+        Pieces of the JSON text, identical to json.dumps(obj, indent=indent) when joined
+    """
+    rows = _integer_rows(obj)
+    if rows is not None:
+        # Integer rows: one number per line, as the json module lays out lists
+        if len(rows) == 0:
+            yield '[]'
+            return
+        inner = '\n' + ' ' * (indent * (level + 1))
+        yield '[' + inner + join_integers(rows, ',' + inner) + '\n' + ' ' * (indent * level) + ']'
+        return
+    
+    obj = to_plain(obj)
+    if isinstance(obj, dict):
+        if not obj:
+            yield '{}'
+            return
+        inner = '\n' + ' ' * (indent * (level + 1))
+        yield '{'
+        for position, (key, value) in enumerate(obj.items()):
+            yield (',' if position else '') + inner + json.dumps(_json_key(key)) + ': '
+            yield from iter_json(value, indent, level + 1)
+        yield '\n' + ' ' * (indent * level) + '}'
+    elif isinstance(obj, (list, tuple)):
+        if not obj:
+            yield '[]'
+            return
+        inner = '\n' + ' ' * (indent * (level + 1))
+        yield '['
+        for position, value in enumerate(obj):
+            yield (',' if position else '') + inner
+            yield from iter_json(value, indent, level + 1)
+        yield '\n' + ' ' * (indent * level) + ']'
+    else:
+        yield json.dumps(obj, default=_unsupported)
+
+
+def write_json(results: Dict[str, Any], f: TextIO) -> None:
+    """Write results as indented JSON (same text as json.dump with indent=2)."""
+    for piece in iter_json(results):
+        f.write(piece)
+
+
+def write_ndjson(results: Dict[str, Any], f: TextIO) -> None:
+    """
+    Write results as newline-delimited JSON.
+    
+    The first line holds the results with the validation issue rows left out
+    ({'record': 'results', ...}). Each following line is one validation issue
+    entry with its rows ({'record': 'issue', 'issue_type': ..., 'rows': [...]}).
+    
+    Args:
+        results: Process results
+        f: Text file to write to
+    """
+    header = {'record': 'results'}
+    issue_records = []
+    for key, value in results.items():
+        if key != 'validation_issues':
+            header[key] = value
+            continue
+        
+        summary = {}
+        for issue_type, issues in value.items():
+            if issue_type in ROW_ISSUE_TYPES:
+                summary[issue_type] = [{k: v for k, v in issue.items() if k not in ROW_ALIGNED_KEYS} for issue in issues]
+                issue_records.extend({'record': 'issue', 'issue_type': issue_type, **issue} for issue in issues)
+            elif issue_type == 'price_below_cost':
+                summary[issue_type] = len(issues)
+                if len(issues):
+                    issue_records.append({'record': 'issue', 'issue_type': issue_type, 'rows': issues})
+            else:
+                summary[issue_type] = issues
+        header[key] = summary
+    
+    for record in [header] + issue_records:
+        f.write(_compact_json(record))
+        f.write('\n')
+
+
+def write_results(results: Dict[str, Any], f: TextIO, results_format: str = 'json') -> None:
+    """
+    Write results in one of RESULTS_FILE_NAMES' formats.
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if results_format == 'json':
+        write_json(results, f)
+    elif results_format == 'ndjson':
+        write_ndjson(results, f)
+    else:
+        raise ValueError(f"Unsupported results format: {results_format}")
+
+
+def join_integers(values: np.ndarray, separator: str) -> str:
+    """
+    Render integers as decimal text joined by a separator, like separator.join(map(str, values)).
+    
+    The digits of all values are computed at once as a byte matrix, so the
+    cost per value is a few array operations instead of a Python str() call.
+    
+    Args:
+        values: 1-D integer array
+        separator: ASCII text placed between values
+    
+    Returns:
+        Joined text
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) == 0:
+        return ''
+    
+    negative = values < 0
+    magnitude = np.abs(values)
+    width = len(str(int(magnitude.max())))
+    # Row numbers usually fit 32 bits, where division is cheaper
+    if width < 10:
+        magnitude = magnitude.astype(np.uint32)
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=magnitude.dtype)
+    
+    # One row per value: optional sign, fixed-width digits, separator
+    digits = ((magnitude[:, None] // powers) % 10).astype(np.uint8) + np.uint8(ord('0'))
+    separator_bytes = np.frombuffer(separator.encode('ascii'), dtype=np.uint8)
+    text = np.concatenate([
+        np.full((len(values), 1), ord('-'), dtype=np.uint8),
+        digits,
+        np.broadcast_to(separator_bytes, (len(values), len(separator_bytes)))
+    ], axis=1)
+    
+    # Drop absent signs and leading zeros (the last digit is always kept)
+    keep = np.concatenate([
+        negative[:, None],
+        (magnitude[:, None] >= powers) | (powers == 1),
+        np.ones((len(values), len(separator_bytes)), dtype=bool)
+    ], axis=1)
+    
+    joined = text[keep].tobytes().decode('ascii')
+    return joined[:len(joined) - len(separator)]
+
+
+def _compact_json(obj: Any) -> str:
+    """Encode a value as single-line JSON, joining integer rows in one pass."""
+    rows = _integer_rows(obj)
+    if rows is not None:
+        return '[' + join_integers(rows, ',') + ']'
+    
+    obj = to_plain(obj)
+    if isinstance(obj, dict):
+        return '{' + ','.join(
+            json.dumps(_json_key(key)) + ':' + _compact_json(value) for key, value in obj.items()
+        ) + '}'
+    elif isinstance(obj, (list, tuple)):
+        return '[' + ','.join(_compact_json(value) for value in obj) + ']'
+    return json.dumps(obj, default=_unsupported)
+
+
+def _integer_rows(obj: Any) -> Optional[np.ndarray]:
+    """Return the values of a 1-D integer array or RowSet of integers, else None."""
+    values = obj.values if isinstance(obj, RowSet) else obj
+    if not isinstance(values, np.ndarray) or values.ndim != 1:
+        return None
+    # uint64 may not fit the int64 digits computation
+    if values.dtype.kind == 'i' or (values.dtype.kind == 'u' and values.dtype.itemsize < 8):
+        return values
+    return None
+
+
+def _json_key(key: Any) -> str:
+    """Convert a dictionary key the way the json module does."""
+    if isinstance(key, str):
+        return key
+    key = to_plain(key)
+    if key is True:
+        return 'true'
+    elif key is False:
+        return 'false'
+    elif key is None:
+        return 'null'
+    elif isinstance(key, float):
+        return json.dumps(key)
+    elif isinstance(key, int):
+        return str(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def _unsupported(obj: Any) -> Any:
+    """Fallback for json.dumps: convert NumPy values or fail like the json module."""
+    plain = to_plain(obj)
+    if plain is obj:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return plain
@@ -0,0 +1,203 @@
+"""
+Row State Module
+
+This module provides a persistent, VIN-keyed store of per-row processing state.
+Dealers re-export their full inventory several times a day while only a few
+vehicles change, so each row's content hash is kept together with its
+converted values and validation flags. The next export can then be split into
+new, changed, unchanged and removed vehicles, and only new and changed rows
+need to be validated and converted again.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger('row_state')
+
+# Bump when the stored layout changes so stale states are ignored
+STATE_FORMAT_VERSION = 1
+
+# Status of each row of an export compared with the stored state
+ROW_STATUSES = ['new', 'changed', 'unchanged']
+
+
+def row_hashes(df: pd.DataFrame, skip_columns: Tuple[str, ...] = ()) -> np.ndarray:
+    """
+    Hash the content of every row.
+    
+    Args:
+        df: DataFrame as read from the inventory file
+        skip_columns: Columns left out of the hash, such as the key column
+    
+    Returns:
+        Array with one uint64 hash per row (the index is not hashed)
+    """
+    combined = np.full(len(df), 0x345678, dtype=np.uint64)
+    for position, col in enumerate(df.columns):
+        if col in skip_columns:
+            continue
+        # Column hashes are combined in column order, wrapping around on overflow
+        column_hash = pd.util.hash_pandas_object(df.iloc[:, position], index=False).to_numpy()
+        combined = (combined ^ column_hash) * np.uint64(1000003)
+    
+    return combined
+
+
+def schema_fingerprint(df: pd.DataFrame) -> List[Tuple[str, str]]:
+    """
+    Describe the columns and dtypes of a frame.
+    
+    Validation and conversion results depend on the column dtypes as well as on
+    the values, so cached rows are only reused when the fingerprint matches.
+    
+    Args:
+        df: DataFrame as read from the inventory file
+    
+    Returns:
+        List of (column name, dtype) pairs
+    """
+    return [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+
+
+class RowStateStore:
+    """
+    On-disk store of the last processed state of each inventory feed.
+    
+    A state holds, indexed by VIN, the content hash, converted values and
+    validation flags of every row whose VIN is present and unique in the
+    export. States are written atomically as pickles so object columns round-trip
+    unchanged.
+    """
+    
+    def __init__(self, state_dir: str):
+        """
+        Initialize the store.
+        
+        Args:
+            state_dir: Directory that holds one state file per feed
+        """
+        self.state_dir = state_dir
+        os.makedirs(state_dir, exist_ok=True)
+    
+    def state_key(self, file_path: str, feed_key: Optional[str] = None) -> str:
+        """
+        Build the state key of a feed.
+        
+        Dealer exports are often named after their export time, so each export
+        of a feed can have a new path. An explicit feed key (such as a rooftop
+        id) identifies the feed across those names; without one, the absolute
+        path does.
+        
+        Args:
+            file_path: Path to the inventory file
+            feed_key: Caller-supplied id of the feed (optional)
+        
+        Returns:
+            Hex digest identifying the feed
+        """
+        feed = f"feed:{feed_key}" if feed_key else os.path.abspath(file_path)
+        return hashlib.blake2b(feed.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def load(self, key: str, schema: List[Tuple[str, str]]) -> Optional[Dict[str, Any]]:
+        """
+        Load the stored state of a feed.
+        
+        Args:
+            key: State key returned by state_key
+            schema: Fingerprint of the current export (see schema_fingerprint)
+        
+        Returns:
+            Dictionary with 'hashes' (Series), 'values' and 'flags' (DataFrames),
+            all indexed by VIN; None if there is no usable state
+        """
+        path = self._state_path(key)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            state = pd.read_pickle(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable row state {key}: {str(e)}")
+            return None
+        
+        if state.get('format_version') != STATE_FORMAT_VERSION or state.get('schema') != schema:
+            logger.info(f"Row state {key} was saved for a different layout; processing all rows")
+            return None
+        
+        return state
+    
+    def save(self, key: str, schema: List[Tuple[str, str]], hashes: pd.Series,
+             values: pd.DataFrame, flags: pd.DataFrame) -> None:
+        """
+        Store the state of a feed, replacing the previous one.
+        
+        Args:
+            key: State key returned by state_key
+            schema: Fingerprint of the export the state belongs to
+            hashes: Row content hashes indexed by VIN
+            values: Converted rows indexed by VIN
+            flags: Validation flags indexed by VIN, one column per (issue type, field)
+        """
+        state = {
+            'format_version': STATE_FORMAT_VERSION,
+            'schema': schema,
+            'hashes': hashes,
+            'values': values,
+            'flags': flags
+        }
+        
+        path = self._state_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            pd.to_pickle(state, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write row state {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _state_path(self, key: str) -> str:
+        """Return the path of a state file."""
+        return os.path.join(self.state_dir, f"{key}.pkl")
+
+
+def classify_rows(vins: pd.Series, hashes: np.ndarray,
+                  state: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+    """
+    Compare an export with the stored state of its feed.
+    
+    Rows without a VIN, or whose VIN appears more than once in the export,
+    cannot be matched and are always treated as new.
+    
+    Args:
+        vins: VIN column of the export
+        hashes: Row content hashes (see row_hashes)
+        state: Stored state (see RowStateStore.load), or None
+    
+    Returns:
+        Tuple containing:
+            - Array with the index into ROW_STATUSES of every row
+            - Mask of the rows whose VIN can be stored in the state
+            - VINs in the state that are no longer in the export
+    """
+    keyed = (vins.notna() & ~vins.duplicated(keep=False)).to_numpy()
+    status = np.zeros(len(vins), dtype=np.int8)
+    
+    if state is None:
+        return status, keyed, pd.Index([])
+    
+    keyed_vins = pd.Index(vins[keyed].to_numpy())
+    positions = state['hashes'].index.get_indexer(keyed_vins)
+    known = positions >= 0
+    
+    keyed_status = np.where(known, ROW_STATUSES.index('changed'), ROW_STATUSES.index('new')).astype(np.int8)
+    same = state['hashes'].to_numpy()[positions[known]] == hashes[keyed][known]
+    keyed_status[np.flatnonzero(known)[same]] = ROW_STATUSES.index('unchanged')
+    status[keyed] = keyed_status
+    
+    removed = state['hashes'].index.difference(keyed_vins)
+    return status, keyed, removed
@@ -0,0 +1,216 @@
+"""
+Stage Metrics Module
+
+This module records per-stage instrumentation for the processing and upload
+pipelines: wall time, CPU time, rows per second and peak memory delta. Metrics
+are kept in a plain dictionary keyed by stage name so they can be stored in
+the results dictionary, saved as JSON and shown in the summary report.
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+
+def current_rss_mb() -> float:
+    """Return the resident set size of this process in MB."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        # No procfs: fall back to the peak RSS
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class MemorySampler:
+    """
+    Background thread that records the highest RSS seen while a stage runs.
+    
+    The process's own peak RSS only ever grows, so once a long-running
+    process has warmed up it no longer shows the peak of a single stage;
+    sampling the current RSS does.
+    """
+    
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def __enter__(self):
+        self.peak_mb = current_rss_mb()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+class _SharedSampler:
+    """
+    One sampling thread shared by every track_stage call in the process.
+    
+    Each stage opens a window that records the highest RSS sampled while it
+    is open. The thread keeps running between the stages and chunks of a run
+    and exits once no window has been open for idle_timeout seconds.
+    """
+    
+    def __init__(self, interval: float = 0.005, idle_timeout: float = 1.0):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._windows = []
+        self._thread = None
+    
+    def open(self) -> Dict[str, float]:
+        """Start a window and return it; its 'peak_mb' is updated by the thread."""
+        window = {'peak_mb': current_rss_mb()}
+        with self._lock:
+            self._windows.append(window)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stage-memory-sampler', daemon=True)
+                self._thread.start()
+        return window
+    
+    def close(self, window: Dict[str, float]) -> float:
+        """End a window and return the highest RSS seen while it was open."""
+        with self._lock:
+            self._windows.remove(window)
+        return max(window['peak_mb'], current_rss_mb())
+    
+    def _run(self):
+        idle_since = None
+        while True:
+            time.sleep(self.interval)
+            rss = current_rss_mb()
+            with self._lock:
+                for window in self._windows:
+                    window['peak_mb'] = max(window['peak_mb'], rss)
+                if self._windows:
+                    idle_since = None
+                elif idle_since is None:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since > self.idle_timeout:
+                    self._thread = None
+                    return
+
+
+_stage_sampler = _SharedSampler()
+
+
+@contextmanager
+def track_stage(metrics: Dict[str, Dict[str, Any]], name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Measure one pipeline stage and add it to metrics.
+    
+    The yielded dictionary can be used to set 'rows' once the row count is
+    known (for example after reading a file). A stage that runs more than once,
+    such as once per chunk in streaming mode, accumulates its times and rows
+    and keeps the highest peak memory delta of its runs.
+    
+    The peak memory delta is the highest RSS sampled while the stage runs
+    minus the RSS at its start, so it is measured per stage even after an
+    earlier stage or request set a higher peak. All stages share one
+    sampling thread (see _SharedSampler).
+    
+    Args:
+        metrics: Dictionary of stage metrics to update
+        name: Stage name
+        rows: Number of rows the stage handles (optional)
+    
+    Yields:
+        Dictionary with the 'rows' of this run of the stage
+    """
+    run = {'rows': rows}
+    window = _stage_sampler.open()
+    rss_before = window['peak_mb']
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    
+    try:
+        yield run
+    finally:
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        peak_delta = max(_stage_sampler.close(window) - rss_before, 0.0)
+        
+        stage = metrics.setdefault(name, {
+            'wall_seconds': 0.0,
+            'cpu_seconds': 0.0,
+            'rows': 0,
+            'rows_per_second': None,
+            'peak_memory_delta_mb': 0.0,
+            'runs': 0
+        })
+        stage['wall_seconds'] = round(stage['wall_seconds'] + wall, 6)
+        stage['cpu_seconds'] = round(stage['cpu_seconds'] + cpu, 6)
+        stage['rows'] += int(run['rows'] or 0)
+        stage['rows_per_second'] = round(stage['rows'] / stage['wall_seconds'], 1) if stage['wall_seconds'] > 0 else None
+        stage['peak_memory_delta_mb'] = round(max(stage['peak_memory_delta_mb'], peak_delta), 1)
+        stage['runs'] += 1
+
+
+def log_stage_metrics(logger: logging.Logger, metrics: Dict[str, Dict[str, Any]], source: str) -> None:
+    """
+    Emit the stage metrics as one structured log record.
+    
+    The message carries the metrics as JSON so they can be parsed from the log
+    file, and the record has 'stage_metrics' and 'metrics_source' attributes for
+    handlers that read them directly.
+    
+    Args:
+        logger: Logger to emit the record on
+        metrics: Dictionary of stage metrics
+        source: What was measured (for example the input file)
+    """
+    payload = {'source': source, 'stages': metrics}
+    logger.info(f"Stage metrics: {json.dumps(payload)}",
+                extra={'stage_metrics': metrics, 'metrics_source': source})
+
+
+def format_stage_metrics(metrics: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Format the stage metrics as a Markdown table.
+    
+    Args:
+        metrics: Dictionary of stage metrics
+    
+    Returns:
+        Markdown section with one row per stage and a total row (the stages
+        run one after another, so the total peak delta is the largest one)
+    """
+    report = "## Stage Metrics\n"
+    report += "| Stage | Wall (s) | CPU (s) | Rows | Rows/s | Peak Memory Delta (MB) |\n"
+    report += "|---|---|---|---|---|---|\n"
+    for name, stage in metrics.items():
+        rows_per_second = f"{stage['rows_per_second']:,.0f}" if stage['rows_per_second'] else '-'
+        report += (f"| {name} | {stage['wall_seconds']:.3f} | {stage['cpu_seconds']:.3f} | "
+                   f"{stage['rows']:,} | {rows_per_second} | {stage['peak_memory_delta_mb']:.1f} |\n")
+    
+    total_wall = sum(stage['wall_seconds'] for stage in metrics.values())
+    total_cpu = sum(stage['cpu_seconds'] for stage in metrics.values())
+    total_delta = max((stage['peak_memory_delta_mb'] for stage in metrics.values()), default=0.0)
+    report += f"| total | {total_wall:.3f} | {total_cpu:.3f} | | | {total_delta:.1f} |\n\n"
+    
+    return report
@@ -0,0 +1,132 @@
+"""
+Stub Upload Server Module
+
+This module provides a local stand-in for the inventory upload API, used by
+the transport tests and the throughput benchmark. It accepts POSTed JSON
+batches over keep-alive HTTP/1.1 connections and can inject latency and
+transient failures.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """Request handler that records batches and applies the server's failure settings."""
+    
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    
+    def do_POST(self):
+        """Accept a batch of records or answer with an injected failure."""
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server = self.server
+        
+        if server.latency:
+            time.sleep(server.latency)
+        
+        with server.lock:
+            server.requests_received += 1
+            fail = server.requests_received <= server.fail_first_requests
+            if not fail:
+                record_count = len(json.loads(body)['records'])
+                server.batches_received += 1
+                server.records_received += record_count
+        
+        if fail:
+            self._respond(503, {'error': 'Service temporarily unavailable'})
+        else:
+            self._respond(server.accept_status, {'accepted': record_count})
+    
+    def _respond(self, status: int, payload: dict) -> None:
+        """Send a JSON response with a Content-Length so the connection stays open."""
+        self.send_response(status)
+        if status in (204, 304):
+            # Bodiless responses carry no Content-Length and still keep the connection open
+            self.end_headers()
+            return
+        
+        response = json.dumps(payload).encode('utf-8')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+    
+    def log_message(self, format, *args):
+        """Keep request logging out of test and benchmark output."""
+        pass
+
+
+class StubUploadServer:
+    """
+    Local HTTP server that accepts inventory upload batches.
+    
+    Use it as a context manager; the endpoint URL is available as
+    endpoint_url while the server is running.
+    """
+    
+    def __init__(self, latency: float = 0.0, fail_first_requests: int = 0, port: int = 0,
+                 accept_status: int = 200):
+        """
+        Initialize the server.
+        
+        Args:
+            latency: Seconds to wait before answering each request
+            fail_first_requests: Number of initial requests answered with HTTP 503
+            port: Port to listen on (0 picks a free port)
+            accept_status: Status code for accepted batches (204 answers without a body)
+        """
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), _StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.fail_first_requests = fail_first_requests
+        self.httpd.accept_status = accept_status
+        self.httpd.lock = threading.Lock()
+        self.httpd.requests_received = 0
+        self.httpd.batches_received = 0
+        self.httpd.records_received = 0
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def endpoint_url(self) -> str:
+        """URL to POST batches to."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/inventory"
+    
+    @property
+    def requests_received(self) -> int:
+        """Number of requests received, including injected failures."""
+        return self.httpd.requests_received
+    
+    @property
+    def records_received(self) -> int:
+        """Number of records in accepted batches."""
+        return self.httpd.records_received
+    
+    @property
+    def batches_received(self) -> int:
+        """Number of accepted batches."""
+        return self.httpd.batches_received
+    
+    def start(self) -> 'StubUploadServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self) -> 'StubUploadServer':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
@@ -0,0 +1,52 @@
+"""
+Test Script for Batch Uploads
+
+This script runs a small batch of inventory files through the process pool,
+including a file that cannot be read, and checks the batch summary.
+"""
+
+import os
+import shutil
+import tempfile
+from upload_handler import UploadHandler
+
+
+PROBLEMATIC_FILE = "../data/problematic_inventory/problematic_inventory.xlsx"
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_batch_upload_with_failing_file():
+    """A failing file should be reported without aborting the rest of the batch."""
+    handler = UploadHandler()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_dir = os.path.join(temp_dir, "inputs")
+        output_dir = os.path.join(temp_dir, "outputs")
+        os.makedirs(input_dir)
+        shutil.copy(PROBLEMATIC_FILE, input_dir)
+        shutil.copy(CORRECT_FILE, input_dir)
+        with open(os.path.join(input_dir, "broken.csv"), 'w') as f:
+            f.write("")
+
+        batch_results = handler.handle_batch_upload(input_dir, output_dir, max_workers=2)
+
+        print(f"Files succeeded: {batch_results['files_succeeded']}, failed: {batch_results['files_failed']}")
+        assert batch_results['total_files'] == 3
+        assert batch_results['files_succeeded'] == 2
+        assert batch_results['files_failed'] == 1
+        assert not batch_results['success']
+
+        # Every file gets its own output subdirectory
+        for name in ["problematic_inventory", "correct_inventory"]:
+            assert os.path.exists(os.path.join(output_dir, name, "upload_results.json"))
+        assert os.path.exists(os.path.join(output_dir, "batch_results.json"))
+        assert os.path.exists(os.path.join(output_dir, "batch_summary.md"))
+
+        single_results = handler.handle_upload_process(CORRECT_FILE, os.path.join(temp_dir, "single"))
+        correct_summary = batch_results['files'][os.path.join(input_dir, "correct_inventory.xlsx")]
+        assert correct_summary['records_uploaded'] == single_results['records_uploaded']
+
+
+if __name__ == "__main__":
+    test_batch_upload_with_failing_file()
+    print("All batch upload tests passed")
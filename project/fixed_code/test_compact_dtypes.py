@@ -0,0 +1,46 @@
+"""
+Test Script for Compact Dtypes
+
+This script checks that the compact dtype mode keeps validation results and
+uploaded values unchanged while using less memory.
+"""
+
+import pandas as pd
+from data_validator import DataValidator
+from inventory_generator import generate_inventory
+from upload_handler import UploadHandler
+
+
+PROBLEMATIC_FILE = "../data/problematic_inventory/problematic_inventory.xlsx"
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_compact_frame_validates_the_same():
+    """Validation on the compact frame should find the same issues."""
+    validator = DataValidator()
+    df = validator.clean_column_names(generate_inventory(5000, seed=3))
+    converted = validator.convert_data_types(df)
+    compact = validator.convert_data_types(df, compact=True)
+
+    print(compact.dtypes)
+    assert isinstance(compact['Make'].dtype, pd.CategoricalDtype)
+    assert compact['Year'].dtype == 'Int16'
+    assert compact['Price'].dtype == 'float32'
+    assert validator.validate_data(compact)[1] == validator.validate_data(converted)[1]
+    assert compact.memory_usage(deep=True).sum() * 3 < converted.memory_usage(deep=True).sum()
+
+
+def test_compact_upload_frame_matches():
+    """Records prepared in compact mode should serialize to the same upload payload."""
+    for file_path in [PROBLEMATIC_FILE, CORRECT_FILE]:
+        df, results = UploadHandler().prepare_for_upload(file_path)
+        compact_df, compact_results = UploadHandler(compact_dtypes=True).prepare_for_upload(file_path)
+
+        assert compact_results['validation_issues'] == results['validation_issues']
+        assert compact_df.to_json(orient='records') == df.to_json(orient='records')
+
+
+if __name__ == "__main__":
+    test_compact_frame_validates_the_same()
+    test_compact_upload_frame_matches()
+    print("All compact dtype tests passed")
@@ -0,0 +1,78 @@
+"""
+Test Script for Copy-Free Processing
+
+This script checks that every stage gives the same frame with copy=False as
+with copy=True, and that copy=True leaves the caller's frame untouched.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from upload_handler import UploadHandler
+
+
+def stage_inputs():
+    """Build the input frame of every copy-aware stage from one generated inventory file."""
+    handler = UploadHandler()
+    processor = handler.processor
+    validator = processor.validator
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(1500, seed=31, missing_rate=0.05, bad_type_rate=0.03,
+                           special_char_rate=0.02).to_csv(file_path, index=False)
+        raw, _ = processor.read_inventory_file(file_path)
+    cleaned = validator.clean_column_names(raw)
+    _, validation_issues = validator.validate_data(cleaned)
+    converted = validator.convert_data_types(cleaned)
+    fixed = processor.fix_missing_values(converted)
+    marked = handler.mark_records_with_issues(fixed, validation_issues)
+    
+    return [
+        ('clean_column_names', validator.clean_column_names, raw),
+        ('convert_data_types', validator.convert_data_types, cleaned),
+        ('compact_dtypes', validator.compact_dtypes, cleaned),
+        ('fix_missing_values', processor.fix_missing_values, converted),
+        ('mark_records_with_issues', lambda df, copy: handler.mark_records_with_issues(df, validation_issues, copy=copy), fixed),
+        ('format_for_upload', handler.format_for_upload, marked)
+    ]
+
+
+def test_stages_match_with_and_without_copies():
+    """copy=False should give the same frame as copy=True, which must not modify its input."""
+    for name, stage, df in stage_inputs():
+        original = df.copy(deep=True)
+        copied = stage(df.copy(deep=True), copy=True)
+        
+        in_place_input = df.copy(deep=True)
+        in_place = stage(in_place_input, copy=False)
+        
+        print(f"{name}: {len(copied)} rows, {copied.shape[1]} columns")
+        pd.testing.assert_frame_equal(in_place, copied)
+        
+        stage(df, copy=True)
+        pd.testing.assert_frame_equal(df, original)
+
+
+def test_copy_free_processing_matches():
+    """Copy-free processing and preparation should give the same frames as the default."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(1500, seed=32, missing_rate=0.05, bad_type_rate=0.03).to_csv(file_path, index=False)
+        
+        processed, results = InventoryProcessor().process_inventory(file_path)
+        processed_in_place, in_place_results = InventoryProcessor().process_inventory(file_path, copy=False)
+        assert in_place_results['validation_issues'] == results['validation_issues']
+        pd.testing.assert_frame_equal(processed_in_place, processed)
+        
+        prepared, _ = UploadHandler().prepare_for_upload(file_path)
+        prepared_in_place, _ = UploadHandler().prepare_for_upload(file_path, copy=False)
+        pd.testing.assert_frame_equal(prepared_in_place, prepared)
+
+
+if __name__ == "__main__":
+    test_stages_match_with_and_without_copies()
+    test_copy_free_processing_matches()
+    print("All copy-free tests passed")
@@ -0,0 +1,148 @@
+"""
+Test Script for the Duplicate Index
+
+This script checks duplicate detection within a file, across the chunks of a
+streamed file and across files sharing an on-disk index.
+"""
+
+import os
+import tempfile
+import numpy as np
+from duplicate_index import DuplicateCheck, DuplicateIndex, HashIndex
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+
+
+def test_within_file_and_across_chunks():
+    """Repeated values should point to their first row, also when the repeat is in a later chunk."""
+    df = generate_inventory(2000, seed=13)
+    df.loc[1500, 'VIN'] = ' ' + df.loc[10, 'VIN'].lower()
+    df.loc[1999, 'Stock #'] = df.loc[3, 'Stock #']
+    
+    issues = DuplicateCheck('inventory.csv').check(df)
+    assert issues == [
+        {'field': 'VIN', 'check': 'within_file', 'rows': [1500], 'conflict_rows': [10]},
+        {'field': 'Stock #', 'check': 'within_file', 'rows': [1999], 'conflict_rows': [3]}
+    ]
+    
+    check = DuplicateCheck('inventory.csv')
+    chunked = [issue for start in range(0, len(df), 300) for issue in check.check(df.iloc[start:start + 300])]
+    assert sorted(chunked, key=lambda issue: issue['field'], reverse=True) == issues
+    
+    # A table grown well past its initial size still finds every key
+    keys = np.unique(np.random.default_rng(1).integers(1, 2**63, 200_000, dtype=np.uint64))
+    table = HashIndex()
+    table.insert(keys, np.zeros(len(keys), dtype=np.uint32), np.arange(len(keys)))
+    positions = table.lookup(keys)
+    assert (table.slots['row'][positions] == np.arange(len(keys))).all()
+    assert (table.lookup(keys + np.uint64(1))[~np.isin(keys + np.uint64(1), keys)] == -1).all()
+
+
+def test_across_files_with_index():
+    """Values listed by another file should be reported with that file's path and row, until it drops them."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first_path = os.path.join(temp_dir, "rooftop_a.csv")
+        second_path = os.path.join(temp_dir, "rooftop_b.csv")
+        first = generate_inventory(500, seed=1)
+        second = generate_inventory(500, seed=2, start=500)
+        second.loc[7, 'VIN'] = first.loc[42, 'VIN']
+        first.to_csv(first_path, index=False)
+        second.to_csv(second_path, index=False)
+        
+        processor = InventoryProcessor(duplicate_index=DuplicateIndex(os.path.join(temp_dir, "index")))
+        _, first_results = processor.process_inventory(first_path)
+        _, results = processor.process_inventory(second_path)
+        assert first_results['validation_issues']['duplicate_issues'] == []
+        
+        issue = results['validation_issues']['duplicate_issues'][0]
+        print(issue)
+        assert issue['check'] == 'across_files' and issue['rows'] == [7]
+        assert issue['conflict_files'] == [os.path.abspath(first_path)] and issue['conflict_rows'] == [42]
+        assert "repeats a value listed by another file in 1 rows (rows: [7])" in results['validation_report']
+        
+        # Re-running the second file reports it again; once the first file drops the VIN it is released
+        assert processor.process_inventory(second_path)[1]['validation_issues']['duplicate_issues'] == [issue]
+        first.drop(index=42).to_csv(first_path, index=False)
+        processor.process_inventory(first_path)
+        assert processor.process_inventory(second_path)[1]['validation_issues']['duplicate_issues'] == []
+
+
+def test_feed_key_owns_keys_across_file_names():
+    """A new export of a feed should take over its own values whatever its file name."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        export = generate_inventory(500, seed=3)
+        first_path = os.path.join(temp_dir, "rooftop-12-2025-05-16-0304.csv")
+        second_path = os.path.join(temp_dir, "rooftop-12-2025-05-17-0304.csv")
+        export.to_csv(first_path, index=False)
+        export.drop(index=42).to_csv(second_path, index=False)
+        
+        processor = InventoryProcessor(duplicate_index=DuplicateIndex(os.path.join(temp_dir, "index")))
+        processor.process_inventory(first_path, feed_key='rooftop-12')
+        _, results = processor.process_inventory(second_path, feed_key='rooftop-12')
+        print(f"{len(results['validation_issues']['duplicate_issues'])} duplicate issues on the second export")
+        assert results['validation_issues']['duplicate_issues'] == []
+        
+        # Another feed listing the VIN the feed dropped is not reported; one it still lists is,
+        # against the feed's latest export
+        other_path = os.path.join(temp_dir, "rooftop-7.csv")
+        other = generate_inventory(10, seed=4, start=500)
+        other.loc[0, 'VIN'] = export.loc[42, 'VIN']
+        other.loc[1, 'VIN'] = export.loc[43, 'VIN']
+        other.to_csv(other_path, index=False)
+        _, results = processor.process_inventory(other_path, feed_key='rooftop-7')
+        issue = results['validation_issues']['duplicate_issues'][0]
+        assert issue['rows'] == [1] and issue['conflict_files'] == [os.path.abspath(second_path)]
+        assert issue['conflict_rows'] == [42]
+
+
+
+def test_numeric_and_text_stock_numbers_match():
+    """A Stock # read as float64 because of blanks should match the same number in a text column."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        numeric_path = os.path.join(temp_dir, "rooftop_a.csv")
+        text_path = os.path.join(temp_dir, "rooftop_b.csv")
+        numeric = generate_inventory(20, seed=5)
+        numeric['Stock #'] = [str(1000 + i) if i % 5 else '' for i in range(20)]
+        text = generate_inventory(20, seed=6, start=20)
+        text.loc[3, 'Stock #'] = '1007'
+        numeric.to_csv(numeric_path, index=False)
+        text.to_csv(text_path, index=False)
+        
+        processor = InventoryProcessor(duplicate_index=DuplicateIndex(os.path.join(temp_dir, "index")))
+        numeric_df, _ = processor.process_inventory(numeric_path)
+        assert numeric_df['Stock #'].dtype == np.float64
+        _, results = processor.process_inventory(text_path)
+        
+        issue = results['validation_issues']['duplicate_issues'][0]
+        print(issue)
+        assert issue['field'] == 'Stock #' and issue['check'] == 'across_files'
+        assert issue['rows'] == [3] and issue['conflict_rows'] == [7]
+
+
+def test_small_claims_update_delta_in_place():
+    """Claiming a few keys should write their slots into the existing delta file, not a new copy."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = DuplicateIndex(os.path.join(temp_dir, "index"))
+        keys = np.unique(np.random.default_rng(2).integers(1, 2**63, 5000, dtype=np.uint64))
+        index.claim("rooftop_a.csv", 'VIN', keys[:4000], np.arange(4000))
+        delta_path = os.path.join(temp_dir, "index", "vin_delta.npy")
+        inode = os.stat(delta_path).st_ino
+        
+        conflicts, conflict_files, conflict_rows = index.claim("rooftop_b.csv", 'VIN', keys[3990:4010], np.arange(20))
+        assert os.stat(delta_path).st_ino == inode
+        assert conflicts.tolist() == [True] * 10 + [False] * 10
+        assert conflict_files == [os.path.abspath("rooftop_a.csv")] * 10
+        assert conflict_rows.tolist() == list(range(3990, 4000))
+        
+        # The in-place changes are read back by a new index on the same directory
+        conflicts, _, conflict_rows = DuplicateIndex(os.path.join(temp_dir, "index")).claim(
+            "rooftop_c.csv", 'VIN', keys[4000:4010], np.arange(10))
+        assert conflicts.all() and conflict_rows.tolist() == list(range(10, 20))
+
+if __name__ == "__main__":
+    test_within_file_and_across_chunks()
+    test_across_files_with_index()
+    test_feed_key_owns_keys_across_file_names()
+    test_numeric_and_text_stock_numbers_match()
+    test_small_claims_update_delta_in_place()
+    print("All duplicate index tests passed")
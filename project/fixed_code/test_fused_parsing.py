@@ -0,0 +1,52 @@
+"""
+Test Script for Fused Column Parsing
+
+This script checks that parsing the typed columns once and sharing them
+between validation and conversion gives the same issues and converted frames
+as parsing them separately in each step.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from data_validator import DataValidator
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+
+
+def test_fused_matches_unfused_validation_and_conversion():
+    """Shared parsed columns should give identical issues and converted frames."""
+    df = generate_inventory(3000, seed=17, missing_rate=0.05, bad_type_rate=0.05)
+    validator = DataValidator()
+    df = validator.clean_column_names(df)
+    
+    parsed_columns = validator.parse_typed_columns(df)
+    fused_passed, fused_issues = validator.validate_data(df, parsed_columns)
+    passed, issues = validator.validate_data(df)
+    
+    print({issue_type: len(issue_list) for issue_type, issue_list in issues.items()})
+    assert fused_passed == passed and not passed
+    assert fused_issues == issues
+    assert issues['data_type_issues'] and issues['missing_values']
+    
+    pd.testing.assert_frame_equal(validator.convert_data_types(df, parsed_columns), validator.convert_data_types(df))
+
+
+def test_fused_processing_matches_unfused():
+    """The processor should give the same results with and without fused parsing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(2000, seed=18, missing_rate=0.05, bad_type_rate=0.05).to_csv(file_path, index=False)
+        
+        fused_df, fused_results = InventoryProcessor(fused_parsing=True).process_inventory(file_path)
+        df, results = InventoryProcessor().process_inventory(file_path)
+    
+    assert fused_results['validation_issues'] == results['validation_issues']
+    assert fused_results['validation_report'] == results['validation_report']
+    pd.testing.assert_frame_equal(fused_df, df)
+
+
+if __name__ == "__main__":
+    test_fused_matches_unfused_validation_and_conversion()
+    test_fused_processing_matches_unfused()
+    print("All fused parsing tests passed")
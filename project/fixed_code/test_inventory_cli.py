@@ -0,0 +1,55 @@
+"""
+Test Script for the Command Line Entry Point
+
+This script checks that the CLI starts without importing pandas and that an
+unchanged file is skipped on the next upload run.
+"""
+
+import os
+import sys
+import subprocess
+import tempfile
+from inventory_generator import generate_inventory
+import inventory_cli
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_bad_input_exits_before_heavy_imports():
+    """Rejecting an input should not import pandas or create a log file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        code = ("import sys, inventory_cli; code = inventory_cli.main(['validate', 'inventory.txt']); "
+                "print(code, 'pandas' in sys.modules)")
+        open(os.path.join(temp_dir, "inventory.txt"), 'w').close()
+        output = subprocess.run(
+            [sys.executable, '-c', code], cwd=temp_dir, capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=CODE_DIR)
+        )
+        leftovers = os.listdir(temp_dir)
+    
+    print(output.stdout, output.stderr)
+    assert output.stdout.split() == ['1', 'False']
+    assert "Unsupported file format: .txt" in output.stderr
+    assert leftovers == ["inventory.txt"]
+
+
+def test_unchanged_file_is_skipped():
+    """A second upload of the same content should stop at the digest check."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        output_dir = os.path.join(temp_dir, "output")
+        generate_inventory(100, seed=7).to_csv(file_path, index=False)
+        
+        args = ['--log-file', os.path.join(temp_dir, "cli.log"), 'upload', file_path, output_dir, '--skip-unchanged']
+        assert inventory_cli.main(args) == 0
+        assert inventory_cli.is_unchanged(file_path, output_dir)
+        
+        with open(file_path, 'a') as f:
+            f.write("\n")
+        assert not inventory_cli.is_unchanged(file_path, output_dir)
+
+
+if __name__ == "__main__":
+    test_bad_input_exits_before_heavy_imports()
+    test_unchanged_file_is_skipped()
+    print("All CLI tests passed")
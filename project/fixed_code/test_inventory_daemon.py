@@ -0,0 +1,155 @@
+"""
+Test Script for the Inventory Daemon
+
+This script starts the daemon in a background thread and checks that it
+serves processing requests over a Unix socket and TCP, reloads without
+losing requests and rejects malformed ones.
+"""
+
+import os
+import time
+import tempfile
+import threading
+from duplicate_index import DuplicateIndex
+from inventory_daemon import InventoryDaemon, send_request
+from inventory_generator import generate_inventory
+from price_book import COST_BOOK_PATH, RETAIL_BOOK_PATH
+from row_state import RowStateStore
+
+
+def start_daemon(daemon, address):
+    """Start a daemon and serve it from a background thread; returns the bound address."""
+    daemon.start()
+    server = daemon.bind(address)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address
+
+
+def test_process_reload_and_shutdown():
+    """Requests over a Unix socket should be served before and after a reload."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(800, seed=12, missing_rate=0.05).to_csv(file_path, index=False)
+        
+        daemon = InventoryDaemon(workers=1)
+        address = start_daemon(daemon, os.path.join(temp_dir, "daemon.sock"))
+        
+        status, response = send_request(address, '/process', {'file': file_path, 'output_dir': os.path.join(temp_dir, "out")})
+        print(f"process: {response['records_processed']} records in {response['elapsed_ms']} ms")
+        assert status == 200 and response['success'] and response['records_processed'] == 800
+        assert os.path.exists(os.path.join(temp_dir, "out", "upload_results.json"))
+        
+        status, response = send_request(address, '/reload', {})
+        assert status == 200 and response['generation'] == 2
+        
+        status, response = send_request(address, '/validate', {'file': file_path})
+        assert status == 200 and response['records_with_issues'] > 0
+        assert response['issue_counts']['missing_values'] > 0
+        
+        status, response = send_request(address, '/status')
+        assert response['requests_served'] == 2 and response['in_flight'] == 0
+        
+        send_request(address, '/shutdown', {})
+        assert daemon._stopped.wait(30)
+        assert not os.path.exists(address)
+
+
+def test_margins_and_bad_requests():
+    """Warm price books should price vehicles over TCP, and malformed requests should get 4xx."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(300, seed=13).to_csv(file_path, index=False)
+        
+        daemon = InventoryDaemon(workers=1, cost_book_path=COST_BOOK_PATH, retail_book_path=RETAIL_BOOK_PATH)
+        address = start_daemon(daemon, ('127.0.0.1', 0))
+        try:
+            output_path = os.path.join(temp_dir, "margins.csv")
+            status, response = send_request(address, '/margins', {'file': file_path, 'output_path': output_path})
+            print(f"margins: {response['plans_priced']} plans in {response['elapsed_ms']} ms")
+            assert status == 200 and response['success'] and response['vehicles_priced'] > 0
+            assert os.path.exists(output_path)
+            
+            assert send_request(address, '/process', {'file': file_path})[0] == 400
+            assert send_request(address, '/validate', {'path': file_path})[0] == 400
+            assert send_request(address, '/missing', {})[0] == 404
+            
+            status, response = send_request(address, '/validate', {'file': os.path.join(temp_dir, "missing.csv")})
+            assert status == 200 and not response['success']
+        finally:
+            daemon.shutdown()
+
+
+def test_validate_leaves_shared_state_unchanged():
+    """Validation should not save row state or claim duplicate index values."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        inventory = generate_inventory(300, seed=14)
+        inventory.loc[5, 'VIN'] = inventory.loc[2, 'VIN']
+        inventory.to_csv(file_path, index=False)
+        
+        state_dir = os.path.join(temp_dir, "state")
+        index_dir = os.path.join(temp_dir, "index")
+        handler_options = {'state_store': RowStateStore(state_dir), 'duplicate_index': DuplicateIndex(index_dir)}
+        daemon = InventoryDaemon(handler_options, workers=1)
+        address = start_daemon(daemon, ('127.0.0.1', 0))
+        try:
+            status, response = send_request(address, '/validate', {'file': file_path})
+            assert status == 200 and response['issue_counts']['duplicate_issues'] == 1
+            assert os.listdir(state_dir) == [] and os.listdir(index_dir) == []
+            
+            status, response = send_request(address, '/process', {'file': file_path, 'output_dir': os.path.join(temp_dir, "out")})
+            assert status == 200 and response['success']
+            print(f"after process: {len(os.listdir(state_dir))} state files, {sorted(os.listdir(index_dir))}")
+            assert os.listdir(state_dir) and 'index.json' in os.listdir(index_dir)
+        finally:
+            daemon.shutdown()
+
+
+
+def test_shutdown_during_reload():
+    """A shutdown that overlaps a reload should stop the reload's new pool too."""
+    class RecordingDaemon(InventoryDaemon):
+        def _replace_pool(self):
+            old_executor = super()._replace_pool()
+            self.pools.append(self.executor)
+            return old_executor
+    
+    daemon = RecordingDaemon(workers=1)
+    daemon.pools = []
+    daemon.start()
+    
+    errors = []
+    
+    def reload():
+        try:
+            daemon.reload()
+        except Exception as e:
+            errors.append(e)
+    
+    reloading = threading.Thread(target=reload)
+    reloading.start()
+    while not daemon._reload_lock.locked() and reloading.is_alive():
+        time.sleep(0.001)
+    daemon.shutdown()
+    reloading.join()
+    
+    print(f"generation {daemon.generation}, errors: {errors}")
+    assert errors == [] and daemon.executor is None
+    assert daemon.generation == 2 and len(daemon.pools) == 2
+    for pool in daemon.pools:
+        try:
+            pool.submit(int)
+        except RuntimeError:
+            continue
+        raise AssertionError("A worker pool is still running after shutdown")
+    
+    # A reload after shutdown does nothing
+    daemon.reload()
+    assert daemon.executor is None and daemon.generation == 2
+
+if __name__ == "__main__":
+    test_process_reload_and_shutdown()
+    test_margins_and_bad_requests()
+    test_validate_leaves_shared_state_unchanged()
+    test_shutdown_during_reload()
+    print("All inventory daemon tests passed")
@@ -0,0 +1,59 @@
+"""
+Test Script for the Inventory Generator
+
+This script checks that generated inventories are reproducible from their
+seed and that the configured rates give roughly that share of bad cells.
+"""
+
+import numpy as np
+import pandas as pd
+from inventory_generator import generate_inventory, BAD_NUMBERS, EXPORT_COLUMNS, SPECIAL_CLASSES
+
+ROWS = 20_000
+
+
+def test_same_seed_gives_same_frame():
+    """One seed should always give the same frame, and another seed a different one."""
+    df = generate_inventory(2000, seed=7, missing_rate=0.05, bad_type_rate=0.05)
+    
+    pd.testing.assert_frame_equal(generate_inventory(2000, seed=7, missing_rate=0.05, bad_type_rate=0.05), df)
+    assert not generate_inventory(2000, seed=8, missing_rate=0.05, bad_type_rate=0.05).equals(df)
+    assert list(df.columns) == EXPORT_COLUMNS
+    
+    # Chunks of a larger file continue the Stock # sequence
+    second = generate_inventory(2000, seed=7, start=2000)
+    assert not set(df['Stock #'].dropna()) & set(second['Stock #'].dropna())
+
+
+def test_rates_give_configured_share_of_bad_cells():
+    """Missing, unparseable, below-cost and special-character rates should hold within sampling error."""
+    rates = {'missing_rate': 0.05, 'bad_type_rate': 0.04, 'below_cost_rate': 0.1, 'special_char_rate': 0.03}
+    df = generate_inventory(ROWS, seed=11, **rates)
+    
+    for col in ['Year', 'Stock #', 'VIN', 'Make', 'Model', 'Price', 'Unit Cost']:
+        share = df[col].isna().mean()
+        print(f"{col}: {share:.4f} missing")
+        assert abs(share - rates['missing_rate']) < 0.01
+    
+    for col in ['Year', 'Odometer', 'Price', 'Unit Cost']:
+        # Bad cells may be blanked again by the missing-value pass
+        expected = rates['bad_type_rate'] * (1 - rates['missing_rate']) if col != 'Odometer' else rates['bad_type_rate']
+        share = df[col].isin(BAD_NUMBERS).mean()
+        print(f"{col}: {share:.4f} unparseable")
+        assert abs(share - expected) < 0.01
+    
+    price = pd.to_numeric(df['Price'], errors='coerce')
+    cost = pd.to_numeric(df['Unit Cost'], errors='coerce')
+    priced = price.notna() & cost.notna()
+    assert abs((price[priced] < cost[priced]).mean() - rates['below_cost_rate']) < 0.01
+    assert abs(df['Class'].isin(SPECIAL_CLASSES).mean() - rates['special_char_rate']) < 0.01
+    
+    clean = generate_inventory(2000, seed=11, missing_rate=0, bad_type_rate=0)
+    assert not clean.isna().to_numpy().any()
+    assert not np.isin(clean[['Year', 'Odometer', 'Price', 'Unit Cost']].to_numpy(), BAD_NUMBERS).any()
+
+
+if __name__ == "__main__":
+    test_same_seed_gives_same_frame()
+    test_rates_give_configured_share_of_bad_cells()
+    print("All inventory generator tests passed")
@@ -0,0 +1,53 @@
+"""
+Test Script for the Issue Store
+
+This script checks that RowSets stand in for the row lists of validation
+issues and that the vectorized count matches counting with a Python set.
+"""
+
+import json
+import numpy as np
+from data_validator import DataValidator
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from issue_store import RowSet, count_distinct_rows, issue_row_sets
+from upload_handler import JSONEncoder
+
+
+def test_row_set_behaves_like_a_list():
+    """Length, iteration, comparison, text and JSON should match the list."""
+    rows = RowSet(np.array([3, 7, 8]))
+    assert len(rows) == 3 and list(rows) == [3, 7, 8]
+    assert rows == [3, 7, 8] and rows != [3, 7]
+    assert str(rows) == str([3, 7, 8])
+    assert json.dumps({'rows': rows}, cls=JSONEncoder) == '{"rows": [3, 7, 8]}'
+    assert rows.union([1, 7]).tolist() == [1, 3, 7, 8]
+    assert RowSet.concat([rows, [10]]).tolist() == [3, 7, 8, 10]
+    assert not RowSet() and 7 in rows
+
+
+def test_count_matches_python_set():
+    """Distinct rows with issues should match a set-based count, also across merged chunks."""
+    validator = DataValidator()
+    df = validator.clean_column_names(generate_inventory(3000, seed=9, missing_rate=0.05, bad_type_rate=0.05))
+    _, issues = validator.validate_data(df)
+    
+    expected = set()
+    for rows in issue_row_sets(issues):
+        expected.update(rows)
+    assert count_distinct_rows(issue_row_sets(issues)) == len(expected)
+    assert InventoryProcessor()._count_records_with_issues(issues) == len(expected)
+    
+    merged = None
+    for start in range(0, len(df), 700):
+        _, chunk_issues = validator.validate_data(df.iloc[start:start + 700])
+        merged = validator.merge_validation_issues(merged, chunk_issues)
+    print(f"{len(expected)} rows with issues")
+    assert merged == issues
+    assert count_distinct_rows(issue_row_sets(merged)) == len(expected)
+
+
+if __name__ == "__main__":
+    test_row_set_behaves_like_a_list()
+    test_count_matches_python_set()
+    print("All issue store tests passed")
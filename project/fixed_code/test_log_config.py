@@ -0,0 +1,83 @@
+"""
+Test Script for Queued Logging
+
+This script checks that the queued logging backend collapses repeated messages,
+writes every record by the time it is flushed and collects the records of
+batch worker processes.
+"""
+
+import os
+import sys
+import queue
+import logging
+import logging.handlers
+import subprocess
+import tempfile
+from log_config import AggregatingQueueListener
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ListHandler(logging.Handler):
+    """Handler that keeps the messages it receives."""
+    
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+    
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_repeated_messages_are_collapsed():
+    """Repeats within the window should become one summary line."""
+    log_queue = queue.Queue()
+    handler = ListHandler()
+    listener = AggregatingQueueListener(log_queue, handler, repeat_window=60)
+    listener.start()
+    
+    logger = logging.getLogger('test_log_config.repeats')
+    logger.propagate = False
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    for _ in range(500):
+        logger.warning("Upload batch failed")
+    logger.warning("Upload finished")
+    
+    listener.stop()
+    listener.emit_pending_repeats()
+    print(handler.messages)
+    assert handler.messages == [
+        "Upload batch failed",
+        "Upload finished",
+        "Upload batch failed (repeated 499 more times)"
+    ]
+
+
+def test_worker_records_reach_the_log_file():
+    """Records logged in worker processes should be written by the parent's listener."""
+    script = (
+        "import logging, log_config\n"
+        "from concurrent.futures import ProcessPoolExecutor\n"
+        "log_config.configure_logging('queued.log', queued=True, module_levels={'quiet': 'ERROR'})\n"
+        "initializer, initargs = log_config.worker_logging_setup()\n"
+        "with ProcessPoolExecutor(2, initializer=initializer, initargs=initargs) as executor:\n"
+        "    list(executor.map(logging.getLogger('worker').warning, [f'file {i}' for i in range(6)]))\n"
+        "    list(executor.map(logging.getLogger('quiet').warning, ['hidden']))\n"
+        "logging.getLogger('parent').info('done')\n"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        subprocess.run([sys.executable, '-c', script], cwd=temp_dir, check=True, capture_output=True,
+                       env=dict(os.environ, PYTHONPATH=CODE_DIR))
+        with open(os.path.join(temp_dir, 'queued.log')) as f:
+            lines = f.read().splitlines()
+    
+    print(lines)
+    assert sorted(line.split(' - ', 1)[1] for line in lines) == sorted(
+        [f"worker - WARNING - file {i}" for i in range(6)] + ["parent - INFO - done"]
+    )
+
+
+if __name__ == "__main__":
+    test_repeated_messages_are_collapsed()
+    test_worker_records_reach_the_log_file()
+    print("All logging tests passed")
@@ -0,0 +1,86 @@
+"""
+Test Script for Issue Marking
+
+This script checks that the vectorized mark_records_with_issues marks the same
+rows with the same issue text as marking row by row with .loc.
+"""
+
+import numpy as np
+import pandas as pd
+from data_validator import DataValidator
+from duplicate_index import DUPLICATE_CHECKS
+from inventory_generator import generate_inventory
+from upload_handler import UploadHandler
+from vin_decoder import VIN_CHECKS
+
+
+def mark_row_by_row(df, validation_issues):
+    """Reference implementation: append each issue's message to its rows one .loc at a time."""
+    marked_df = df.copy()
+    marked_df['has_issues'] = False
+    marked_df['issue_type'] = ''
+    
+    entries = [(f"Missing {issue['field']}; ", issue['rows']) for issue in validation_issues.get('missing_values', [])]
+    entries += [(f"Invalid {issue['field']} format; ", issue['rows'])
+                for issue in validation_issues.get('data_type_issues', [])]
+    entries += [("Price below cost; ", validation_issues.get('price_below_cost', []))]
+    entries += [(f"Special characters in {issue['field']}; ", issue['rows'])
+                for issue in validation_issues.get('special_character_issues', [])]
+    entries += [(f"{VIN_CHECKS[issue['check']][2]}; ", issue['rows']) for issue in validation_issues.get('vin_issues', [])]
+    entries += [(DUPLICATE_CHECKS[issue['check']][1].format(field=issue['field']) + "; ", issue['rows'])
+                for issue in validation_issues.get('duplicate_issues', [])]
+    
+    for message, rows in entries:
+        for row in rows:
+            marked_df.loc[row, 'has_issues'] = True
+            marked_df.loc[row, 'issue_type'] = marked_df.loc[row, 'issue_type'] + message
+    
+    return marked_df
+
+
+def test_matches_row_by_row_marking():
+    """Issues found by validation should be marked exactly as the row-by-row loop marks them."""
+    df = generate_inventory(1500, seed=21, missing_rate=0.03, bad_type_rate=0.02, special_char_rate=0.02)
+    df.loc[700, 'VIN'] = df.loc[10, 'VIN']
+    validator = DataValidator(vin_checks=True)
+    df = validator.clean_column_names(df)
+    _, validation_issues = validator.validate_data(df)
+    
+    handler = UploadHandler()
+    pd.testing.assert_frame_equal(handler.mark_records_with_issues(df, validation_issues),
+                                  mark_row_by_row(df, validation_issues))
+
+
+def test_generated_issues_with_repeated_rows():
+    """Random issues, including rows listed twice by one issue, should match the row-by-row loop."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'Stock #': np.arange(400)}, index=np.arange(1000, 1400))
+    
+    for repeat in [False, True]:
+        def random_rows():
+            rows = rng.choice(df.index, size=int(rng.integers(0, 60)), replace=repeat)
+            return sorted(rows.tolist())
+        
+        validation_issues = {
+            'missing_values': [{'field': field, 'rows': random_rows()} for field in ['VIN', 'Price', 'Odometer']],
+            'data_type_issues': [{'field': 'Year', 'rows': random_rows()}],
+            'price_below_cost': random_rows(),
+            'column_name_issues': [],
+            'special_character_issues': [{'field': 'Class', 'rows': random_rows()}],
+            'duplicate_issues': [{'field': 'VIN', 'check': 'within_file', 'rows': random_rows()}]
+        }
+        
+        marked = UploadHandler().mark_records_with_issues(df, validation_issues)
+        expected = mark_row_by_row(df, validation_issues)
+        print(f"repeated rows: {repeat}, {int(marked['has_issues'].sum())} rows marked")
+        pd.testing.assert_frame_equal(marked, expected)
+    
+    # A row listed twice by one issue gets its message twice
+    marked = UploadHandler().mark_records_with_issues(df, {'missing_values': [{'field': 'VIN', 'rows': [1000, 1000]}]})
+    assert marked.loc[1000, 'issue_type'] == "Missing VIN; Missing VIN; "
+
+
+if __name__ == "__main__":
+    test_matches_row_by_row_marking()
+    test_generated_issues_with_repeated_rows()
+    print("All issue marking tests passed")
@@ -0,0 +1,54 @@
+"""
+Test Script for the Parse Cache
+
+This script checks that cached Excel reads return the same frame as a fresh
+read and that the cache stays within its size limit.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from inventory_processor import InventoryProcessor
+from parse_cache import ParseCache
+
+
+PROBLEMATIC_FILE = "../data/problematic_inventory/problematic_inventory.xlsx"
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_cache_hit_matches_fresh_read():
+    """A cache hit should return exactly what pd.read_excel returned."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        processor = InventoryProcessor(parse_cache=ParseCache(cache_dir))
+
+        for file_path in [PROBLEMATIC_FILE, CORRECT_FILE]:
+            fresh_df = pd.read_excel(file_path)
+            first_df, error = processor.read_inventory_file(file_path)
+            cached_df, cached_error = processor.read_inventory_file(file_path)
+
+            print(f"{file_path}: {len(os.listdir(cache_dir))} cache entries")
+            assert error is None and cached_error is None
+            pd.testing.assert_frame_equal(first_df, fresh_df)
+            pd.testing.assert_frame_equal(cached_df, fresh_df)
+
+        assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cache_eviction():
+    """Least recently used entries should be evicted once the size limit is exceeded."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParseCache(cache_dir, max_bytes=1)
+        df = pd.read_excel(CORRECT_FILE)
+
+        cache.put("first", df)
+        cache.put("second", df)
+
+        # Nothing fits in one byte, so every entry is evicted
+        assert cache.get("first") is None
+        assert cache.get("second") is None
+
+
+if __name__ == "__main__":
+    test_cache_hit_matches_fresh_read()
+    test_cache_eviction()
+    print("All parse cache tests passed")
@@ -0,0 +1,60 @@
+"""
+Test Script for Plan Margins
+
+This script checks the rate class assignment and the cost/retail margin join
+for the sample inventory.
+"""
+
+import pandas as pd
+from inventory_processor import InventoryProcessor
+from plan_margins import PlanMarginCalculator
+
+
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_assign_rate_classes():
+    """Vehicles should get the Vehicle Index class for their model, drive and fuel."""
+    calculator = PlanMarginCalculator.from_json()
+    df = pd.DataFrame({
+        'Make': ['Ford', 'Ford', 'Jeep', 'BMW', 'Ford', 'Tesla'],
+        'Model': ['Escape', 'Escape', 'Grand Cherokee L', 'X3', 'F-250', 'Model 3'],
+        'Drivetrain Type': ['FWD', 'AWD', '4WD', 'AWD', '4WD', 'RWD'],
+        'Engine': ['1.5L EcoBoost', '1.5L EcoBoost', '3.6L V6', '2.0L I4', '6.7L Power Stroke V8 Turbo Diesel', '']
+    })
+    
+    classes = calculator.assign_rate_classes(df)
+    print(classes.tolist())
+    assert classes.tolist()[:5] == ['C', 'D', 'E', 'J', 'G']
+    assert pd.isna(classes.iloc[5])
+
+
+def test_calculate_margins():
+    """Each eligible plan should carry the cost and retail prices of both books."""
+    calculator = PlanMarginCalculator.from_json()
+    df, _ = InventoryProcessor().process_inventory(CORRECT_FILE)
+    
+    margins = calculator.calculate_margins(df, as_of_year=2025)
+    print(f"{len(margins)} eligible plans for {margins['record_index'].nunique()} vehicles")
+    assert not margins.empty
+    assert (margins['margin'] == margins['retail'] - margins['cost']).all()
+    
+    # Coverage must extend past the vehicle's age and odometer
+    vehicles = df.loc[margins['record_index']]
+    assert (margins['miles'].values > vehicles['Odometer'].values).all()
+    assert (margins['term_months'].values > (2025 - vehicles['Year'].values) * 12).all()
+    
+    # Lincoln plans are only offered on Lincoln vehicles
+    lincoln_plans = margins[margins['plan'].str.endswith('Lincoln')]
+    assert (df.loc[lincoln_plans['record_index'], 'Make'] == 'Lincoln').all()
+    
+    # Spot check one vehicle against the books
+    row = margins[(margins['Stock #'] == '7700P') & (margins['term_months'] == 96) &
+                  (margins['miles'] == 125000) & margins['plan'].str.contains('BaseCARE')].iloc[0]
+    assert (row['rate_class'], row['cost'], row['retail']) == ('C', 1980, 3130)
+
+
+if __name__ == "__main__":
+    test_assign_rate_classes()
+    test_calculate_margins()
+    print("All plan margin tests passed")
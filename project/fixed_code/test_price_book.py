@@ -0,0 +1,60 @@
+"""
+Test Script for Price Book Parsing
+
+This script checks the rate and option tables extracted from the Cost Book
+JSON export against values printed in the book.
+"""
+
+from price_book import PriceBook, parse_price_book_pages, COST_BOOK_PATH
+
+
+LEASE_FORD = "LeaseCARE – Ford and Competitive-Make"
+POWERTRAIN = "New Plans – PowertrainCARE Gas/Hybrid/Diesel"
+
+
+def test_lease_rates_and_options():
+    """LeaseCARE rates and option deltas should match the printed grid."""
+    book = PriceBook.from_json(COST_BOOK_PATH)
+    
+    print(f"Parsed {len(book.rates)} rates and {len(book.options)} options for {len(book.plans)} plans")
+    assert book.lookup(LEASE_FORD, 24, 15000) == 170
+    assert book.lookup(LEASE_FORD, 24, 15000, deductible=0) == 170
+    assert book.lookup(LEASE_FORD, 48, 60000) == 775
+    assert book.lookup(LEASE_FORD, 24, 22500) is None
+    assert book.lookup("LeaseCARE – Lincoln", 36, 60000) == 730
+    
+    assert book.option_delta(LEASE_FORD, "First-Day Rental Delete (-)", miles=50000) == -15
+    assert book.option_delta(LEASE_FORD, "Ford and Competitive-Make Pickup/Delivery* (+)", miles=60000) == 470
+    assert book.option_delta("LeaseCARE – Lincoln", "Key Services Delete (-)", term_months=48) == -60
+
+
+def test_rate_class_grid():
+    """Rate class grids should be keyed by term, miles, deductible and class."""
+    book = PriceBook.from_json(COST_BOOK_PATH)
+    
+    assert book.lookup(POWERTRAIN, 36, 75000, rate_class='A') == 665
+    assert book.lookup(POWERTRAIN, 72, 36000, rate_class='J') == 995
+    assert book.lookup(POWERTRAIN, 120, 175000, deductible=100, rate_class='A') is not None
+    assert book.lookup(POWERTRAIN, 36, 36000, rate_class='A') is None
+    
+    terms = sorted(book.rates.loc[book.rates['plan'] == POWERTRAIN, 'term_months'].unique())
+    assert terms == [36, 48, 60, 72, 84, 96, 108, 120]
+
+
+def test_scrambled_grid_is_skipped():
+    """Cells that appear before their labels should not produce rates."""
+    pages = [{'page': 1, 'content': (
+        "LeaseCARE – Lincoln Vehicles Prices based on $0 Deductible 15,000 Miles 24,000 Miles "
+        "170 • 195 24-Month Plan 27-Month Plan"
+    )}]
+    
+    rates, options = parse_price_book_pages(pages)
+    assert rates.empty
+    assert options.empty
+
+
+if __name__ == "__main__":
+    test_lease_rates_and_options()
+    test_rate_class_grid()
+    test_scrambled_grid_is_skipped()
+    print("All price book tests passed")
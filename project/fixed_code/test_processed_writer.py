@@ -0,0 +1,102 @@
+"""
+Test Script for the Processed Writer
+
+This script checks that chunked CSV and streamed Excel output hold the same
+data as the whole-frame writers, and that streaming uploads save the
+processed file in the configured format.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from inventory_generator import generate_inventory
+from processed_writer import ProcessedWriter, write_processed
+from upload_handler import UploadHandler
+
+
+def test_chunked_output_matches_whole_frame():
+    """Chunk-by-chunk CSV and xlsx_stream output should match the whole-frame files."""
+    df = generate_inventory(1200, seed=4, missing_rate=0.05)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        whole_csv = os.path.join(temp_dir, "whole.csv")
+        df.to_csv(whole_csv, index=False)
+        chunked_csv = os.path.join(temp_dir, "chunked.csv")
+        with ProcessedWriter(chunked_csv) as writer:
+            for start in range(0, len(df), 500):
+                writer.write(df.iloc[start:start + 500])
+        with open(whole_csv, 'rb') as f1, open(chunked_csv, 'rb') as f2:
+            assert f1.read() == f2.read()
+        
+        whole_xlsx = os.path.join(temp_dir, "whole.xlsx")
+        write_processed(df, whole_xlsx)
+        streamed_xlsx = os.path.join(temp_dir, "streamed.xlsx")
+        with ProcessedWriter(streamed_xlsx, 'xlsx_stream') as writer:
+            for start in range(0, len(df), 500):
+                writer.write(df.iloc[start:start + 500])
+        
+        expected = pd.read_excel(whole_xlsx)
+        streamed = pd.read_excel(streamed_xlsx)
+        print(f"{len(streamed)} rows streamed to xlsx")
+        pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_streaming_upload_saves_configured_format():
+    """A chunked upload with processed_format 'xlsx' should save one streamed workbook."""
+    handler = UploadHandler()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(900, seed=6).to_csv(file_path, index=False)
+        
+        config = {'skip_records_with_issues': True, 'save_results': False,
+                  'chunk_size': 400, 'processed_format': 'xlsx'}
+        results = handler.handle_upload_process(file_path, temp_dir, config)
+        
+        processed = pd.read_excel(os.path.join(temp_dir, "processed_inventory.xlsx"))
+        print(f"{len(processed)} processed rows saved, save stage rows: {results['metrics']['save']['rows']}")
+        assert len(processed) == results['records_processed'] == 900
+        assert not os.path.exists(os.path.join(temp_dir, "processed_inventory.csv"))
+        
+        # Without pyarrow the columnar formats are skipped with a logged error
+        config['processed_format'] = 'parquet'
+        results = handler.handle_upload_process(file_path, os.path.join(temp_dir, "parquet"), config)
+        assert results['success']
+
+
+
+def test_streamed_compact_parquet_keeps_values():
+    """Compact chunks with different dtypes should be saved to Parquet without losing cents."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        df = generate_inventory(1200, seed=8)
+        # Whole-dollar prices fit float32 in the first chunk; cents in a later chunk do not
+        df.loc[600, 'Price'] = 23456.78
+        df.to_csv(file_path, index=False)
+        
+        processor = UploadHandler(compact_dtypes=True).processor
+        price_dtypes = [str(processor.validator.convert_data_types(chunk, compact=True)['Price'].dtype)
+                        for chunk in processor.iter_inventory_chunks(file_path, 400)]
+        assert price_dtypes == ['float32', 'float64', 'float32']
+        
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("pyarrow unavailable: compact Parquet output not checked")
+            return
+        
+        config = {'skip_records_with_issues': False, 'save_results': False,
+                  'chunk_size': 400, 'processed_format': 'parquet'}
+        UploadHandler().handle_upload_process(file_path, os.path.join(temp_dir, "default"), config)
+        UploadHandler(compact_dtypes=True).handle_upload_process(file_path, os.path.join(temp_dir, "compact"), config)
+        
+        expected = pd.read_parquet(os.path.join(temp_dir, "default", "processed_inventory.parquet"))
+        compact = pd.read_parquet(os.path.join(temp_dir, "compact", "processed_inventory.parquet"))
+        assert compact.loc[600, 'Price'] == 23456.78
+        pd.testing.assert_frame_equal(compact, expected)
+
+if __name__ == "__main__":
+    test_chunked_output_matches_whole_frame()
+    test_streaming_upload_saves_configured_format()
+    test_streamed_compact_parquet_keeps_values()
+    print("All processed writer tests passed")
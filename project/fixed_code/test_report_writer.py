@@ -0,0 +1,57 @@
+"""
+Test Script for the Report Writer
+
+This script checks row range compression and that size-bounded summary reports
+keep the complete row sets in their sidecar file.
+"""
+
+import os
+import tempfile
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from report_writer import row_ranges, format_row_ranges, load_row_sidecar, sidecar_path_for
+
+
+def test_row_ranges():
+    """Consecutive rows should collapse into ranges and the cap should count ranges."""
+    rows = [9, 0, 1, 2, 5, 10, 11, 2, 20]
+    assert row_ranges(rows).tolist() == [[0, 2], [5, 5], [9, 11], [20, 20]]
+    assert format_row_ranges(rows, 10) == "0-2, 5, 9-11, 20"
+    assert format_row_ranges(rows, 2, 'rows.npz') == "0-2, 5, ... 2 more ranges in rows.npz"
+    assert row_ranges([]).shape == (0, 2)
+
+
+def test_bounded_report_with_sidecar():
+    """The capped report should stay small and the sidecar should hold every row."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(5000, seed=8, missing_rate=0.2, bad_type_rate=0.1).to_csv(file_path, index=False)
+        
+        _, full_results = InventoryProcessor().process_inventory(file_path)
+        processor = InventoryProcessor(report_max_ranges=5)
+        _, results = processor.process_inventory(file_path)
+        assert 'validation_report' not in results
+        
+        full_path = os.path.join(temp_dir, "full_summary.md")
+        bounded_path = os.path.join(temp_dir, "summary.md")
+        InventoryProcessor().generate_summary_report(full_results, full_path)
+        assert processor.generate_summary_report(results, bounded_path)
+        
+        with open(bounded_path) as f:
+            report = f.read()
+        sidecar = load_row_sidecar(sidecar_path_for(bounded_path))
+        full_size, bounded_size = os.path.getsize(full_path), os.path.getsize(bounded_path)
+    
+    print(f"Full report {full_size} bytes, bounded report {bounded_size} bytes")
+    assert bounded_size < full_size / 10
+    assert "more ranges in summary_rows.npz" in report
+    
+    for issue in results['validation_issues']['missing_values']:
+        assert sidecar[f"missing_values/{issue['field']}"].tolist() == sorted(issue['rows'])
+    assert sidecar['price_below_cost'].tolist() == sorted(results['validation_issues']['price_below_cost'])
+
+
+if __name__ == "__main__":
+    test_row_ranges()
+    test_bounded_report_with_sidecar()
+    print("All report writer tests passed")
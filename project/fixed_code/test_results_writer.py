@@ -0,0 +1,77 @@
+"""
+Test Script for the Results Writer
+
+This script checks that the fast JSON writer produces the same text as
+json.dump with the custom encoder and that NDJSON results hold every row.
+"""
+
+import io
+import os
+import json
+import tempfile
+import numpy as np
+from inventory_generator import generate_inventory
+from issue_store import RowSet
+from results_writer import write_json, write_ndjson, join_integers
+from upload_handler import UploadHandler, JSONEncoder
+
+
+def test_json_matches_json_dump():
+    """The fast writer should produce exactly the json.dump text."""
+    results = {
+        'success': True,
+        'error_message': None,
+        'records': np.int64(12),
+        'ratio': np.float32(0.5),
+        'flag': np.bool_(False),
+        'validation_issues': {
+            'missing_values': [{'field': 'VIN', 'count': np.int64(3), 'rows': RowSet(np.array([0, 9, 10]))}],
+            'price_below_cost': RowSet(),
+            'column_name_issues': ['Drivetrain\nType'],
+            'special_character_issues': [{'field': 'Class', 'rows': RowSet(np.array(['a', 'b'], dtype=object))}]
+        },
+        'empty': {},
+        'nested': [[1, 2], [], {'ü': 'Ünïcode'}],
+        'values': np.array([[1.5, 2.0]])
+    }
+    out = io.StringIO()
+    write_json(results, out)
+    assert out.getvalue() == json.dumps(results, indent=2, cls=JSONEncoder)
+    
+    values = np.array([0, 7, 42, 1000, -5, 123456789012])
+    assert join_integers(values, ', ') == ', '.join(map(str, values.tolist()))
+
+
+def test_ndjson_results():
+    """NDJSON results should have a header line and one line per issue entry."""
+    handler = UploadHandler()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        generate_inventory(2000, seed=10, missing_rate=0.05).to_csv(file_path, index=False)
+        
+        config = {'skip_records_with_issues': True, 'save_processed_file': False, 'results_format': 'ndjson'}
+        results = handler.handle_upload_process(file_path, temp_dir, config)
+        with open(os.path.join(temp_dir, "upload_results.ndjson")) as f:
+            records = [json.loads(line) for line in f]
+    
+    header, issue_records = records[0], records[1:]
+    print(f"{len(issue_records)} issue records")
+    assert header['record'] == 'results'
+    assert header['records_processed'] == results['records_processed']
+    assert header['validation_issues']['price_below_cost'] == len(results['validation_issues']['price_below_cost'])
+    
+    for issue in results['validation_issues']['missing_values']:
+        record = next(r for r in issue_records if r['issue_type'] == 'missing_values' and r['field'] == issue['field'])
+        assert record['rows'] == issue['rows'] and record['count'] == issue['count']
+    
+    # The handler saves exactly what write_ndjson writes for the returned results
+    out = io.StringIO()
+    write_ndjson(results, out)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == records
+
+
+if __name__ == "__main__":
+    test_json_matches_json_dump()
+    test_ndjson_results()
+    print("All results writer tests passed")
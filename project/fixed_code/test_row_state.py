@@ -0,0 +1,97 @@
+"""
+Test Script for Incremental Processing
+
+This script checks that processing a re-export against the stored row state
+gives the same results as processing every row.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from row_state import RowStateStore
+
+
+def test_reexport_matches_full_processing():
+    """Only new and changed rows should be revalidated, with unchanged results."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        export = generate_inventory(2000, seed=4, missing_rate=0.02, bad_type_rate=0.02)
+        export.to_csv(file_path, index=False)
+
+        processor = InventoryProcessor(state_store=RowStateStore(os.path.join(temp_dir, "state")))
+        _, first_results = processor.process_inventory(file_path)
+        assert first_results['row_changes']['unchanged'] == 0
+
+        # Reprice 10 keyed vehicles, sell 5 and add 3
+        reexport = pd.read_csv(file_path)
+        keyed = reexport.index[reexport['VIN'].notna()]
+        reexport.loc[keyed[:10], 'Price'] = 'Call for price'
+        sold_vins = reexport.loc[keyed[10:15], 'VIN'].tolist()
+        reexport = reexport.drop(index=keyed[10:15])
+        arrivals = generate_inventory(3, seed=5, start=2000, missing_rate=0)
+        arrivals.columns = reexport.columns
+        pd.concat([arrivals, reexport], ignore_index=True).to_csv(file_path, index=False)
+
+        df, results = processor.process_inventory(file_path)
+        full_df, full_results = InventoryProcessor().process_inventory(file_path)
+
+    changes = results['row_changes']
+    print(changes)
+    unkeyed = int(full_df['VIN'].isna().sum())
+    assert (changes['new'], changes['changed'], changes['removed']) == (3 + unkeyed, 10, 5)
+    assert sorted(changes['removed_vins']) == sorted(sold_vins)
+    assert results['validation_issues'] == full_results['validation_issues']
+    assert results['validation_report'] == full_results['validation_report']
+    pd.testing.assert_frame_equal(df, full_df)
+
+
+def test_layout_change_processes_all_rows():
+    """A state saved for other columns should not be reused."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        export = generate_inventory(200, seed=6)
+        export.to_csv(file_path, index=False)
+
+        processor = InventoryProcessor(state_store=RowStateStore(os.path.join(temp_dir, "state")))
+        processor.process_inventory(file_path)
+        _, results = processor.process_inventory(file_path)
+        assert results['row_changes']['changed'] == 0 and results['row_changes']['unchanged'] > 0
+
+        export.drop(columns='Series').to_csv(file_path, index=False)
+        _, results = processor.process_inventory(file_path)
+
+    assert results['row_changes']['unchanged'] == 0
+    assert results['row_changes']['new'] == 200
+
+
+def test_feed_key_shares_state_across_file_names():
+    """Timestamped exports of one feed should reuse its state when given a feed key."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        export = generate_inventory(500, seed=7)
+        first_path = os.path.join(temp_dir, "rooftop-12-2025-05-16-0304.csv")
+        second_path = os.path.join(temp_dir, "rooftop-12-2025-05-17-0304.csv")
+        export.to_csv(first_path, index=False)
+        export.to_csv(second_path, index=False)
+
+        processor = InventoryProcessor(state_store=RowStateStore(os.path.join(temp_dir, "state")))
+        processor.process_inventory(first_path, feed_key='rooftop-12')
+        _, results = processor.process_inventory(second_path, feed_key='rooftop-12')
+        keyed_results = results['row_changes']
+
+        # Without a feed key each file name is its own feed
+        _, results = processor.process_inventory(first_path)
+        path_results = results['row_changes']
+
+    print(f"feed key: {keyed_results['unchanged']} unchanged, path: {path_results['new']} new")
+    assert keyed_results['new'] == int(export['VIN'].isna().sum())
+    assert keyed_results['changed'] == keyed_results['removed'] == 0
+    assert path_results['unchanged'] == 0
+
+
+if __name__ == "__main__":
+    test_reexport_matches_full_processing()
+    test_layout_change_processes_all_rows()
+    test_feed_key_shares_state_across_file_names()
+    print("All incremental processing tests passed")
@@ -0,0 +1,105 @@
+"""
+Test Script for Stage Metrics
+
+This script checks that processing and upload runs report wall time, CPU time,
+rows/sec and peak memory delta for every stage.
+"""
+
+import os
+import time
+import tempfile
+import threading
+import numpy as np
+from inventory_processor import InventoryProcessor
+from upload_handler import UploadHandler
+from stage_metrics import track_stage, format_stage_metrics
+
+
+PROBLEMATIC_FILE = "../data/problematic_inventory/problematic_inventory.xlsx"
+METRIC_KEYS = {'wall_seconds', 'cpu_seconds', 'rows', 'rows_per_second', 'peak_memory_delta_mb', 'runs'}
+
+
+def test_process_inventory_metrics():
+    """Every processing stage should be measured once over all records."""
+    _, results = InventoryProcessor().process_inventory(PROBLEMATIC_FILE)
+    metrics = results['metrics']
+
+    print(metrics)
+    assert list(metrics) == ['read', 'validate', 'convert', 'report']
+    for stage in metrics.values():
+        assert set(stage) == METRIC_KEYS
+        assert stage['rows'] == results['records_processed']
+        assert stage['runs'] == 1
+        assert stage['wall_seconds'] >= 0 and stage['peak_memory_delta_mb'] >= 0
+
+
+def test_upload_metrics_in_summary():
+    """Streamed uploads should accumulate chunk metrics and list them in the summary report."""
+    handler = UploadHandler()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        results = handler.handle_upload_process(PROBLEMATIC_FILE, output_dir, {
+            'skip_records_with_issues': True,
+            'save_processed_file': True,
+            'save_results': True,
+            'chunk_size': 2
+        })
+        with open(os.path.join(output_dir, 'upload_summary.md')) as f:
+            summary = f.read()
+
+    metrics = results['metrics']
+    assert list(metrics) == ['read', 'validate', 'convert', 'mark', 'format', 'save', 'upload', 'report']
+    assert metrics['upload']['rows'] == results['records_processed']
+    assert metrics['upload']['runs'] > 1
+    assert "## Stage Metrics" in summary
+    assert "| upload |" in summary
+
+
+def test_peak_memory_delta_after_warm_up():
+    """A stage should report the memory it allocates even below the process's earlier peak."""
+    def allocate(megabytes):
+        values = np.ones(megabytes * 1024 ** 2 // 8)
+        time.sleep(0.05)
+        return values.sum()
+
+    metrics = {}
+    with track_stage(metrics, 'warm_up'):
+        allocate(300)
+    with track_stage(metrics, 'stage'):
+        allocate(100)
+
+    print(metrics)
+    assert metrics['warm_up']['peak_memory_delta_mb'] >= 250
+    assert 80 <= metrics['stage']['peak_memory_delta_mb'] < 250
+
+
+def test_repeated_stage_keeps_highest_peak():
+    """A stage run once per chunk should report its highest peak, sampled by one shared thread."""
+    def allocate(megabytes):
+        values = np.ones(megabytes * 1024 ** 2 // 8)
+        time.sleep(0.02)
+        return values.sum()
+
+    metrics = {}
+    samplers = set()
+    for _ in range(10):
+        with track_stage(metrics, 'chunk'):
+            allocate(50)
+            samplers.update(thread.ident for thread in threading.enumerate() if thread.name == 'stage-memory-sampler')
+
+    print(metrics)
+    assert metrics['chunk']['runs'] == 10
+    assert 40 <= metrics['chunk']['peak_memory_delta_mb'] < 100
+    assert len(samplers) == 1
+
+    report = format_stage_metrics({'first': {**metrics['chunk'], 'peak_memory_delta_mb': 30.0},
+                                   'second': {**metrics['chunk'], 'peak_memory_delta_mb': 50.0}})
+    assert report.rstrip().endswith("| 50.0 |")
+
+
+if __name__ == "__main__":
+    test_process_inventory_metrics()
+    test_upload_metrics_in_summary()
+    test_peak_memory_delta_after_warm_up()
+    test_repeated_stage_keeps_highest_peak()
+    print("All stage metrics tests passed")
@@ -0,0 +1,131 @@
+"""
+Test Script for Streaming Inventory Processing
+
+This script checks that chunked processing produces the same validation
+results as processing the whole file at once.
+"""
+
+import os
+import tempfile
+import json
+import warnings
+import numpy as np
+import pandas as pd
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from upload_handler import UploadHandler
+
+
+PROBLEMATIC_FILE = "../data/problematic_inventory/problematic_inventory.xlsx"
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_stream_matches_whole_file():
+    """Streamed chunks should report the same issues and rows as a whole-file run."""
+    processor = InventoryProcessor()
+
+    for file_path in [PROBLEMATIC_FILE, CORRECT_FILE]:
+        df, results = processor.process_inventory(file_path)
+        chunks, stream_results = processor.process_inventory_stream(file_path, chunk_size=2)
+        streamed_df = pd.concat([chunk for chunk, _ in chunks])
+
+        print(f"{file_path}: {len(df)} rows, {stream_results['records_with_issues']} with issues")
+        assert stream_results['success']
+        assert stream_results['records_processed'] == results['records_processed']
+        assert stream_results['records_with_issues'] == results['records_with_issues']
+        assert stream_results['validation_passed'] == results['validation_passed']
+        assert stream_results['validation_report'] == results['validation_report']
+        assert list(streamed_df.index) == list(df.index)
+        assert list(streamed_df.columns) == list(df.columns)
+
+
+def test_stream_csv_upload():
+    """Streaming upload of a CSV file should upload the same records as a whole-file run."""
+    handler = UploadHandler()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "inventory.csv")
+        pd.read_excel(CORRECT_FILE).to_csv(csv_path, index=False)
+
+        config = {'skip_records_with_issues': True, 'save_processed_file': True, 'save_results': False}
+        whole_results = handler.handle_upload_process(csv_path, os.path.join(temp_dir, "whole"), config)
+        stream_results = handler.handle_upload_process(
+            csv_path, os.path.join(temp_dir, "stream"), {**config, 'chunk_size': 4}
+        )
+
+        print(f"Records uploaded: {whole_results['records_uploaded']} (whole) / {stream_results['records_uploaded']} (stream)")
+        assert stream_results['records_uploaded'] == whole_results['records_uploaded']
+
+        processed = pd.read_csv(os.path.join(temp_dir, "stream", "processed_inventory.csv"))
+        assert len(processed) == whole_results['records_processed']
+
+
+def test_stream_empty_file():
+    """An empty file should fail in streaming mode just like in whole-file mode."""
+    processor = InventoryProcessor()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        empty_path = os.path.join(temp_dir, "empty.xlsx")
+        pd.DataFrame().to_excel(empty_path, index=False)
+
+        chunks, results = processor.process_inventory_stream(empty_path, chunk_size=10)
+        assert list(chunks) == []
+        assert not results['success']
+        assert results['error_message'] == "The inventory file is empty"
+
+
+def write_truncated_csv(file_path, rows, bad_line):
+    """Write a generated inventory CSV whose line bad_line has extra fields, so reading fails there."""
+    generate_inventory(rows, seed=5).to_csv(file_path, index=False)
+    with open(file_path) as f:
+        lines = f.read().splitlines()
+    lines[bad_line] += ',extra,fields'
+    with open(file_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def test_stream_read_failure_keeps_upload_counts():
+    """A file that fails to read partway should report and save the rows already uploaded."""
+    handler = UploadHandler()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        write_truncated_csv(file_path, 1000, 901)
+
+        output_dir = os.path.join(temp_dir, "out")
+        config = {'skip_records_with_issues': False, 'chunk_size': 400}
+        results = handler.handle_upload_process(file_path, output_dir, config)
+
+        print(f"{results['records_uploaded']} records uploaded before: {results['error_message']}")
+        assert not results['success'] and 'Error reading inventory file' in results['error_message']
+        assert results['records_processed'] == results['records_uploaded'] == 800
+        assert results['records_failed'] == 0
+
+        with open(os.path.join(output_dir, "upload_results.json")) as f:
+            saved = json.load(f)
+        assert not saved['success'] and saved['records_uploaded'] == 800
+
+
+def test_xlsx_chunks_without_future_warnings():
+    """Building xlsx chunks, including an empty column, should not rely on deprecated downcasting."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.xlsx")
+        df = generate_inventory(300, seed=9, missing_rate=0.1)
+        df['Notes'] = np.nan
+        df.to_excel(file_path, index=False)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            chunks = list(InventoryProcessor().iter_inventory_chunks(file_path, 100))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100]
+    assert all(chunk['Notes'].dtype == np.float64 for chunk in chunks)
+
+
+if __name__ == "__main__":
+    test_stream_matches_whole_file()
+    test_stream_csv_upload()
+    test_stream_empty_file()
+    test_stream_read_failure_keeps_upload_counts()
+    test_xlsx_chunks_without_future_warnings()
+    print("All streaming tests passed")
@@ -0,0 +1,39 @@
+"""
+Test Script for the Text Sanitizer
+
+This script checks that the deduplicated special character checks give the
+same results as running the regular expressions on every row.
+"""
+
+import numpy as np
+import pandas as pd
+from inventory_generator import generate_inventory
+from text_sanitizer import contains_pattern, replace_pattern, SPECIAL_CHARACTER_PATTERN, UPLOAD_TEXT_PATTERN
+
+
+def test_matches_row_wise_regex_on_edge_cases():
+    """Missing values, numbers, unicode and whitespace variants should match the row-wise regex."""
+    values = pd.Series(['SUV', 'Truck/Van', 'Café', 'x\ty', 'Sedan,4dr', 'Ω!', np.nan, None, 1, 1.0, True, 'a_b-c.d', ''] * 3, dtype=object)
+    
+    expected_flags = values.str.contains(SPECIAL_CHARACTER_PATTERN, regex=True, na=False).to_numpy()
+    assert (contains_pattern(values, SPECIAL_CHARACTER_PATTERN) == expected_flags).all()
+    
+    expected_text = values.astype(str).str.replace(UPLOAD_TEXT_PATTERN, ' ', regex=True)
+    assert replace_pattern(values, UPLOAD_TEXT_PATTERN, ' ').equals(expected_text)
+
+
+def test_matches_row_wise_regex_on_inventory():
+    """Text columns of a generated inventory should be flagged and cleaned exactly as before."""
+    df = generate_inventory(5000, seed=11, missing_rate=0.1, bad_type_rate=0.1)
+    for column in ['Make', 'Model', 'Series', 'Class']:
+        flags = contains_pattern(df[column], SPECIAL_CHARACTER_PATTERN)
+        print(f"{column}: {int(flags.sum())} values with special characters")
+        assert (flags == df[column].str.contains(SPECIAL_CHARACTER_PATTERN, regex=True, na=False).to_numpy()).all()
+        assert replace_pattern(df[column], UPLOAD_TEXT_PATTERN, ' ').equals(
+            df[column].astype(str).str.replace(UPLOAD_TEXT_PATTERN, ' ', regex=True))
+
+
+if __name__ == "__main__":
+    test_matches_row_wise_regex_on_edge_cases()
+    test_matches_row_wise_regex_on_inventory()
+    print("All text sanitizer tests passed")
@@ -0,0 +1,217 @@
+"""
+Test Script for the Upload Transport
+
+This script uploads inventory data to the local stub upload server and checks
+batching, retries of transient errors and the per-batch record counts, for
+both the threaded and the asyncio transport.
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+import pandas as pd
+import upload_handler
+from inventory_generator import generate_inventory
+from stub_upload_server import StubUploadServer
+from test_streaming import write_truncated_csv
+from upload_handler import UploadHandler
+from upload_transport import UploadTransport, AsyncUploadTransport
+
+
+CORRECT_FILE = "../data/sample_inventory/correct_inventory.xlsx"
+
+
+def test_upload_in_batches():
+    """All clean records should reach the server in batches of the configured size."""
+    handler = UploadHandler()
+    df, _ = handler.prepare_for_upload(CORRECT_FILE)
+    
+    with StubUploadServer() as server:
+        results = handler.upload_inventory(df, {
+            'endpoint_url': server.endpoint_url,
+            'batch_size': 7,
+            'max_connections': 2
+        })
+        handler.close()
+    
+    clean_count = int((~df['has_issues']).sum())
+    print(f"Uploaded {results['records_uploaded']} records in {results['batches_sent']} batches")
+    assert results['success']
+    assert results['records_uploaded'] == clean_count
+    assert results['records_failed'] == 0
+    assert results['batches_sent'] == -(-clean_count // 7)
+    assert server.records_received == clean_count
+
+
+def test_transient_errors_are_retried():
+    """Batches answered with HTTP 503 should be retried until they are accepted."""
+    df = pd.DataFrame({'VIN': [f"VIN{i}" for i in range(10)], 'Price': range(10)})
+    
+    with StubUploadServer(fail_first_requests=2) as server:
+        transport = UploadTransport(server.endpoint_url, max_connections=1, retry_backoff=0.01)
+        results = transport.upload_dataframe(df, batch_size=5)
+        transport.close()
+    
+    assert results['records_uploaded'] == 10
+    assert results['batches_failed'] == 0
+    assert server.requests_received == 4
+
+
+def test_failed_batches_are_counted():
+    """Batches that keep failing should be counted as failed records."""
+    df = pd.DataFrame({'VIN': [f"VIN{i}" for i in range(10)], 'Price': range(10)})
+    
+    with StubUploadServer(fail_first_requests=100) as server:
+        transport = UploadTransport(server.endpoint_url, max_connections=2, max_retries=1, retry_backoff=0.01)
+        results = transport.upload_dataframe(df, batch_size=4)
+        transport.close()
+    
+    assert results['records_uploaded'] == 0
+    assert results['records_failed'] == 10
+    assert results['batches_failed'] == 3
+    assert results['error_message'].startswith("HTTP 503")
+
+
+def test_async_upload_with_backpressure():
+    """The asyncio transport should upload every record without queueing past its limit."""
+    df = pd.DataFrame({'VIN': [f"VIN{i}" for i in range(100)], 'Price': range(100)})
+    queued = {'produced': 0, 'max_ahead': 0}
+    
+    async def run(endpoint_url):
+        transport = AsyncUploadTransport(endpoint_url, max_in_flight=3, max_pending_batches=2, retry_backoff=0.01)
+        
+        async def batches():
+            for start in range(0, len(df), 5):
+                queued['produced'] += 1
+                queued['max_ahead'] = max(queued['max_ahead'], queued['produced'] - server.batches_received)
+                yield 5, '{"records": ' + df.iloc[start:start + 5].to_json(orient='records') + '}'
+        
+        try:
+            return await transport.upload_batches(batches())
+        finally:
+            await transport.close()
+    
+    with StubUploadServer(latency=0.01, fail_first_requests=1) as server:
+        results = asyncio.run(run(server.endpoint_url))
+    
+    print(f"Async upload: {results['records_uploaded']} records, at most {queued['max_ahead']} batches ahead")
+    assert results['records_uploaded'] == 100
+    assert results['batches_failed'] == 0
+    # In flight plus queued plus the one being produced
+    assert queued['max_ahead'] <= 3 + 2 + 1
+
+
+def test_async_no_content_response():
+    """HTTP 204 on a keep-alive connection should count as accepted without waiting for the timeout."""
+    df = pd.DataFrame({'VIN': [f"VIN{i}" for i in range(10)], 'Price': range(10)})
+    
+    async def run(endpoint_url):
+        transport = AsyncUploadTransport(endpoint_url, max_in_flight=1, max_retries=1, timeout=2)
+        try:
+            return await transport.upload_dataframe(df, batch_size=5)
+        finally:
+            await transport.close()
+    
+    with StubUploadServer(accept_status=204) as server:
+        start = time.perf_counter()
+        results = asyncio.run(run(server.endpoint_url))
+        elapsed = time.perf_counter() - start
+    
+    print(f"204 responses: {results['records_uploaded']} records in {elapsed:.2f}s")
+    assert results['records_uploaded'] == 10
+    assert results['batches_failed'] == 0
+    # Each batch POSTed once, over one reused connection
+    assert server.requests_received == 2
+    assert elapsed < 1
+
+
+def test_async_handle_upload_process():
+    """The async process should upload the same records as the synchronous one."""
+    handler = UploadHandler()
+    
+    with tempfile.TemporaryDirectory() as temp_dir, StubUploadServer() as server:
+        config = {
+            'skip_records_with_issues': True,
+            'save_processed_file': False,
+            'save_results': True,
+            'endpoint_url': server.endpoint_url,
+            'batch_size': 4
+        }
+        sync_results = handler.handle_upload_process(CORRECT_FILE, os.path.join(temp_dir, "sync"), config)
+        async_results = asyncio.run(
+            handler.handle_upload_process_async(CORRECT_FILE, os.path.join(temp_dir, "async"), {**config, 'chunk_size': 10})
+        )
+        handler.close()
+        
+        assert os.path.exists(os.path.join(temp_dir, "async", "upload_results.json"))
+    
+    assert async_results['success']
+    assert async_results['records_uploaded'] == sync_results['records_uploaded']
+    assert server.records_received == 2 * sync_results['records_uploaded']
+
+
+def test_async_read_failure_keeps_upload_counts():
+    """A file that fails to read partway should report and save the records already sent."""
+    handler = UploadHandler()
+    
+    with tempfile.TemporaryDirectory() as temp_dir, StubUploadServer() as server:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        write_truncated_csv(file_path, 1000, 901)
+        
+        output_dir = os.path.join(temp_dir, "out")
+        config = {'skip_records_with_issues': False, 'save_processed_file': False,
+                  'endpoint_url': server.endpoint_url, 'chunk_size': 400}
+        results = asyncio.run(handler.handle_upload_process_async(file_path, output_dir, config))
+        handler.close()
+        
+        with open(os.path.join(output_dir, "upload_results.json")) as f:
+            saved = json.load(f)
+    
+    print(f"{results['records_uploaded']} records uploaded before: {results['error_message']}")
+    assert not results['success'] and 'Error reading inventory file' in results['error_message']
+    assert results['records_uploaded'] == server.records_received == 800
+    assert not saved['success'] and saved['records_uploaded'] == 800
+
+
+
+def test_async_transport_error_counts_produced_records():
+    """If the transport raises partway, the records of the batches produced so far should count as failed."""
+    class FailingTransport(AsyncUploadTransport):
+        async def upload_batches(self, batches):
+            sent = 0
+            async for _ in batches:
+                sent += 1
+                if sent == 3:
+                    raise RuntimeError("Transport failed")
+    
+    handler = UploadHandler()
+    create_async_transport = upload_handler.create_async_transport
+    upload_handler.create_async_transport = lambda upload_config: FailingTransport(upload_config['endpoint_url'])
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "inventory.csv")
+            generate_inventory(1000, seed=12).to_csv(file_path, index=False)
+            
+            config = {'skip_records_with_issues': False, 'save_processed_file': False, 'save_results': False,
+                      'endpoint_url': 'http://127.0.0.1:9/inventory', 'chunk_size': 400, 'batch_size': 100}
+            results = asyncio.run(handler.handle_upload_process_async(file_path, os.path.join(temp_dir, "out"), config))
+    finally:
+        upload_handler.create_async_transport = create_async_transport
+    
+    print(f"{results['records_failed']} records failed: {results['error_message']}")
+    assert not results['success'] and 'Transport failed' in results['error_message']
+    assert results['records_uploaded'] == 0
+    assert results['records_failed'] == 300
+
+if __name__ == "__main__":
+    test_upload_in_batches()
+    test_transient_errors_are_retried()
+    test_failed_batches_are_counted()
+    test_async_upload_with_backpressure()
+    test_async_no_content_response()
+    test_async_handle_upload_process()
+    test_async_read_failure_keeps_upload_counts()
+    test_async_transport_error_counts_produced_records()
+    print("All upload transport tests passed")
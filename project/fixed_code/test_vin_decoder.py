@@ -0,0 +1,81 @@
+"""
+Test Script for the VIN Decoder
+
+This script checks the vectorized VIN checks against a per-VIN reference and
+that VIN issues flow through validation, merging and the report.
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from data_validator import DataValidator
+from inventory_generator import generate_inventory
+from inventory_processor import InventoryProcessor
+from vin_decoder import check_digit, decode_wmi, decode_model_year, vin_issue_flags
+
+
+def with_check_digit(vin: str) -> str:
+    """Replace position 9 of a VIN with its check digit."""
+    return vin[:8] + check_digit(vin) + vin[9:]
+
+
+def test_flags_match_per_vin_reference():
+    """Every check should agree with decoding each VIN on its own."""
+    assert check_digit('1HGCM82633A004352') == '3'
+    assert decode_wmi('1HG') == ('HONDA',) and decode_wmi('5N1') == ('NISSAN', 'INFINITI')
+    assert decode_model_year('3') == 2003 and decode_model_year('U') is None
+    
+    rng = np.random.default_rng(5)
+    vins = [with_check_digit(vin) if rng.random() < 0.5 else vin for vin in generate_inventory(2000, seed=5)['VIN'].dropna()]
+    vins += ['1HGCM82633A004352', '1HGCM8263OA004352', 'SHORT', '1HGCM82633A0043521', 'ÄHGCM82633A004352', 12345, np.nan]
+    makes = pd.Series(['Honda', 'Ford'] * (len(vins) // 2) + ['Honda'] * (len(vins) % 2))
+    years = pd.Series(rng.integers(2000, 2026, len(vins)))
+    flags = vin_issue_flags(pd.Series(vins, dtype=object), makes, years)
+    
+    for row, vin in enumerate(vins):
+        if not isinstance(vin, str):
+            assert flags['length'][row] == (vin == vin)
+            continue
+        well_formed = len(vin) == 17 and all(char in '0123456789ABCDEFGHJKLMNPRSTUVWXYZ' for char in vin)
+        assert flags['length'][row] == (len(vin) != 17)
+        assert flags['check_digit'][row] == (well_formed and check_digit(vin) != vin[8])
+        wmi_makes = decode_wmi(vin[:3])
+        assert flags['make'][row] == (well_formed and bool(wmi_makes) and makes[row].upper() not in wmi_makes)
+        first_year = decode_model_year(vin[9]) if well_formed else None
+        assert flags['model_year'][row] == (first_year is not None and (years[row] - first_year) % 30 != 0)
+    print({check: int(mask.sum()) for check, mask in flags.items()})
+
+
+def test_vin_issues_in_processing():
+    """VIN issues should be reported, merged across chunks and left out unless enabled."""
+    df = generate_inventory(3000, seed=12)
+    valid = df['VIN'].notnull()
+    df.loc[valid, 'VIN'] = [with_check_digit(vin) for vin in df.loc[valid, 'VIN']]
+    df.loc[0, 'VIN'] = '1HGCM82633A004352'
+    df.loc[1, 'VIN'] = '1HGCM82633A00435'
+    
+    validator = DataValidator(vin_checks=True)
+    cleaned = validator.clean_column_names(df)
+    _, issues = validator.validate_data(cleaned)
+    checks = {issue['check']: issue['rows'] for issue in issues['vin_issues']}
+    assert 1 in checks['length'] and 'check_digit' not in checks
+    assert 'vin_issues' not in DataValidator().validate_data(cleaned)[1]
+    
+    merged = None
+    for start in range(0, len(cleaned), 1000):
+        merged = validator.merge_validation_issues(merged, validator.validate_data(cleaned.iloc[start:start + 1000])[1])
+    assert merged == issues
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "inventory.csv")
+        df.to_csv(file_path, index=False)
+        _, results = InventoryProcessor(vin_checks=True).process_inventory(file_path)
+    print(results['validation_report'].split("## VIN Issues")[1][:200])
+    assert "Field 'VIN' is not 17 characters long in 1 rows (rows: [1])" in results['validation_report']
+
+
+if __name__ == "__main__":
+    test_flags_match_per_vin_reference()
+    test_vin_issues_in_processing()
+    print("All VIN decoder tests passed")
@@ -0,0 +1,65 @@
+"""
+Text Sanitizer Module
+
+This module finds and cleans special characters in text columns. Inventory
+text columns repeat a small set of values (makes, models, body styles), so
+values are first reduced to their distinct strings with pd.factorize, each
+distinct string is matched or cleaned once with the same regular expression
+the row-wise code used, and the results are mapped back to the rows through
+the factorize codes. The output is identical to running the regex per row.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Characters that mark a Class value as having special characters
+SPECIAL_CHARACTER_PATTERN = r'[^a-zA-Z0-9\s,]'
+
+# Characters replaced with spaces in text columns before upload
+UPLOAD_TEXT_PATTERN = r'[^\w\s,.-]'
+
+
+def contains_pattern(values: pd.Series, pattern: str) -> np.ndarray:
+    """
+    Flag the values that contain a match of a regex.
+    
+    Same result as values.str.contains(pattern, regex=True, na=False).to_numpy().
+    
+    Args:
+        values: Text column (non-string values never match)
+        pattern: Regular expression
+    
+    Returns:
+        Boolean array, one entry per row
+    """
+    # Strings never compare equal to other types, so each string gets its own code
+    codes, uniques = pd.factorize(values)
+    unique_values = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    matched = unique_values.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+    
+    # Code -1 (missing) picks the trailing False
+    return np.append(matched, False)[codes]
+
+
+def replace_pattern(values: pd.Series, pattern: str, replacement: str) -> pd.Series:
+    """
+    Replace the matches of a regex in every value, as text.
+    
+    Same result as values.astype(str).str.replace(pattern, replacement, regex=True).
+    
+    Args:
+        values: Column to clean (converted to text first, like astype(str))
+        pattern: Regular expression
+        replacement: Replacement text
+    
+    Returns:
+        Cleaned text column with the index and name of values
+    """
+    # Factorize the text, not the raw values, so 1, 1.0 and True stay distinct
+    text = values.astype(str)
+    codes, uniques = pd.factorize(text)
+    if (codes < 0).any():
+        return text.str.replace(pattern, replacement, regex=True)
+    
+    cleaned = pd.Series(np.asarray(uniques, dtype=object), dtype=object).str.replace(pattern, replacement, regex=True)
+    return pd.Series(cleaned.to_numpy(dtype=object)[codes], index=values.index, name=values.name, dtype=object)
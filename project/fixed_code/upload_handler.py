@@ -10,21 +10,38 @@ import numpy as np
 import os
 import logging
 import json
-from typing import Dict, List, Tuple, Any, Optional
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Any, Optional, Iterator, Union
 from data_validator import DataValidator
-from inventory_processor import InventoryProcessor
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('upload_handler.log'),
-        logging.StreamHandler()
-    ]
+from inventory_processor import InventoryProcessor, DEFAULT_CHUNK_SIZE
+from issue_store import RowSet
+from log_config import configure_logging, flush_logging, worker_logging_setup
+from parse_cache import ParseCache
+from processed_writer import processed_file_name
+from results_writer import write_results, RESULTS_FILE_NAMES
+from row_state import RowStateStore
+from stage_metrics import track_stage, log_stage_metrics
+from text_sanitizer import replace_pattern, UPLOAD_TEXT_PATTERN
+from vin_decoder import VIN_CHECKS
+from duplicate_index import DuplicateIndex, DUPLICATE_CHECKS
+from upload_transport import (
+    UploadTransport, create_transport, create_async_transport, serialize_record_batch, DEFAULT_BATCH_SIZE
 )
+
+# Configure logging (the log file is only opened when the first record is written)
+configure_logging('upload_handler.log')
 logger = logging.getLogger('upload_handler')
 
+# File extensions picked up when a batch is given as a directory
+SUPPORTED_INVENTORY_EXTENSIONS = ['.xlsx', '.xls', '.csv', '.arrow', '.feather']
+
+# Per-file result fields copied into the batch summary
+BATCH_RESULT_FIELDS = [
+    'success', 'error_message', 'validation_passed', 'records_processed',
+    'records_with_issues', 'records_uploaded', 'records_failed'
+]
+
 
 class JSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle numpy types."""
@@ -39,6 +56,9 @@ class JSONEncoder(json.JSONEncoder):
             return bool(obj)
         elif isinstance(obj, np.ndarray):
             return obj.tolist()
+        elif isinstance(obj, RowSet):
+            # One array conversion instead of a default() call per row
+            return obj.tolist()
         return super(JSONEncoder, self).default(obj)
 
 
@@ -47,17 +67,67 @@ class UploadHandler:
     Class for handling the upload process of inventory data.
     """
     
-    def __init__(self):
-        """Initialize the upload handler with an inventory processor."""
-        self.processor = InventoryProcessor()
-        self.validator = DataValidator()
+    def __init__(self, parse_cache: Optional[ParseCache] = None, fused_parsing: bool = False,
+                 compact_dtypes: bool = False, state_store: Optional[RowStateStore] = None,
+                 report_max_ranges: Optional[int] = None, vin_checks: bool = False,
+                 duplicate_checks: bool = False, duplicate_index: Optional[DuplicateIndex] = None,
+                 memory_map: bool = False):
+        """
+        Initialize the upload handler with an inventory processor.
+        
+        Args:
+            parse_cache: Cache for parsed Excel files passed to the processor (optional)
+            fused_parsing: Parse each typed column only once during processing
+            compact_dtypes: Keep frames in categoricals and narrow numeric dtypes
+                through processing and formatting
+            state_store: Per-feed row state passed to the processor (optional), so
+                re-exports only validate and convert new and changed rows
+            report_max_ranges: Write size-bounded summary reports with at most this
+                many row ranges per issue and a sidecar file with the complete rows (optional)
+            vin_checks: Validate VINs and compare them with Make and Year during processing
+            duplicate_checks: Report VIN and Stock # values repeated within a file
+            duplicate_index: Index shared by all files (optional), so values already
+                listed by another file are reported too
+            memory_map: Memory-map CSV and Arrow input files; processes reading
+                the same uncompressed Arrow file then share its pages
+        """
+        self.processor = InventoryProcessor(parse_cache=parse_cache, fused_parsing=fused_parsing,
+                                            compact_dtypes=compact_dtypes, state_store=state_store,
+                                            report_max_ranges=report_max_ranges, vin_checks=vin_checks,
+                                            duplicate_checks=duplicate_checks, duplicate_index=duplicate_index,
+                                            memory_map=memory_map)
+        self.validator = DataValidator(vin_checks=vin_checks)
+        self.transport: Optional[UploadTransport] = None
     
-    def prepare_for_upload(self, file_path: str) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
+    def handler_options(self) -> Dict[str, Any]:
+        """
+        Return the keyword arguments that recreate this handler in another process.
+        
+        Returns:
+            Dictionary of UploadHandler constructor arguments
+        """
+        return {
+            'parse_cache': self.processor.parse_cache,
+            'fused_parsing': self.processor.fused_parsing,
+            'compact_dtypes': self.processor.compact_dtypes,
+            'state_store': self.processor.state_store,
+            'report_max_ranges': self.processor.report_max_ranges,
+            'vin_checks': self.processor.validator.vin_checks,
+            'duplicate_checks': self.processor.duplicate_checks,
+            'duplicate_index': self.processor.duplicate_index,
+            'memory_map': self.processor.memory_map
+        }
+    
+    def prepare_for_upload(self, file_path: str, copy: bool = True, feed_key: Optional[str] = None) -> Tuple[Optional[pd.DataFrame], Dict[str, Any]]:
         """
         Prepare inventory data for upload by processing and validating it.
         
         Args:
             file_path: Path to the inventory file
+            copy: Copy the frame at every stage (default). If False, every stage
+                modifies the frame read from the file in place; the result is the same
+            feed_key: Id of the feed the file was exported from (optional,
+                see InventoryProcessor.process_inventory)
             
         Returns:
             Tuple containing:
@@ -65,7 +135,7 @@ class UploadHandler:
                 - Dictionary with preparation results
         """
         # Process the inventory file
-        df, results = self.processor.process_inventory(file_path)
+        df, results = self.processor.process_inventory(file_path, copy=copy, feed_key=feed_key)
         
         # If processing failed, return the results
         if not results['success']:
@@ -73,68 +143,132 @@ class UploadHandler:
         
         # If validation failed, mark records with issues
         if not results['validation_passed']:
-            df = self.mark_records_with_issues(df, results['validation_issues'])
+            with track_stage(results['metrics'], 'mark', len(df)):
+                df = self.mark_records_with_issues(df, results['validation_issues'], copy=copy)
         
         # Prepare the data for upload
-        df = self.format_for_upload(df)
+        with track_stage(results['metrics'], 'format', len(df)):
+            df = self.format_for_upload(df, copy=copy, compact=self.processor.compact_dtypes)
         
         return df, results
     
-    def mark_records_with_issues(self, df: pd.DataFrame, validation_issues: Dict[str, List[Any]]) -> pd.DataFrame:
+    def prepare_for_upload_stream(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                  feed_key: Optional[str] = None) -> Tuple[Iterator[pd.DataFrame], Dict[str, Any]]:
+        """
+        Prepare inventory data for upload one chunk at a time.
+        
+        Every chunk is marked (even when it has no issues) so that all chunks
+        share the same columns. The results dict is only complete once the
+        iterator has been exhausted (see InventoryProcessor.process_inventory_stream).
+        
+        Args:
+            file_path: Path to the inventory file
+            chunk_size: Maximum number of rows per chunk
+            feed_key: Id of the feed the file was exported from (optional)
+            
+        Returns:
+            Tuple containing:
+                - Iterator of DataFrame chunks ready for upload
+                - Dictionary with preparation results
+        """
+        chunks, results = self.processor.process_inventory_stream(file_path, chunk_size, feed_key)
+        return self._prepare_chunks(chunks, results['metrics']), results
+    
+    def _prepare_chunks(self, chunks: Iterator[Tuple[pd.DataFrame, Dict[str, List[Any]]]],
+                        metrics: Dict[str, Dict[str, Any]]) -> Iterator[pd.DataFrame]:
+        """Mark and format each processed chunk for upload."""
+        for df, chunk_issues in chunks:
+            with track_stage(metrics, 'mark', len(df)):
+                df = self.mark_records_with_issues(df, chunk_issues)
+            with track_stage(metrics, 'format', len(df)):
+                df = self.format_for_upload(df, compact=self.processor.compact_dtypes)
+            yield df
+    
+    def mark_records_with_issues(self, df: pd.DataFrame, validation_issues: Dict[str, List[Any]], copy: bool = True) -> pd.DataFrame:
         """
         Mark records with validation issues for review.
         
+        Each issue entry becomes one count per row of how often it lists the
+        row, so a row listed twice gets the message twice. The has_issues flag
+        and the issue_type text are derived from the counts in a single pass,
+        and the text is built once per distinct combination of issues.
+        
         Args:
             df: DataFrame with inventory data
             validation_issues: Dictionary with validation issues
+            copy: Work on a copy of df (default). If False, df is modified in place
             
         Returns:
             DataFrame with marked records
         """
         # Create a copy to avoid modifying the original DataFrame
-        marked_df = df.copy()
+        marked_df = df.copy() if copy else df
         
-        # Add columns to indicate if the record has issues
-        marked_df['has_issues'] = False
-        marked_df['issue_type'] = ''  # Initialize as empty string
-        
-        # Mark records with missing values
+        # Collect (message, rows) pairs in the order the messages are appended
+        issue_entries = []
         for issue in validation_issues.get('missing_values', []):
-            for row in issue['rows']:
-                marked_df.loc[row, 'has_issues'] = True
-                marked_df.loc[row, 'issue_type'] = marked_df.loc[row, 'issue_type'] + f"Missing {issue['field']}; "
-        
-        # Mark records with data type issues
+            issue_entries.append((f"Missing {issue['field']}; ", issue['rows']))
         for issue in validation_issues.get('data_type_issues', []):
-            for row in issue['rows']:
-                marked_df.loc[row, 'has_issues'] = True
-                marked_df.loc[row, 'issue_type'] = marked_df.loc[row, 'issue_type'] + f"Invalid {issue['field']} format; "
-        
-        # Mark records with price below cost
-        for row in validation_issues.get('price_below_cost', []):
-            marked_df.loc[row, 'has_issues'] = True
-            marked_df.loc[row, 'issue_type'] = marked_df.loc[row, 'issue_type'] + "Price below cost; "
-        
-        # Mark records with special character issues
+            issue_entries.append((f"Invalid {issue['field']} format; ", issue['rows']))
+        if len(validation_issues.get('price_below_cost', [])) > 0:
+            issue_entries.append(("Price below cost; ", validation_issues['price_below_cost']))
         for issue in validation_issues.get('special_character_issues', []):
-            for row in issue['rows']:
-                marked_df.loc[row, 'has_issues'] = True
-                marked_df.loc[row, 'issue_type'] = marked_df.loc[row, 'issue_type'] + f"Special characters in {issue['field']}; "
+            issue_entries.append((f"Special characters in {issue['field']}; ", issue['rows']))
+        for issue in validation_issues.get('vin_issues', []):
+            issue_entries.append((f"{VIN_CHECKS[issue['check']][2]}; ", issue['rows']))
+        for issue in validation_issues.get('duplicate_issues', []):
+            issue_entries.append((DUPLICATE_CHECKS[issue['check']][1].format(field=issue['field']) + "; ", issue['rows']))
+        
+        if not issue_entries:
+            marked_df['has_issues'] = False
+            marked_df['issue_type'] = ''
+            return marked_df
+        
+        # How often each issue entry lists each row (rows x issues); get_indexer_for
+        # returns every position of a label, also when the index repeats it
+        issue_counts = np.column_stack([
+            np.bincount(positions[positions >= 0], minlength=len(marked_df))
+            for positions in (marked_df.index.get_indexer_for(np.asarray(rows)) for _, rows in issue_entries)
+        ])
+        
+        # Pack the counts into one bit-flag code per row so combinations can be
+        # deduplicated with a 1-D unique; fall back to row-wise unique for >63
+        # issues or rows listed more than once by an issue
+        if len(issue_entries) < 64 and issue_counts.max(initial=0) <= 1:
+            bit_values = np.left_shift(np.uint64(1), np.arange(len(issue_entries), dtype=np.uint64))
+            flags = np.bitwise_or.reduce(np.where(issue_counts > 0, bit_values, np.uint64(0)), axis=1)
+            unique_flags, combination_codes = np.unique(flags, return_inverse=True)
+            combinations = ((unique_flags[:, None] & bit_values) != 0).astype(np.int64)
+        else:
+            combinations, combination_codes = np.unique(issue_counts, axis=0, return_inverse=True)
+        
+        # Build the issue text once per distinct combination of issues
+        messages = [message for message, _ in issue_entries]
+        combination_text = np.array(
+            [''.join(message * count for message, count in zip(messages, combination)) for combination in combinations],
+            dtype=object
+        )
+        
+        marked_df['has_issues'] = issue_counts.any(axis=1)
+        marked_df['issue_type'] = combination_text[combination_codes.reshape(-1)]
         
         return marked_df
     
-    def format_for_upload(self, df: pd.DataFrame) -> pd.DataFrame:
+    def format_for_upload(self, df: pd.DataFrame, copy: bool = True, compact: bool = False) -> pd.DataFrame:
         """
         Format the DataFrame for upload by ensuring proper data types and structure.
         
         Args:
             df: DataFrame with inventory data
+            copy: Work on a copy of df (default). If False, df is modified in place
+            compact: Return the frame in compact dtypes (see DataValidator.compact_dtypes);
+                the formatted values are the same
             
         Returns:
             Formatted DataFrame ready for upload
         """
         # Create a copy to avoid modifying the original DataFrame
-        formatted_df = df.copy()
+        formatted_df = df.copy() if copy else df
         
         # Ensure all column names are clean (no newlines, consistent format)
         formatted_df.columns = [col.replace('\n', ' ') for col in formatted_df.columns]
@@ -142,7 +276,8 @@ class UploadHandler:
         # Convert numeric columns to appropriate types
         numeric_columns = ['Year', 'Odometer', 'Price', 'Unit Cost', 'J.D. Power Trade In', 'J.D. Power Retail Clean']
         for col in numeric_columns:
-            if col in formatted_df.columns:
+            # Columns already converted by the processor do not need parsing again
+            if col in formatted_df.columns and not pd.api.types.is_numeric_dtype(formatted_df[col]):
                 formatted_df[col] = pd.to_numeric(formatted_df[col], errors='coerce')
         
         # Ensure VIN is a string
@@ -153,8 +288,15 @@ class UploadHandler:
         text_columns = ['Make', 'Model', 'Series', 'Class', 'Engine', 'Body', 'Transmission']
         for col in text_columns:
             if col in formatted_df.columns:
-                # Replace any problematic characters with spaces
-                formatted_df[col] = formatted_df[col].astype(str).str.replace(r'[^\w\s,.-]', ' ', regex=True)
+                if isinstance(formatted_df[col].dtype, pd.CategoricalDtype):
+                    # Clean each category once instead of every row
+                    formatted_df[col] = _replace_category_text(formatted_df[col], UPLOAD_TEXT_PATTERN, ' ')
+                else:
+                    # Replace any problematic characters with spaces, once per distinct value
+                    formatted_df[col] = replace_pattern(formatted_df[col], UPLOAD_TEXT_PATTERN, ' ')
+        
+        if compact:
+            formatted_df = self.validator.compact_dtypes(formatted_df, copy=False)
         
         return formatted_df
     
@@ -162,8 +304,10 @@ class UploadHandler:
         """
         Upload the inventory data to the system.
         
-        Note: This is a placeholder method that would be implemented to interface
-        with the actual upload API or system. For now, it simulates the upload process.
+        If upload_config has an 'endpoint_url', records are POSTed in batches of
+        'batch_size' over up to 'max_connections' persistent connections, with
+        'max_retries' retries ('retry_backoff' seconds, doubling) for transient
+        errors. Without an endpoint the upload is simulated.
         
         Args:
             df: DataFrame with inventory data ready for upload
@@ -172,9 +316,6 @@ class UploadHandler:
         Returns:
             Dictionary with upload results
         """
-        # This is a placeholder for the actual upload implementation
-        # In a real system, this would connect to an API or database
-        
         results = {
             'success': False,
             'records_uploaded': 0,
@@ -184,26 +325,30 @@ class UploadHandler:
         
         try:
             # Filter out records with issues if specified in config
-            if upload_config.get('skip_records_with_issues', True):
-                if 'has_issues' in df.columns:
-                    clean_df = df[~df['has_issues']]
-                    skipped_count = len(df) - len(clean_df)
-                    logger.info(f"Skipped {skipped_count} records with issues")
-                else:
-                    clean_df = df
-            else:
-                clean_df = df
+            clean_df = self._filter_records_for_upload(df, upload_config)
             
-            # Simulate the upload process
-            # In a real implementation, this would call an API or database
             logger.info(f"Uploading {len(clean_df)} records...")
             
-            # Simulate successful upload
-            results['success'] = True
-            results['records_uploaded'] = int(len(clean_df))  # Convert to standard Python int
-            results['records_failed'] = 0
-            
-            logger.info(f"Successfully uploaded {len(clean_df)} records")
+            if upload_config.get('endpoint_url'):
+                # Send the records to the configured endpoint in batches
+                transport = self._get_transport(upload_config)
+                transport_results = transport.upload_dataframe(
+                    clean_df, upload_config.get('batch_size', DEFAULT_BATCH_SIZE)
+                )
+                results.update(transport_results)
+                results['success'] = transport_results['batches_failed'] == 0
+                
+                logger.info(
+                    f"Uploaded {results['records_uploaded']} records in {transport_results['batches_sent']} batches "
+                    f"({transport_results['batches_failed']} batches failed)"
+                )
+            else:
+                # Simulate successful upload when no endpoint is configured
+                results['success'] = True
+                results['records_uploaded'] = int(len(clean_df))  # Convert to standard Python int
+                results['records_failed'] = 0
+                
+                logger.info(f"Successfully uploaded {len(clean_df)} records")
             
         except Exception as e:
             error_msg = f"Error during upload: {str(e)}"
@@ -213,13 +358,205 @@ class UploadHandler:
         
         return results
     
-    def save_upload_results(self, results: Dict[str, Any], output_path: str) -> bool:
+    async def upload_inventory_async(self, df: pd.DataFrame, upload_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Upload the inventory data to the system with asyncio.
+        
+        Keeps up to 'max_connections' batches in flight and lets at most
+        'max_pending_batches' formatted batches wait for a free sender. Without an
+        'endpoint_url' this falls back to the simulated upload of upload_inventory.
+        
+        Args:
+            df: DataFrame with inventory data ready for upload
+            upload_config: Dictionary with upload configuration
+            
+        Returns:
+            Dictionary with upload results
+        """
+        if not upload_config.get('endpoint_url'):
+            return self.upload_inventory(df, upload_config)
+        
+        async def batches():
+            clean_df = self._filter_records_for_upload(df, upload_config)
+            logger.info(f"Uploading {len(clean_df)} records...")
+            batch_size = upload_config.get('batch_size', DEFAULT_BATCH_SIZE)
+            for start in range(0, len(clean_df), batch_size):
+                batch_df = clean_df.iloc[start:start + batch_size]
+                yield len(batch_df), await asyncio.to_thread(serialize_record_batch, batch_df)
+        
+        return await self._upload_batches_async(batches(), upload_config, len(df))
+    
+    async def handle_upload_process_async(self, file_path: str, output_dir: str, upload_config: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Handle the complete upload process with an asyncio upload stage.
+        
+        Processing runs in a worker thread so the event loop stays free for
+        uploads. With 'chunk_size' set, chunks are read only as fast as their
+        batches are acknowledged, so the file is never read far ahead of the upload.
+        Because the upload overlaps processing, 'metrics' has no separate upload stage.
+        
+        Args:
+            file_path: Path to the inventory file
+            output_dir: Directory to save output files
+            upload_config: Dictionary with upload configuration (optional),
+                see handle_upload_process and upload_inventory_async
+            
+        Returns:
+            Dictionary with process results
+        """
+        if upload_config is None:
+            upload_config = {
+                'skip_records_with_issues': True,
+                'save_processed_file': True,
+                'save_results': True
+            }
+        
+        # Without an endpoint there is nothing to overlap
+        if not upload_config.get('endpoint_url'):
+            return await asyncio.to_thread(self.handle_upload_process, file_path, output_dir, upload_config)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        if upload_config.get('chunk_size'):
+            chunks, prep_results = self.prepare_for_upload_stream(
+                file_path, upload_config['chunk_size'], upload_config.get('feed_key')
+            )
+        else:
+            df, prep_results = await asyncio.to_thread(
+                self.prepare_for_upload, file_path, not upload_config.get('copy_free', False),
+                upload_config.get('feed_key')
+            )
+            if df is None:
+                return prep_results
+            chunks = iter([df])
+        
+        if upload_config.get('save_processed_file', True):
+            output_format, processed_path = self._processed_output(
+                output_dir, upload_config, streaming=bool(upload_config.get('chunk_size'))
+            )
+            chunks = self.processor.save_processed_stream(chunks, processed_path, output_format, prep_results['metrics'])
+        
+        async def batches():
+            batch_size = upload_config.get('batch_size', DEFAULT_BATCH_SIZE)
+            while True:
+                # Producing the next chunk is CPU work; keep it off the event loop
+                df = await asyncio.to_thread(next, chunks, None)
+                if df is None:
+                    break
+                
+                clean_df = self._filter_records_for_upload(df, upload_config)
+                for start in range(0, len(clean_df), batch_size):
+                    batch_df = clean_df.iloc[start:start + batch_size]
+                    yield len(batch_df), await asyncio.to_thread(serialize_record_batch, batch_df)
+        
+        upload_results = await self._upload_batches_async(batches(), upload_config)
+        
+        # If preparation failed partway, keep the failure along with the counts of the batches already uploaded.
+        # A failed upload stops reading early, leaving preparation unfinished but without an error of its own
+        combined_results = {**prep_results, **upload_results}
+        if prep_results['error_message']:
+            combined_results['success'] = False
+            combined_results['error_message'] = prep_results['error_message']
+        log_stage_metrics(logger, prep_results['metrics'], file_path)
+        
+        if upload_config.get('save_results', True):
+            await asyncio.to_thread(self._save_process_outputs, combined_results, output_dir,
+                                    upload_config.get('results_format', 'json'))
+        
+        return combined_results
+    
+    async def _upload_batches_async(self, batches, upload_config: Dict[str, Any],
+                                    record_count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Send batches with an asyncio transport and build the upload results.
+        
+        If the transport raises, record_count records are reported as failed, or
+        without it the records of every batch produced so far.
+        """
+        produced = 0
+        
+        async def counted_batches():
+            nonlocal produced
+            async for batch_records, body in batches:
+                produced += batch_records
+                yield batch_records, body
+        
+        results = {
+            'success': False,
+            'records_uploaded': 0,
+            'records_failed': 0,
+            'error_message': None
+        }
+        
+        transport = create_async_transport(upload_config)
+        try:
+            transport_results = await transport.upload_batches(counted_batches())
+            results.update(transport_results)
+            results['success'] = transport_results['batches_failed'] == 0
+            
+            logger.info(
+                f"Uploaded {results['records_uploaded']} records in {transport_results['batches_sent']} batches "
+                f"({transport_results['batches_failed']} batches failed)"
+            )
+        except Exception as e:
+            error_msg = f"Error during upload: {str(e)}"
+            logger.error(error_msg)
+            results['error_message'] = error_msg
+            results['records_failed'] = produced if record_count is None else record_count
+        finally:
+            await transport.close()
+        
+        return results
+    
+    def _filter_records_for_upload(self, df: pd.DataFrame, upload_config: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Drop records with issues if the upload configuration asks for it.
+        
+        Args:
+            df: DataFrame with inventory data ready for upload
+            upload_config: Dictionary with upload configuration
+            
+        Returns:
+            DataFrame with the records to upload
+        """
+        if upload_config.get('skip_records_with_issues', True) and 'has_issues' in df.columns:
+            clean_df = df[~df['has_issues']]
+            skipped_count = len(df) - len(clean_df)
+            logger.info(f"Skipped {skipped_count} records with issues")
+            return clean_df
+        
+        return df
+    
+    def _get_transport(self, upload_config: Dict[str, Any]) -> UploadTransport:
+        """
+        Return the upload transport, reusing its connections while the endpoint is unchanged.
+        
+        Args:
+            upload_config: Dictionary with upload configuration including 'endpoint_url'
+            
+        Returns:
+            UploadTransport for the configured endpoint
+        """
+        if self.transport is None or self.transport.endpoint_url != upload_config['endpoint_url']:
+            self.close()
+            self.transport = create_transport(upload_config)
+        return self.transport
+    
+    def close(self) -> None:
+        """Close the upload transport's connections."""
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+    
+    def save_upload_results(self, results: Dict[str, Any], output_path: str, results_format: str = 'json') -> bool:
         """
         Save the upload results to a file.
         
         Args:
             results: Dictionary with upload results
             output_path: Path to save the results
+            results_format: 'json' (indented JSON, default) or 'ndjson' (one record
+                per line, see results_writer.write_ndjson)
             
         Returns:
             Boolean indicating if the save was successful
@@ -228,9 +565,9 @@ class UploadHandler:
             # Ensure the directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Save the results as JSON using the custom encoder
+            # Stream the results to the file; row arrays are rendered in one pass
             with open(output_path, 'w') as f:
-                json.dump(results, f, indent=2, cls=JSONEncoder)
+                write_results(results, f, results_format)
             
             logger.info(f"Successfully saved upload results to: {output_path}")
             return True
@@ -246,10 +583,21 @@ class UploadHandler:
         Args:
             file_path: Path to the inventory file
             output_dir: Directory to save output files
-            upload_config: Dictionary with upload configuration (optional)
+            upload_config: Dictionary with upload configuration (optional).
+                Set 'chunk_size' to process the file in streaming mode.
+                Set 'copy_free' to transform the inventory in place.
+                Set 'feed_key' to the id of the feed the file was exported from,
+                so differently named exports of one feed share their row state
+                and duplicate index keys.
+                Set 'results_format' to 'ndjson' to save the results as upload_results.ndjson.
+                Set 'processed_format' to one of processed_writer.PROCESSED_FORMATS
+                to choose the processed file format (default 'xlsx', or 'csv'
+                in streaming mode, where 'xlsx' is written as 'xlsx_stream').
             
         Returns:
-            Dictionary with process results
+            Dictionary with process results. 'metrics' holds the wall time, CPU
+            time, rows/sec and peak memory delta of every stage from reading the
+            file to the upload
         """
         # Set default upload configuration if not provided
         if upload_config is None:
@@ -262,31 +610,309 @@ class UploadHandler:
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
         
-        # Prepare the data for upload
-        df, prep_results = self.prepare_for_upload(file_path)
+        # Stream the file in fixed-size chunks if a chunk size is configured
+        if upload_config.get('chunk_size'):
+            return self._handle_upload_stream(file_path, output_dir, upload_config)
+        
+        # Prepare the data for upload, in place if copy-free mode is configured
+        df, prep_results = self.prepare_for_upload(file_path, copy=not upload_config.get('copy_free', False),
+                                                   feed_key=upload_config.get('feed_key'))
         
         # If preparation failed, return the results
         if df is None:
             return prep_results
         
+        metrics = prep_results['metrics']
+        
         # Save the processed file if specified
         if upload_config.get('save_processed_file', True):
-            processed_path = os.path.join(output_dir, 'processed_inventory.xlsx')
-            self.processor.save_processed_inventory(df, processed_path)
+            output_format, processed_path = self._processed_output(output_dir, upload_config)
+            with track_stage(metrics, 'save', len(df)):
+                self.processor.save_processed_inventory(df, processed_path, output_format=output_format)
         
         # Upload the data
-        upload_results = self.upload_inventory(df, upload_config)
+        with track_stage(metrics, 'upload', len(df)):
+            upload_results = self.upload_inventory(df, upload_config)
         
         # Combine preparation and upload results
         combined_results = {**prep_results, **upload_results}
+        log_stage_metrics(logger, metrics, file_path)
+        
+        # Save the results if specified
+        if upload_config.get('save_results', True):
+            self._save_process_outputs(combined_results, output_dir, upload_config.get('results_format', 'json'))
+        
+        flush_logging()
+        return combined_results
+    
+    def _handle_upload_stream(self, file_path: str, output_dir: str, upload_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle the upload process in streaming mode, one chunk at a time.
+        
+        The processed file is written incrementally: as CSV by default, or in
+        the configured 'processed_format', with Excel output streamed through
+        a write-only workbook instead of being held in memory as a whole.
+        
+        Args:
+            file_path: Path to the inventory file
+            output_dir: Directory to save output files
+            upload_config: Dictionary with upload configuration, including 'chunk_size'
+            
+        Returns:
+            Dictionary with process results
+        """
+        chunks, prep_results = self.prepare_for_upload_stream(
+            file_path, upload_config['chunk_size'], upload_config.get('feed_key')
+        )
+        
+        upload_results = {
+            'success': True,
+            'records_uploaded': 0,
+            'records_failed': 0,
+            'error_message': None
+        }
+        metrics = prep_results['metrics']
+        
+        # Save each processed chunk as it passes, if specified
+        if upload_config.get('save_processed_file', True):
+            output_format, processed_path = self._processed_output(output_dir, upload_config, streaming=True)
+            chunks = self.processor.save_processed_stream(chunks, processed_path, output_format, metrics)
+        
+        for df in chunks:
+            # Upload the chunk
+            with track_stage(metrics, 'upload', len(df)):
+                chunk_results = self.upload_inventory(df, upload_config)
+            upload_results['records_uploaded'] += chunk_results['records_uploaded']
+            upload_results['records_failed'] += chunk_results['records_failed']
+            for key in ['batches_sent', 'batches_failed']:
+                if key in chunk_results:
+                    upload_results[key] = upload_results.get(key, 0) + chunk_results[key]
+            if not chunk_results['success']:
+                upload_results['success'] = False
+                upload_results['error_message'] = chunk_results['error_message']
+        
+        # Combine preparation and upload results; if preparation failed partway,
+        # the failure is kept along with the counts of the chunks already uploaded
+        combined_results = {**prep_results, **upload_results}
+        if not prep_results['success']:
+            combined_results['success'] = False
+            combined_results['error_message'] = prep_results['error_message']
+        log_stage_metrics(logger, metrics, file_path)
         
         # Save the results if specified
         if upload_config.get('save_results', True):
-            results_path = os.path.join(output_dir, 'upload_results.json')
-            self.save_upload_results(combined_results, results_path)
+            self._save_process_outputs(combined_results, output_dir, upload_config.get('results_format', 'json'))
+        
+        flush_logging()
+        return combined_results
+    
+    def _processed_output(self, output_dir: str, upload_config: Dict[str, Any], streaming: bool = False) -> Tuple[str, str]:
+        """Return the format and path of the processed file configured for an upload."""
+        output_format = upload_config.get('processed_format', 'csv' if streaming else 'xlsx')
+        # Chunks can only be written to Excel through the streaming writer
+        if streaming and output_format == 'xlsx':
+            output_format = 'xlsx_stream'
+        return output_format, os.path.join(output_dir, processed_file_name(output_format))
+    
+    def _save_process_outputs(self, combined_results: Dict[str, Any], output_dir: str, results_format: str = 'json') -> None:
+        """Save the results file and the summary report to the output directory."""
+        results_path = os.path.join(output_dir, RESULTS_FILE_NAMES[results_format])
+        self.save_upload_results(combined_results, results_path, results_format)
+        
+        # Generate and save summary report
+        report_path = os.path.join(output_dir, 'upload_summary.md')
+        self.processor.generate_summary_report(combined_results, report_path)
+    
+    def handle_batch_upload(self, inputs: Union[str, List[str]], output_dir: str, upload_config: Dict[str, Any] = None, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run the upload process for many inventory files across a process pool.
+        
+        Each file is handled by handle_upload_process in a worker process and
+        writes its outputs to its own subdirectory of output_dir. A file that
+        fails or raises is recorded in the summary without stopping the batch.
+        
+        Args:
+            inputs: Directory containing inventory files, or a list of file paths
+            output_dir: Directory to save the per-file outputs and the batch summary
+            upload_config: Dictionary with upload configuration applied to every file (optional)
+            max_workers: Number of worker processes (defaults to the CPU count;
+                1 runs the files in this process)
             
-            # Generate and save summary report
-            report_path = os.path.join(output_dir, 'upload_summary.md')
-            self.processor.generate_summary_report(combined_results, report_path)
+        Returns:
+            Dictionary with the batch summary and per-file results
+        """
+        if isinstance(inputs, str):
+            file_paths = sorted(
+                os.path.join(inputs, name) for name in os.listdir(inputs)
+                if os.path.splitext(name)[1].lower() in SUPPORTED_INVENTORY_EXTENSIONS
+            )
+        else:
+            file_paths = list(inputs)
         
-        return combined_results
\ No newline at end of file
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Give every file its own output subdirectory, named after the file
+        file_output_dirs = {}
+        used_names = set()
+        for file_path in file_paths:
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            unique_name = name
+            suffix = 1
+            while unique_name in used_names:
+                suffix += 1
+                unique_name = f"{name}_{suffix}"
+            used_names.add(unique_name)
+            file_output_dirs[file_path] = os.path.join(output_dir, unique_name)
+        
+        handler_options = self.handler_options()
+        
+        logger.info(f"Starting batch upload of {len(file_paths)} files")
+        file_results = {}
+        
+        if max_workers == 1:
+            for file_path in file_paths:
+                file_results[file_path] = _run_file_upload(
+                    file_path, file_output_dirs[file_path], upload_config, handler_options
+                )
+        else:
+            # With queued logging the workers send their records to this process's log queue
+            initializer, initargs = worker_logging_setup()
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs) as executor:
+                futures = {
+                    executor.submit(_run_file_upload, file_path, file_output_dirs[file_path], upload_config, handler_options): file_path
+                    for file_path in file_paths
+                }
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    try:
+                        file_results[file_path] = future.result()
+                    except Exception as e:
+                        # The worker process itself failed (e.g. it was killed)
+                        error_msg = f"Worker failed while processing {file_path}: {str(e)}"
+                        logger.error(error_msg)
+                        file_results[file_path] = {'success': False, 'error_message': error_msg}
+        
+        batch_results = {
+            'total_files': len(file_paths),
+            'files_succeeded': 0,
+            'files_failed': 0,
+            'records_processed': 0,
+            'records_with_issues': 0,
+            'records_uploaded': 0,
+            'records_failed': 0,
+            'files': {}
+        }
+        
+        for file_path in file_paths:
+            results = file_results[file_path]
+            file_summary = {field: results.get(field) for field in BATCH_RESULT_FIELDS}
+            file_summary['output_dir'] = file_output_dirs[file_path]
+            batch_results['files'][file_path] = file_summary
+            
+            if results.get('success'):
+                batch_results['files_succeeded'] += 1
+            else:
+                batch_results['files_failed'] += 1
+            for field in ['records_processed', 'records_with_issues', 'records_uploaded', 'records_failed']:
+                batch_results[field] += int(results.get(field) or 0)
+        
+        batch_results['success'] = batch_results['files_failed'] == 0
+        
+        self.save_upload_results(batch_results, os.path.join(output_dir, 'batch_results.json'))
+        self.generate_batch_summary_report(batch_results, os.path.join(output_dir, 'batch_summary.md'))
+        
+        logger.info(
+            f"Batch upload finished: {batch_results['files_succeeded']} succeeded, "
+            f"{batch_results['files_failed']} failed"
+        )
+        flush_logging()
+        return batch_results
+    
+    def generate_batch_summary_report(self, batch_results: Dict[str, Any], output_path: str) -> bool:
+        """
+        Generate a summary report of a batch upload.
+        
+        Args:
+            batch_results: Dictionary returned by handle_batch_upload
+            output_path: Path to save the summary report
+            
+        Returns:
+            Boolean indicating if the report generation was successful
+        """
+        try:
+            with open(output_path, 'w') as f:
+                f.write("# Batch Upload Summary Report\n\n")
+                
+                f.write("## Batch Status\n")
+                f.write(f"- Files: {batch_results['total_files']}\n")
+                f.write(f"- Succeeded: {batch_results['files_succeeded']}\n")
+                f.write(f"- Failed: {batch_results['files_failed']}\n")
+                f.write(f"- Records Processed: {batch_results['records_processed']}\n")
+                f.write(f"- Records with Issues: {batch_results['records_with_issues']}\n")
+                f.write(f"- Records Uploaded: {batch_results['records_uploaded']}\n\n")
+                
+                f.write("## Files\n")
+                f.write("| File | Status | Processed | With Issues | Uploaded | Error |\n")
+                f.write("|------|--------|-----------|-------------|----------|-------|\n")
+                for file_path, file_summary in batch_results['files'].items():
+                    status = 'Success' if file_summary['success'] else 'Failed'
+                    f.write(
+                        f"| {os.path.basename(file_path)} | {status} | {file_summary['records_processed'] or 0} | "
+                        f"{file_summary['records_with_issues'] or 0} | {file_summary['records_uploaded'] or 0} | "
+                        f"{file_summary['error_message'] or ''} |\n"
+                    )
+            
+            logger.info(f"Successfully generated batch summary report: {output_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error generating batch summary report: {str(e)}")
+            return False
+
+
+def _replace_category_text(values: pd.Series, pattern: str, replacement: str) -> pd.Series:
+    """
+    Apply a regex replacement to a categorical column, like astype(str).str.replace.
+    
+    Missing values become the text 'nan' as they do with astype(str). Categories
+    that become equal after the replacement are merged.
+    
+    Args:
+        values: Categorical column
+        pattern: Regular expression to replace
+        replacement: Replacement text
+    
+    Returns:
+        Categorical column with the replaced text
+    """
+    categories = values.cat.categories.astype(str).str.replace(pattern, replacement, regex=True)
+    # Code -1 (missing) picks the trailing 'nan'
+    new_codes, new_categories = pd.factorize(np.append(categories.to_numpy(dtype=object), 'nan'))
+    codes = new_codes[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=new_categories), index=values.index, name=values.name)
+
+
+def _run_file_upload(file_path: str, output_dir: str, upload_config: Optional[Dict[str, Any]], handler_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the upload process for one file of a batch.
+    
+    Defined at module level so it can be sent to worker processes. Exceptions
+    are turned into a failed result so one bad file cannot abort the batch.
+    
+    Args:
+        file_path: Path to the inventory file
+        output_dir: Output subdirectory for this file
+        upload_config: Dictionary with upload configuration (optional)
+        handler_options: Keyword arguments for the UploadHandler
+        
+    Returns:
+        Dictionary with the fields of the process results used in the batch summary
+    """
+    try:
+        results = UploadHandler(**handler_options).handle_upload_process(file_path, output_dir, upload_config)
+    except Exception as e:
+        error_msg = f"Error processing {file_path}: {str(e)}"
+        logger.error(error_msg)
+        results = {'success': False, 'error_message': error_msg}
+    
+    return {field: results.get(field) for field in BATCH_RESULT_FIELDS}
@@ -0,0 +1,530 @@
+"""
+Upload Transport Module
+
+This module provides the HTTP transport used to upload inventory records.
+Records are sent in batches as JSON over a pool of persistent (keep-alive)
+connections, and transient failures are retried with exponential backoff.
+An asyncio variant keeps a bounded number of batches in flight and applies
+backpressure to the code producing the batches.
+"""
+
+import pandas as pd
+import asyncio
+import http.client
+import logging
+import queue
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Any, Optional, Iterator, AsyncIterator
+from urllib.parse import urlsplit
+
+logger = logging.getLogger('upload_transport')
+
+# Default transport settings, overridable through upload_config
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_CONNECTIONS = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 30.0
+
+# HTTP status codes worth retrying
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# HTTP status codes whose responses never have a body (besides 1xx)
+NO_BODY_STATUS_CODES = {204, 304}
+
+
+def iter_record_batches(df: pd.DataFrame, batch_size: int) -> Iterator[Tuple[int, str]]:
+    """
+    Split a DataFrame into JSON request bodies of at most batch_size records.
+    
+    Args:
+        df: DataFrame with inventory data ready for upload
+        batch_size: Maximum number of records per batch
+    
+    Yields:
+        Tuples of (number of records, JSON body)
+    """
+    if batch_size <= 0:
+        raise ValueError(f"Batch size must be positive, got {batch_size}")
+    
+    for start in range(0, len(df), batch_size):
+        batch_df = df.iloc[start:start + batch_size]
+        yield len(batch_df), serialize_record_batch(batch_df)
+
+
+def serialize_record_batch(batch_df: pd.DataFrame) -> str:
+    """
+    Serialize one batch of records as a JSON request body.
+    
+    Args:
+        batch_df: DataFrame with the records of the batch
+    
+    Returns:
+        JSON body of the form {"records": [...]}
+    """
+    return '{"records": ' + batch_df.to_json(orient='records', date_format='iso') + '}'
+
+
+class UploadTransport:
+    """
+    Class for sending record batches to an HTTP endpoint over pooled connections.
+    """
+    
+    def __init__(self, endpoint_url: str, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+                 timeout: float = DEFAULT_TIMEOUT, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the transport.
+        
+        Args:
+            endpoint_url: http:// or https:// URL that accepts POSTed batches
+            max_connections: Number of persistent connections (and concurrent batches)
+            max_retries: Number of retries for a batch after a transient failure
+            retry_backoff: Base delay in seconds, doubled after every retry
+            timeout: Socket timeout in seconds
+            headers: Extra request headers, e.g. for authentication
+        """
+        parts = urlsplit(endpoint_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported endpoint scheme: {parts.scheme}")
+        
+        self.endpoint_url = endpoint_url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += f"?{parts.query}"
+        
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self.headers = {'Content-Type': 'application/json', 'Connection': 'keep-alive', **(headers or {})}
+        
+        # Idle connections; None placeholders are replaced by new connections on demand
+        self._connections = queue.LifoQueue()
+        for _ in range(max_connections):
+            self._connections.put(None)
+    
+    def upload_dataframe(self, df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Upload a DataFrame in batches, keeping up to max_connections batches in flight.
+        
+        Args:
+            df: DataFrame with inventory data ready for upload
+            batch_size: Maximum number of records per batch
+        
+        Returns:
+            Dictionary with record and batch counts and the last batch error
+        """
+        results = {
+            'records_uploaded': 0,
+            'records_failed': 0,
+            'batches_sent': 0,
+            'batches_failed': 0,
+            'error_message': None
+        }
+        
+        def collect(record_count: int, future) -> None:
+            success, error = future.result()
+            results['batches_sent'] += 1
+            if success:
+                results['records_uploaded'] += record_count
+            else:
+                results['batches_failed'] += 1
+                results['records_failed'] += record_count
+                results['error_message'] = error
+        
+        # Only serialize a couple of batches ahead of the connections
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.max_connections) as executor:
+            for record_count, body in iter_record_batches(df, batch_size):
+                in_flight.append((record_count, executor.submit(self.send_batch, body)))
+                if len(in_flight) >= 2 * self.max_connections:
+                    collect(*in_flight.popleft())
+            while in_flight:
+                collect(*in_flight.popleft())
+        
+        return results
+    
+    def send_batch(self, body: str) -> Tuple[bool, Optional[str]]:
+        """
+        POST one batch, retrying transient failures with exponential backoff.
+        
+        Args:
+            body: JSON request body
+        
+        Returns:
+            Tuple containing:
+                - Boolean indicating if the batch was accepted
+                - Error message (or None if successful)
+        """
+        payload = body.encode('utf-8')
+        error = None
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+            
+            connection = self._acquire()
+            try:
+                connection.request('POST', self.path, body=payload, headers=self.headers)
+                response = connection.getresponse()
+                # Read the whole response so the connection can be reused
+                response_body = response.read()
+            except (http.client.HTTPException, socket.timeout, OSError) as e:
+                connection.close()
+                self._release(None)
+                error = f"Connection error: {str(e)}"
+                logger.warning(f"Upload batch attempt {attempt + 1} failed: {error}")
+                continue
+            
+            if response.will_close:
+                connection.close()
+                self._release(None)
+            else:
+                self._release(connection)
+            
+            if 200 <= response.status < 300:
+                return True, None
+            
+            error = f"HTTP {response.status}: {response_body[:200].decode('utf-8', errors='replace')}"
+            if response.status not in TRANSIENT_STATUS_CODES:
+                logger.error(f"Upload batch rejected: {error}")
+                return False, error
+            logger.warning(f"Upload batch attempt {attempt + 1} failed: {error}")
+        
+        logger.error(f"Upload batch failed after {self.max_retries + 1} attempts: {error}")
+        return False, error
+    
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                connection = self._connections.get_nowait()
+            except queue.Empty:
+                break
+            if connection is not None:
+                connection.close()
+        
+        for _ in range(self.max_connections):
+            self._connections.put(None)
+    
+    def _acquire(self) -> http.client.HTTPConnection:
+        """Take an idle connection from the pool, opening a new one if needed."""
+        connection = self._connections.get()
+        if connection is None:
+            if self.scheme == 'https':
+                connection = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+            else:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return connection
+    
+    def _release(self, connection: Optional[http.client.HTTPConnection]) -> None:
+        """Return a connection (or an empty slot) to the pool."""
+        self._connections.put(connection)
+
+
+class AsyncUploadTransport:
+    """
+    asyncio transport that keeps up to max_in_flight batches in flight at once.
+    
+    Batches are taken from a bounded queue: the producer of the batches waits
+    whenever max_pending_batches are already queued, so formatting never runs
+    far ahead of the acknowledgements from the endpoint.
+    """
+    
+    def __init__(self, endpoint_url: str, max_in_flight: int = DEFAULT_MAX_CONNECTIONS,
+                 max_pending_batches: Optional[int] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 retry_backoff: float = DEFAULT_RETRY_BACKOFF, timeout: float = DEFAULT_TIMEOUT,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the transport.
+        
+        Args:
+            endpoint_url: http:// or https:// URL that accepts POSTed batches
+            max_in_flight: Number of batches sent concurrently (one connection each)
+            max_pending_batches: Number of formatted batches allowed to wait for a
+                free sender (defaults to max_in_flight)
+            max_retries: Number of retries for a batch after a transient failure
+            retry_backoff: Base delay in seconds, doubled after every retry
+            timeout: Timeout in seconds for each request
+            headers: Extra request headers, e.g. for authentication
+        """
+        parts = urlsplit(endpoint_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported endpoint scheme: {parts.scheme}")
+        
+        self.endpoint_url = endpoint_url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.path = parts.path or '/'
+        if parts.query:
+            self.path += f"?{parts.query}"
+        
+        self.max_in_flight = max_in_flight
+        self.max_pending_batches = max_pending_batches or max_in_flight
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        
+        request_headers = {
+            'Host': parts.netloc,
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive',
+            **(headers or {})
+        }
+        self._header_block = ''.join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+        
+        # Idle connections as (reader, writer) pairs
+        self._connections = []
+    
+    async def upload_dataframe(self, df: pd.DataFrame, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Upload a DataFrame in batches.
+        
+        Args:
+            df: DataFrame with inventory data ready for upload
+            batch_size: Maximum number of records per batch
+        
+        Returns:
+            Dictionary with record and batch counts and the last batch error
+        """
+        async def batches():
+            for start in range(0, len(df), batch_size):
+                batch_df = df.iloc[start:start + batch_size]
+                # Serialize off the event loop so in-flight requests keep moving
+                body = await asyncio.to_thread(serialize_record_batch, batch_df)
+                yield len(batch_df), body
+        
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be positive, got {batch_size}")
+        
+        return await self.upload_batches(batches())
+    
+    async def upload_batches(self, batches: AsyncIterator[Tuple[int, str]]) -> Dict[str, Any]:
+        """
+        Upload batches produced by an async iterator with bounded concurrency.
+        
+        Args:
+            batches: Async iterator of (number of records, JSON body)
+        
+        Returns:
+            Dictionary with record and batch counts and the last batch error
+        """
+        results = {
+            'records_uploaded': 0,
+            'records_failed': 0,
+            'batches_sent': 0,
+            'batches_failed': 0,
+            'error_message': None
+        }
+        pending = asyncio.Queue(maxsize=self.max_pending_batches)
+        
+        async def sender():
+            while True:
+                item = await pending.get()
+                if item is None:
+                    return
+                record_count, body = item
+                success, error = await self.send_batch(body)
+                results['batches_sent'] += 1
+                if success:
+                    results['records_uploaded'] += record_count
+                else:
+                    results['batches_failed'] += 1
+                    results['records_failed'] += record_count
+                    results['error_message'] = error
+        
+        senders = [asyncio.create_task(sender()) for _ in range(self.max_in_flight)]
+        try:
+            async for item in batches:
+                # Blocks while the queue is full, i.e. while all senders are busy
+                await pending.put(item)
+            for _ in senders:
+                await pending.put(None)
+            await asyncio.gather(*senders)
+        except BaseException:
+            for task in senders:
+                task.cancel()
+            await asyncio.gather(*senders, return_exceptions=True)
+            raise
+        
+        return results
+    
+    async def send_batch(self, body: str) -> Tuple[bool, Optional[str]]:
+        """
+        POST one batch, retrying transient failures with exponential backoff.
+        
+        Args:
+            body: JSON request body
+        
+        Returns:
+            Tuple containing:
+                - Boolean indicating if the batch was accepted
+                - Error message (or None if successful)
+        """
+        payload = body.encode('utf-8')
+        request = (
+            f"POST {self.path} HTTP/1.1\r\n{self._header_block}Content-Length: {len(payload)}\r\n\r\n"
+        ).encode('latin-1') + payload
+        error = None
+        
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+            
+            connection = None
+            try:
+                connection = await self._acquire()
+                status, response_body, will_close = await asyncio.wait_for(
+                    self._exchange(connection, request), self.timeout
+                )
+            except http.client.HTTPException as e:
+                # The server may already have accepted the batch, so sending it again could duplicate it
+                connection[1].close()
+                error = f"Invalid response: {str(e)}"
+                logger.error(f"Upload batch failed: {error}")
+                return False, error
+            except (asyncio.TimeoutError, ConnectionError, OSError, ValueError, asyncio.IncompleteReadError) as e:
+                if connection is not None:
+                    connection[1].close()
+                error = f"Connection error: {str(e) or type(e).__name__}"
+                logger.warning(f"Upload batch attempt {attempt + 1} failed: {error}")
+                continue
+            
+            if will_close:
+                connection[1].close()
+            else:
+                self._connections.append(connection)
+            
+            if 200 <= status < 300:
+                return True, None
+            
+            error = f"HTTP {status}: {response_body[:200].decode('utf-8', errors='replace')}"
+            if status not in TRANSIENT_STATUS_CODES:
+                logger.error(f"Upload batch rejected: {error}")
+                return False, error
+            logger.warning(f"Upload batch attempt {attempt + 1} failed: {error}")
+        
+        logger.error(f"Upload batch failed after {self.max_retries + 1} attempts: {error}")
+        return False, error
+    
+    async def close(self) -> None:
+        """Close all idle connections."""
+        while self._connections:
+            _, writer = self._connections.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+    
+    async def _acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Reuse an idle connection or open a new one."""
+        if self._connections:
+            return self._connections.pop()
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=(self.scheme == 'https')), self.timeout
+        )
+    
+    async def _exchange(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter], request: bytes) -> Tuple[int, bytes, bool]:
+        """
+        Send one request and read the response.
+        
+        Returns:
+            Tuple of (status code, response body, whether the server closes the connection)
+        """
+        reader, writer = connection
+        writer.write(request)
+        await writer.drain()
+        
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Connection closed by server")
+            version, status = status_line.decode('latin-1').split(None, 2)[:2]
+            status = int(status)
+            
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+            
+            # Interim 1xx responses have no body and precede the final response
+            if status >= 200:
+                break
+        
+        will_close = response_headers.get('connection', '').lower() == 'close' or version == 'HTTP/1.0'
+        
+        if status in NO_BODY_STATUS_CODES:
+            response_body = b''
+        elif 'content-length' in response_headers:
+            response_body = await reader.readexactly(int(response_headers['content-length']))
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            response_body = b''
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                response_body += await reader.readexactly(size)
+                await reader.readline()
+        elif will_close:
+            response_body = await reader.read()
+        else:
+            # Reading to EOF would wait for the timeout on a keep-alive connection
+            raise http.client.HTTPException(f"HTTP {status} response has no Content-Length on a keep-alive connection")
+        
+        return status, response_body, will_close
+
+
+def create_transport(upload_config: Dict[str, Any]) -> UploadTransport:
+    """
+    Create a transport from the transport keys of an upload configuration.
+    
+    Args:
+        upload_config: Dictionary with upload configuration including 'endpoint_url'
+    
+    Returns:
+        Configured UploadTransport
+    """
+    return UploadTransport(
+        upload_config['endpoint_url'],
+        max_connections=upload_config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+        max_retries=upload_config.get('max_retries', DEFAULT_MAX_RETRIES),
+        retry_backoff=upload_config.get('retry_backoff', DEFAULT_RETRY_BACKOFF),
+        timeout=upload_config.get('timeout', DEFAULT_TIMEOUT),
+        headers=upload_config.get('headers')
+    )
+
+
+def create_async_transport(upload_config: Dict[str, Any]) -> AsyncUploadTransport:
+    """
+    Create an asyncio transport from the transport keys of an upload configuration.
+    
+    Args:
+        upload_config: Dictionary with upload configuration including 'endpoint_url'
+    
+    Returns:
+        Configured AsyncUploadTransport
+    """
+    return AsyncUploadTransport(
+        upload_config['endpoint_url'],
+        max_in_flight=upload_config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+        max_pending_batches=upload_config.get('max_pending_batches'),
+        max_retries=upload_config.get('max_retries', DEFAULT_MAX_RETRIES),
+        retry_backoff=upload_config.get('retry_backoff', DEFAULT_RETRY_BACKOFF),
+        timeout=upload_config.get('timeout', DEFAULT_TIMEOUT),
+        headers=upload_config.get('headers')
+    )
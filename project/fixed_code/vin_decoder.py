@@ -0,0 +1,250 @@
+"""
+VIN Decoder Module
+
+This module validates and decodes vehicle identification numbers for a whole
+column at once. The VINs are laid out as a matrix of character codes, so the
+length, character set and ISO 3779 check digit (position 9) of every row are
+checked with a few array operations. The manufacturer (WMI, positions 1-3) is
+looked up once per distinct WMI through a memoized table, and the model year
+code (position 10) through a character table, so the decoded values can be
+cross-checked against the Make and Year columns.
+"""
+
+import functools
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+VIN_LENGTH = 17
+
+# Check name -> (field it is reported on, report text, issue marker text)
+VIN_CHECKS = {
+    'length': ('VIN', 'is not 17 characters long', 'Invalid VIN length'),
+    'characters': ('VIN', 'has characters outside the VIN alphabet (I, O and Q are not used)', 'Invalid VIN characters'),
+    'check_digit': ('VIN', 'does not match its check digit (position 9)', 'Invalid VIN check digit'),
+    'make': ('Make', 'does not match the manufacturer decoded from the VIN', 'Make does not match VIN'),
+    'model_year': ('Year', 'does not match the model year decoded from the VIN (position 10)', 'Year does not match VIN')
+}
+
+# Position weights of the check digit calculation
+CHECK_DIGIT_WEIGHTS = np.array([8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int32)
+
+# Numeric value of each VIN character in the check digit calculation
+TRANSLITERATION = {
+    **{str(digit): digit for digit in range(10)},
+    'A': 1, 'B': 2, 'C': 3, 'D': 4, 'E': 5, 'F': 6, 'G': 7, 'H': 8,
+    'J': 1, 'K': 2, 'L': 3, 'M': 4, 'N': 5, 'P': 7, 'R': 9,
+    'S': 2, 'T': 3, 'U': 4, 'V': 5, 'W': 6, 'X': 7, 'Y': 8, 'Z': 9
+}
+
+# Model year codes (position 10) of the 1980-2009 cycle; the codes repeat every 30 years
+MODEL_YEAR_CODES = 'ABCDEFGHJKLMNPRSTVWXY123456789'
+MODEL_YEAR_CYCLE = 30
+FIRST_MODEL_YEAR = 1980
+
+# World manufacturer identifiers (positions 1-3) of the makes sold by dealers
+WMI_MAKES = {
+    'Ford': ['1FA', '1FB', '1FC', '1FD', '1FM', '1FT', '1ZV', '2FA', '2FM', '2FT', '3FA', '3FM', '3FT', 'MAJ', 'NM0', 'WF0'],
+    'Lincoln': ['1LN', '2LM', '2LN', '3LN', '5LM', '5LT'],
+    'Chevrolet': ['1G1', '1GB', '1GC', '1GN', '2G1', '2GC', '2GN', '3G1', '3GC', '3GN', 'KL7', 'KL8'],
+    'GMC': ['1GD', '1GK', '1GT', '2GK', '2GT', '3GK', '3GT'],
+    'Buick': ['1G4', '2G4', '5GA', 'KL4', 'LRB'],
+    'Cadillac': ['1G6', '1GY'],
+    'Jeep': ['1C4', '1J4', '1J8', 'ZAC'],
+    'Chrysler': ['1C3', '1C4', '2C3', '2C4', '3C4'],
+    'Dodge': ['1B3', '1B7', '1C3', '1C4', '1D7', '2B3', '2C3', '2C4', '2D3', '3C4', '3D7'],
+    'Ram': ['1C6', '3C6', '3C7'],
+    'Nissan': ['1N4', '1N6', '3N1', '3N6', '5N1', 'JN1', 'JN8'],
+    'Infiniti': ['5N1', 'JN1', 'JN8', 'JNK', 'JNR'],
+    'Toyota': ['2T1', '2T3', '3TM', '4T1', '4T3', '4T4', '5TD', '5TE', '5TF', '5YF', 'JTD', 'JTE', 'JTK', 'JTM', 'JTN'],
+    'Lexus': ['2T2', '58A', 'JTH', 'JTJ'],
+    'Honda': ['19X', '1HG', '2HG', '2HJ', '2HK', '5FN', '5FP', '5J6', '7FA', 'JHM', 'SHH', 'SHS'],
+    'Acura': ['19U', '19V', '2HN', '5J8', 'JH4'],
+    'Hyundai': ['5NM', '5NP', '5NT', 'KM8', 'KMH'],
+    'Kia': ['5XX', '5XY', 'KNA', 'KND'],
+    'Subaru': ['4S3', '4S4', 'JF1', 'JF2'],
+    'Mazda': ['3MV', '3MZ', 'JM1', 'JM3'],
+    'Volkswagen': ['1VW', '3VW', 'WVG', 'WVW'],
+    'Audi': ['WA1', 'WAU'],
+    'BMW': ['4US', '5UX', '5YM', 'WBA', 'WBS', 'WBX', 'WBY'],
+    'Mercedes-Benz': ['4JG', '55S', 'W1K', 'W1N', 'WDB', 'WDC', 'WDD'],
+    'Tesla': ['5YJ', '7SA', 'LRW'],
+    'Volvo': ['7JR', 'LYV', 'YV1', 'YV4'],
+    'Mitsubishi': ['4A3', '4A4', 'JA3', 'JA4', 'ML3'],
+    'Porsche': ['WP0', 'WP1'],
+    'Land Rover': ['SAL'],
+    'Jaguar': ['SAJ']
+}
+
+# Other spellings of make names in dealer exports
+MAKE_ALIASES = {
+    'CHEVY': 'CHEVROLET',
+    'VW': 'VOLKSWAGEN',
+    'MERCEDES': 'MERCEDES-BENZ',
+    'MERCEDES BENZ': 'MERCEDES-BENZ',
+    'RAM TRUCKS': 'RAM'
+}
+
+
+def _character_table(values: Dict[str, int]) -> np.ndarray:
+    """Build a lookup array over character codes 0-128 (128 stands for any non-ASCII code)."""
+    table = np.full(129, -1, dtype=np.int16)
+    for char, value in values.items():
+        table[ord(char)] = value
+    return table
+
+
+# Check digit value of each character code, -1 outside the VIN alphabet
+CHARACTER_VALUES = _character_table(TRANSLITERATION).astype(np.int8)
+
+# First model year of each position 10 code, -1 for characters that are not year codes
+MODEL_YEAR_TABLE = _character_table({code: FIRST_MODEL_YEAR + i for i, code in enumerate(MODEL_YEAR_CODES)})
+
+# One bit per make, so the makes of a WMI form a bit mask
+MAKE_BITS = {make.upper(): 1 << position for position, make in enumerate(WMI_MAKES)}
+
+
+@functools.lru_cache(maxsize=None)
+def decode_wmi(wmi: str) -> Tuple[str, ...]:
+    """
+    Look up the makes that use a world manufacturer identifier.
+    
+    Args:
+        wmi: First three characters of a VIN
+    
+    Returns:
+        Upper-case make names (several when a manufacturer shares the WMI
+        between brands); empty if the WMI is unknown
+    """
+    return tuple(make.upper() for make, wmis in WMI_MAKES.items() if wmi in wmis)
+
+
+@functools.lru_cache(maxsize=None)
+def _wmi_make_bits(wmi: str) -> int:
+    """Return the MAKE_BITS mask of the makes of a WMI (0 if unknown)."""
+    bits = 0
+    for make in decode_wmi(wmi):
+        bits |= MAKE_BITS[make]
+    return bits
+
+
+def decode_model_year(code: str) -> Optional[int]:
+    """Return the first model year of a position 10 code (add multiples of 30 for later cycles)."""
+    year = MODEL_YEAR_TABLE[min(ord(code), 128)] if len(code) == 1 else -1
+    return int(year) if year >= 0 else None
+
+
+def check_digit(vin: str) -> str:
+    """
+    Compute the check digit of a 17-character VIN (the character at position 9 is ignored).
+    
+    Raises:
+        ValueError: If the VIN is not 17 characters of the VIN alphabet
+    """
+    if len(vin) != VIN_LENGTH or any(char not in TRANSLITERATION for char in vin):
+        raise ValueError(f"Not a VIN: {vin!r}")
+    remainder = sum(TRANSLITERATION[char] * int(weight) for char, weight in zip(vin, CHECK_DIGIT_WEIGHTS)) % 11
+    return 'X' if remainder == 10 else str(remainder)
+
+
+def vin_character_codes(vins: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lay out VINs as a matrix of character codes.
+    
+    Args:
+        vins: VIN column (non-string values are converted with str)
+    
+    Returns:
+        Tuple containing:
+            - Boolean mask of the rows with a VIN
+            - Array of shape (rows with a VIN, 18) with the Unicode code of each
+              character, zero-padded; an 18th code means the VIN is too long
+    """
+    present = vins.notnull().to_numpy()
+    text = np.asarray(vins.to_numpy(dtype=object)[present], dtype=f'U{VIN_LENGTH + 1}')
+    codes = text.view(np.uint32).reshape(len(text), VIN_LENGTH + 1)
+    return present, codes
+
+
+def vin_issue_flags(vins: pd.Series, makes: Optional[pd.Series] = None,
+                    years: Optional[pd.Series] = None) -> Dict[str, np.ndarray]:
+    """
+    Validate and decode a VIN column and flag the rows that fail each check.
+    
+    The character set and check digit are only checked on 17-character VINs,
+    and the decoded make and model year are only compared for VINs of the
+    right length and alphabet. Rows without a VIN are never flagged (the
+    missing value check reports them).
+    
+    Args:
+        vins: VIN column
+        makes: Make column to compare with the decoded WMI (optional)
+        years: Model years to compare with position 10, parsed like pd.to_numeric (optional)
+    
+    Returns:
+        Dictionary mapping each VIN_CHECKS name to a boolean mask over the rows
+        (make and model_year only when the column is given)
+    """
+    present, codes = vin_character_codes(vins)
+    right_length = (codes[:, VIN_LENGTH] == 0) & (codes[:, :VIN_LENGTH] != 0).all(axis=1)
+    
+    # Byte codes from here on; every non-ASCII character becomes 128
+    chars = np.minimum(codes[:, :VIN_LENGTH], 128).astype(np.uint8)
+    values = CHARACTER_VALUES[chars]
+    valid_characters = (values >= 0).all(axis=1)
+    well_formed = right_length & valid_characters
+    
+    # Weighted sum of the character values modulo 11; a remainder of 10 is written as X
+    remainder = (values.astype(np.int32) @ CHECK_DIGIT_WEIGHTS) % 11
+    expected = np.where(remainder == 10, ord('X'), remainder + ord('0'))
+    
+    checks = {
+        'length': ~right_length,
+        'characters': right_length & ~valid_characters,
+        'check_digit': well_formed & (chars[:, 8] != expected)
+    }
+    
+    if makes is not None:
+        checks['make'] = well_formed & _make_mismatch(chars, makes.to_numpy(dtype=object)[present])
+    
+    if years is not None:
+        first_year = MODEL_YEAR_TABLE[chars[:, 9]]
+        # Model years repeat a lot, so each distinct value is parsed once
+        year_codes, unique_years = pd.factorize(years.to_numpy(dtype=object)[present])
+        parsed_years = pd.to_numeric(pd.Series(unique_years, dtype=object), errors='coerce').to_numpy(dtype=float)
+        year = np.append(parsed_years, np.nan)[year_codes]
+        with np.errstate(invalid='ignore'):
+            differs = np.mod(year - first_year, MODEL_YEAR_CYCLE) != 0
+        checks['model_year'] = well_formed & (first_year >= 0) & ~np.isnan(year) & differs
+    
+    flags = {}
+    for check, mask in checks.items():
+        flags[check] = np.zeros(len(present), dtype=bool)
+        flags[check][present] = mask
+    return flags
+
+
+def _make_mismatch(chars: np.ndarray, makes: np.ndarray) -> np.ndarray:
+    """
+    Flag rows whose make is not one of the makes of their WMI.
+    
+    Args:
+        chars: Byte codes of the VINs (rows x 17)
+        makes: Make of each row (missing values are not flagged)
+    
+    Returns:
+        Boolean mask over the rows; unknown WMIs are not flagged
+    """
+    # One integer per WMI, then one lookup per distinct WMI and per distinct make
+    wmi_keys = (chars[:, 0].astype(np.uint32) << 16) | (chars[:, 1].astype(np.uint32) << 8) | chars[:, 2]
+    wmi_codes, unique_wmi_keys = pd.factorize(wmi_keys)
+    wmi_bits = np.array([_wmi_make_bits(chr(key >> 16) + chr((key >> 8) & 0xFF) + chr(key & 0xFF))
+                         for key in unique_wmi_keys.tolist()], dtype=np.uint64)
+    
+    make_codes, unique_makes = pd.factorize(makes)
+    normalized = [str(make).strip().upper() for make in unique_makes]
+    # Unknown make names get no bit, so they never match a known WMI; -1 (missing) is skipped below
+    make_bits = np.array([MAKE_BITS.get(MAKE_ALIASES.get(make, make), 0) for make in normalized] + [0], dtype=np.uint64)
+    
+    row_wmi_bits = wmi_bits[wmi_codes]
+    return (row_wmi_bits != 0) & (make_codes >= 0) & ((row_wmi_bits & make_bits[make_codes]) == 0)